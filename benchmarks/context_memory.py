@@ -0,0 +1,89 @@
+"""Measure memory held per live conversation context.
+
+Compares the current slotted ConversationContext against the previous
+dict-backed dataclass holding pydantic entities and an unbounded intent
+list, for sessions that look like a typical mid-call state.
+
+Usage:
+    python -m benchmarks.context_memory [--sessions 20000] [--turns 12]
+"""
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from src.core.conversation import ConversationContext, Entity, Intent
+
+
+@dataclass
+class LegacyConversationContext:
+    """The context layout before it was slotted, kept for comparison."""
+    
+    session_id: str
+    start_time: datetime = field(default_factory=datetime.now)
+    last_update: datetime = field(default_factory=datetime.now)
+    turn_count: int = 0
+    current_intent: Intent = Intent.UNKNOWN
+    previous_intents: List[Intent] = field(default_factory=list)
+    entities: Dict[str, Entity] = field(default_factory=dict)
+    user_preferences: Dict[str, str] = field(default_factory=dict)
+    
+    def update_intent(self, intent: Intent):
+        if self.current_intent != Intent.UNKNOWN:
+            self.previous_intents.append(self.current_intent)
+        self.current_intent = intent
+        self.last_update = datetime.now()
+        self.turn_count += 1
+    
+    def add_entity(self, entity: Entity):
+        self.entities[entity.type] = entity
+        self.last_update = datetime.now()
+
+
+INTENT_CYCLE = [Intent.AVAILABILITY, Intent.PRICING, Intent.HOURS, Intent.LOCATION]
+
+
+def build_sessions(factory, sessions: int, turns: int) -> dict:
+    """Build ``sessions`` contexts, each driven through ``turns`` turns."""
+    contexts = {}
+    for n in range(sessions):
+        session_id = f"CA{n:032x}"
+        context = factory(session_id=session_id)
+        for turn in range(turns):
+            context.update_intent(INTENT_CYCLE[turn % len(INTENT_CYCLE)])
+        context.add_entity(Entity(type="unit_size", value="10x10", confidence=1.0))
+        context.add_entity(Entity(type="zip_code", value="62701", confidence=1.0))
+        contexts[session_id] = context
+    return contexts
+
+
+def measure(factory, sessions: int, turns: int) -> float:
+    """Bytes allocated per session, including its session ID and dict slot."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    contexts = build_sessions(factory, sessions, turns)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del contexts
+    return allocated / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=12)
+    args = parser.parse_args()
+    
+    legacy = measure(LegacyConversationContext, args.sessions, args.turns)
+    current = measure(ConversationContext, args.sessions, args.turns)
+    print(f"sessions={args.sessions} turns={args.turns}")
+    print(f"legacy context:  {legacy:8.0f} bytes/session")
+    print(f"slotted context: {current:8.0f} bytes/session")
+    print(f"reduction:       {100 * (1 - current / legacy):8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measure intent classifier latency for single utterances and batches.
+
+Trains on the seed corpus, then times ``predict`` one utterance at a time
+(the per-turn cost on a live call) and ``predict_batch`` over the corpus
+(offline replay). Exits non-zero when the single-utterance p99 exceeds the
+budget.
+
+Usage:
+    python -m benchmarks.intent_classifier [--repeat 20] [--budget-us 100]
+"""
+import argparse
+import statistics
+import time
+
+from src.core.intent_classifier import SEED_CORPUS_PATH, IntentClassifier, load_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--budget-us", type=float, default=100.0)
+    args = parser.parse_args()
+    
+    texts, intents = load_corpus(SEED_CORPUS_PATH)
+    started = time.perf_counter()
+    classifier = IntentClassifier.fit(texts, intents)
+    print(f"trained on {len(texts)} utterances in {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    classifier.predict(texts[0])  # Warm up numpy and the per-word feature cache
+    timings = []
+    for _ in range(args.repeat):
+        for text in texts:
+            started = time.perf_counter()
+            classifier.predict(text)
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"single utterance: p50 {p50:.1f} us, p99 {p99:.1f} us (budget {args.budget_us:.0f} us)")
+    
+    batch = texts * args.repeat
+    started = time.perf_counter()
+    classifier.predict_batch(batch)
+    elapsed = time.perf_counter() - started
+    print(f"batch of {len(batch)}: {elapsed / len(batch) * 1e6:.1f} us/utterance, {len(batch) / elapsed:,.0f} utterances/s")
+    
+    if p99 > args.budget_us:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
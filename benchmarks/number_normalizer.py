@@ -0,0 +1,69 @@
+"""Measure what spoken-number normalization adds to entity extraction.
+
+Times ``normalize_numbers`` on caller utterances with and without number
+words, next to a full ``EntityExtractor.extract_all`` (which includes it),
+so the normalizer's share of each turn is visible. Exits non-zero when the
+normalizer's p99 exceeds the budget.
+
+Usage:
+    python -m benchmarks.number_normalizer [--repeat 2000] [--budget-us 50]
+"""
+import argparse
+import statistics
+import time
+
+from src.core.entities import EntityExtractor
+from src.core.numbers import normalize_numbers
+
+UTTERANCES = [
+    "I need a ten by ten for six months",
+    "Do you have anything twenty-five by thirty available",
+    "My zip code is six two seven oh one",
+    "We want to move in on the twenty first",
+    "Probably a year and a half, maybe six and a half months",
+    "About one hundred and fifty square feet",
+    "What are your hours on the weekend",
+    "I need a 10x10 unit for 3 months near 62701",
+    "Can you text me directions please",
+    "Yes, go ahead and reserve it",
+]
+
+
+def _time_us(function, texts, repeat):
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            function(text)
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+    
+    extractor = EntityExtractor()
+    spoken = [text for text in UTTERANCES if normalize_numbers(text) != text.lower()]
+    plain = [text for text in UTTERANCES if text not in spoken]
+    
+    for label, texts in (("with number words", spoken), ("without number words", plain)):
+        p50, p99 = _time_us(normalize_numbers, texts, args.repeat)
+        print(f"normalize {label} ({len(texts)}): p50 {p50:.1f} us, p99 {p99:.1f} us")
+    
+    normalize_p50, normalize_p99 = _time_us(normalize_numbers, UTTERANCES, args.repeat)
+    extract_p50, extract_p99 = _time_us(extractor.extract_all, UTTERANCES, args.repeat)
+    print(
+        f"extract_all: p50 {extract_p50:.1f} us, p99 {extract_p99:.1f} us; "
+        f"normalizer share of p50 {normalize_p50 / extract_p50:.0%} (budget {args.budget_us:.0f} us)"
+    )
+    
+    if normalize_p99 > args.budget_us:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ from src.models.base import Base
 from src.models.facility import Facility
 from src.models.unit import Unit
 from src.models.reservation import Reservation
+from src.models.transcript import CallTranscript
+from src.models.sync_state import InventorySyncState
+from src.models.rollup import OccupancyDailyRollup
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,29 @@
+"""Add unit lookup indexes
+
+Revision ID: 3f1c9a7d2b64
+Revises: 20250208_1907
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2b64"
+down_revision: Union[str, None] = "20250208_1907"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_units_facility_available_size",
+        "units",
+        ["facility_id", "available", "size"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_units_facility_available_size", table_name="units")
@@ -0,0 +1,59 @@
+"""Add unit width and length columns
+
+Revision ID: 8d2e4b6a1c57
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-19 09:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e4b6a1c57"
+down_revision: Union[str, None] = "3f1c9a7d2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+# Same grammar as src.models.unit.SIZE_PATTERN, copied so the migration
+# does not change if the model does
+SIZE_PATTERN = r"^\s*([0-9]+)\s*x\s*([0-9]+)\s*$"
+
+
+def upgrade() -> None:
+    op.add_column("units", sa.Column("width_ft", sa.Integer(), nullable=True))
+    op.add_column("units", sa.Column("length_ft", sa.Integer(), nullable=True))
+
+    # Backfill by primary-key range, committing each batch so locks are held
+    # and WAL is generated for a bounded number of rows at a time rather than
+    # for the whole table in the migration's transaction.
+    conn = op.get_bind()
+    min_id, max_id = conn.execute(sa.text("SELECT min(id), max(id) FROM units")).one()
+    if min_id is not None:
+        with op.get_context().autocommit_block():
+            for start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+                conn.execute(
+                    sa.text(
+                        """
+                        UPDATE units
+                        SET width_ft = (regexp_match(lower(size), :pattern))[1]::integer,
+                            length_ft = (regexp_match(lower(size), :pattern))[2]::integer
+                        WHERE id >= :start AND id < :end
+                          AND lower(size) ~ :pattern
+                        """
+                    ),
+                    {"start": start, "end": start + BACKFILL_BATCH_SIZE, "pattern": SIZE_PATTERN},
+                )
+
+    op.create_index("ix_units_width_length", "units", ["width_ft", "length_ft"])
+    op.create_index("ix_units_square_feet", "units", ["square_feet"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_units_square_feet", table_name="units")
+    op.drop_index("ix_units_width_length", table_name="units")
+    op.drop_column("units", "length_ft")
+    op.drop_column("units", "width_ft")
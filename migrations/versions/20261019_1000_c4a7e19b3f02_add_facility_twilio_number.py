@@ -0,0 +1,30 @@
+"""Add facility twilio number
+
+Revision ID: c4a7e19b3f02
+Revises: 8d2e4b6a1c57
+Create Date: 2026-10-19 10:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a7e19b3f02"
+down_revision: Union[str, None] = "8d2e4b6a1c57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("facilities", sa.Column("twilio_number", sa.String(), nullable=True))
+    op.create_unique_constraint(
+        "uq_facilities_twilio_number", "facilities", ["twilio_number"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_facilities_twilio_number", "facilities", type_="unique")
+    op.drop_column("facilities", "twilio_number")
@@ -0,0 +1,50 @@
+"""Add call transcripts
+
+Revision ID: 5b8e2d71a9c4
+Revises: c4a7e19b3f02
+Create Date: 2026-10-19 11:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2d71a9c4"
+down_revision: Union[str, None] = "c4a7e19b3f02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "call_transcripts",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("call_sid", sa.String(), nullable=False),
+        sa.Column("facility_id", sa.String(), nullable=False),
+        sa.Column("turn", sa.Integer(), nullable=False),
+        sa.Column("utterance", sa.Text(), nullable=False),
+        sa.Column("intent", sa.String(), nullable=False),
+        sa.Column("entities", sa.JSON(), nullable=True),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("extract_ms", sa.Float(), nullable=True),
+        sa.Column("intent_ms", sa.Float(), nullable=True),
+        sa.Column("respond_ms", sa.Float(), nullable=True),
+        sa.Column("render_ms", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_call_transcripts_call_sid_turn", "call_transcripts", ["call_sid", "turn"]
+    )
+    op.create_index(
+        "ix_call_transcripts_created_at", "call_transcripts", ["created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_call_transcripts_created_at", table_name="call_transcripts")
+    op.drop_index("ix_call_transcripts_call_sid_turn", table_name="call_transcripts")
+    op.drop_table("call_transcripts")
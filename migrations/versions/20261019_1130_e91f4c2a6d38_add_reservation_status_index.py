@@ -0,0 +1,29 @@
+"""Add reservation status index
+
+Revision ID: e91f4c2a6d38
+Revises: 5b8e2d71a9c4
+Create Date: 2026-10-19 11:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e91f4c2a6d38"
+down_revision: Union[str, None] = "5b8e2d71a9c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_reservations_status_created_at",
+        "reservations",
+        ["status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_status_created_at", table_name="reservations")
@@ -0,0 +1,35 @@
+"""Add inventory sync state
+
+Revision ID: 7a3d5f08c1e6
+Revises: e91f4c2a6d38
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3d5f08c1e6"
+down_revision: Union[str, None] = "e91f4c2a6d38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_sync_state",
+        sa.Column("facility_id", sa.Integer(), nullable=False),
+        sa.Column("cursor", sa.String(), nullable=True),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("units_synced", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["facility_id"], ["facilities.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("facility_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_sync_state")
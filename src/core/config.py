@@ -23,11 +23,71 @@ class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_USE_LIFO: bool = False
+    # Set when connecting through a transaction-pooling proxy (e.g. PgBouncer)
+    DATABASE_TRANSACTION_POOLING: bool = False
+    # Comma-separated read replica URLs; reads use the primary when empty
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_RETRY_SECONDS: int = 30
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0
     
     # Twilio
     TWILIO_ACCOUNT_SID: str
     TWILIO_AUTH_TOKEN: str
     TWILIO_PHONE_NUMBER: str
+    TWILIO_API_BASE_URL: str = "https://api.twilio.com"
+    
+    # Outbound SMS
+    SMS_WORKERS: int = 4
+    SMS_RATE_PER_SECOND: float = 1.0
+    SMS_MAX_RETRIES: int = 4
+    
+    # Facility registry
+    FACILITY_REGISTRY_REFRESH_SECONDS: int = 300
+    
+    # Conversation sessions
+    SESSION_TTL_SECONDS: int = 1800
+    SESSION_SNAPSHOT_PATH: str = "data/session_snapshot.bin"
+    
+    # Intent classification; trained from the bundled seed corpus when the model file is missing
+    INTENT_MODEL_PATH: str = "data/intent_classifier.npz"
+    INTENT_CONFIDENCE_THRESHOLD: float = 0.5
+    
+    # Admission control for the voice webhooks; excess requests get a "please hold" reply
+    ADMISSION_INITIAL_LIMIT: int = 32
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_MAX_LIMIT: int = 256
+    ADMISSION_TARGET_LATENCY_SECONDS: float = 1.0
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    
+    # Responses replayed to Twilio's webhook retries
+    WEBHOOK_DEDUP_TTL_SECONDS: float = 60.0
+    WEBHOOK_DEDUP_MAX_ENTRIES: int = 10000
+    
+    # Call transcripts
+    TRANSCRIPT_BATCH_SIZE: int = 500
+    TRANSCRIPT_FLUSH_SECONDS: float = 1.0
+    TRANSCRIPT_MAX_PENDING: int = 10000
+    
+    # Reservations
+    RESERVATION_HOLD_MINUTES: int = 60
+    RESERVATION_SWEEP_SECONDS: int = 60
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+    
+    # Inventory sync from the facility management system (disabled when unset)
+    INVENTORY_API_URL: Optional[str] = None
+    INVENTORY_SYNC_SECONDS: int = 300
+    INVENTORY_SYNC_PAGE_SIZE: int = 1000
+    
+    # Availability summary reloaded from the units table to catch changes made elsewhere
+    AVAILABILITY_RECONCILE_SECONDS: int = 300
+    
+    # Pricing
+    PRICING_REFRESH_SECONDS: int = 86400
     
     # Security
     SECRET_KEY: str = "development_secret_key"
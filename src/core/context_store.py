@@ -0,0 +1,334 @@
+"""Binary snapshots of live conversation contexts across restarts."""
+import asyncio
+import contextlib
+import glob
+import os
+import struct
+import tempfile
+import time
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.conversation import (
+    _INTENT_CODES,
+    _INTENTS,
+    ConversationContext,
+    ConversationEngine,
+    EntityRecord,
+    Intent,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# File layout: MAGIC, intent table, then frames until EOF. The intent table
+# lists intent values by code so snapshots survive changes to the Intent enum.
+MAGIC = b"SACTX\x01"
+
+# Frame: engine key length, record count, payload length
+_FRAME = struct.Struct("<HII")
+# Record fixed part: started_at, updated_at, turn_count, current intent, intent count
+_RECORD = struct.Struct("<ddIBI")
+_STR_LEN = struct.Struct("<H")
+_COUNT = struct.Struct("<B")
+_CONFIDENCE = struct.Struct("<f")
+
+
+def _pack_str(out: List[bytes], value: str) -> None:
+    data = value.encode("utf-8")
+    out.append(_STR_LEN.pack(len(data)))
+    out.append(data)
+
+
+def _unpack_str(buffer: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = _STR_LEN.unpack_from(buffer, offset)
+    offset += _STR_LEN.size
+    return bytes(buffer[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def encode_context(context: ConversationContext, out: List[bytes]) -> None:
+    """
+    Append the binary encoding of a context to ``out``.
+
+    Args:
+        context: Context to encode
+        out: List of byte chunks to append to
+    """
+    _pack_str(out, context.session_id)
+    out.append(_RECORD.pack(
+        context.started_at,
+        context.updated_at,
+        context.turn_count,
+        _INTENT_CODES[context.current_intent],
+        context._intent_count,
+    ))
+    out.append(_COUNT.pack(len(context._intent_ring)))
+    out.append(bytes(context._intent_ring))
+
+    out.append(_COUNT.pack(len(context.entities)))
+    for entity in context.entities.values():
+        _pack_str(out, entity.type)
+        _pack_str(out, entity.value)
+        out.append(_CONFIDENCE.pack(entity.confidence))
+
+    preferences = context.user_preferences or {}
+    out.append(_COUNT.pack(len(preferences)))
+    for key, value in preferences.items():
+        _pack_str(out, key)
+        _pack_str(out, value)
+
+
+def decode_context(
+    buffer: memoryview,
+    offset: int,
+    intents: List[Intent] = _INTENTS,
+    ring_codes: Optional[bytes] = None
+) -> Tuple[ConversationContext, int]:
+    """
+    Decode one context from ``buffer`` starting at ``offset``.
+
+    Args:
+        buffer: Frame payload
+        offset: Start of the record
+        intents: Intent for each code used by the snapshot
+        ring_codes: Translation table from snapshot to current intent codes
+
+    Returns:
+        Tuple of (context, offset just past the record)
+    """
+    session_id, offset = _unpack_str(buffer, offset)
+    started_at, updated_at, turn_count, intent_code, intent_count = _RECORD.unpack_from(buffer, offset)
+    offset += _RECORD.size
+    (ring_size,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    ring = bytearray(buffer[offset:offset + ring_size])
+    if ring_codes is not None:
+        ring = ring.translate(ring_codes)
+    offset += ring_size
+
+    context = ConversationContext(
+        session_id=session_id,
+        started_at=started_at,
+        updated_at=updated_at,
+        turn_count=turn_count,
+        current_intent=intents[intent_code],
+    )
+    context._intent_ring = ring
+    context._intent_count = intent_count
+
+    (entity_count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    for _ in range(entity_count):
+        entity_type, offset = _unpack_str(buffer, offset)
+        value, offset = _unpack_str(buffer, offset)
+        (confidence,) = _CONFIDENCE.unpack_from(buffer, offset)
+        offset += _CONFIDENCE.size
+        context.entities[entity_type] = EntityRecord(entity_type, value, confidence)
+
+    (preference_count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    if preference_count:
+        context.user_preferences = {}
+        for _ in range(preference_count):
+            key, offset = _unpack_str(buffer, offset)
+            value, offset = _unpack_str(buffer, offset)
+            context.user_preferences[key] = value
+
+    return context, offset
+
+
+def _encode_intent_table() -> bytes:
+    out: List[bytes] = [_COUNT.pack(len(_INTENTS))]
+    for intent in _INTENTS:
+        _pack_str(out, intent.value)
+    return b"".join(out)
+
+
+def _read_intent_table(f: BinaryIO) -> Tuple[List[Intent], Optional[bytes]]:
+    """Map a snapshot's intent codes onto the current Intent enum."""
+    known = {intent.value: intent for intent in Intent}
+    (count,) = _COUNT.unpack(f.read(_COUNT.size))
+    intents = []
+    for _ in range(count):
+        (length,) = _STR_LEN.unpack(f.read(_STR_LEN.size))
+        intents.append(known.get(f.read(length).decode("utf-8"), Intent.UNKNOWN))
+    if intents == _INTENTS:
+        return intents, None
+    table = bytearray(range(256))
+    for code, intent in enumerate(intents):
+        table[code] = _INTENT_CODES[intent]
+    return intents, bytes(table)
+
+
+def _encode_frame(engine_key: str, contexts: List[ConversationContext]) -> bytes:
+    out: List[bytes] = []
+    for context in contexts:
+        encode_context(context, out)
+    payload = b"".join(out)
+    key = engine_key.encode("utf-8")
+    return _FRAME.pack(len(key), len(contexts), len(payload)) + key + payload
+
+
+async def snapshot_contexts(
+    engines: Dict[str, ConversationEngine],
+    path: str,
+    chunk_size: int = 1000
+) -> int:
+    """
+    Write every live context to ``path`` in chunked binary frames.
+
+    Only one chunk is encoded at a time and file writes run in a worker
+    thread, yielding to the event loop between chunks so a large snapshot
+    neither stalls requests nor holds a second copy of all sessions.
+
+    Args:
+        engines: Conversation engines keyed by facility ID
+        path: Snapshot file path; written atomically via a uniquely named
+            temporary file, so concurrent writers never share one
+        chunk_size: Contexts per frame
+
+    Returns:
+        Number of contexts written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, temporary_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_encode_intent_table())
+            for engine_key, engine in engines.items():
+                session_ids = list(engine.active_contexts)
+                for start in range(0, len(session_ids), chunk_size):
+                    contexts = [
+                        context for session_id in session_ids[start:start + chunk_size]
+                        if (context := engine.active_contexts.get(session_id)) is not None
+                    ]
+                    if not contexts:
+                        continue
+                    await asyncio.to_thread(f.write, _encode_frame(engine_key, contexts))
+                    written += len(contexts)
+            await asyncio.to_thread(f.flush)
+            await asyncio.to_thread(os.fsync, f.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_path)
+        raise
+
+    logger.info(f"Snapshotted {written} conversation contexts to {path}")
+    return written
+
+
+def worker_snapshot_path(path: str) -> str:
+    """Snapshot path for this worker, so workers sharing ``path`` never overwrite each other"""
+    return f"{path}.{os.getpid()}"
+
+
+def claim_snapshots(path: str) -> List[str]:
+    """
+    Take ownership of the snapshots left at ``path`` by stopped workers.
+
+    Each snapshot is renamed to a name unique to this worker before it is
+    read. The rename is atomic, so when several workers start at once each
+    snapshot is claimed by exactly one of them; the others find it gone.
+
+    Args:
+        path: Configured snapshot path; per-worker snapshots sit beside it
+
+    Returns:
+        Claimed file paths, which the caller reads and then removes
+    """
+    candidates = [path] + [
+        candidate for candidate in glob.glob(f"{glob.escape(path)}.*")
+        if candidate[len(path) + 1:].isdigit()
+    ]
+    claimed = []
+    for candidate in candidates:
+        claimed_path = f"{candidate}.claimed-{os.getpid()}"
+        try:
+            os.rename(candidate, claimed_path)
+        except FileNotFoundError:
+            continue  # Another worker claimed it first, or there was none
+        claimed.append(claimed_path)
+    return claimed
+
+
+def _read_exact(f: BinaryIO, size: int) -> Optional[bytes]:
+    data = f.read(size)
+    if len(data) < size:
+        return None
+    return data
+
+
+def read_snapshot(
+    path: str,
+    ttl_seconds: float,
+    now: Optional[float] = None
+) -> Iterator[Tuple[str, ConversationContext]]:
+    """
+    Stream contexts back from a snapshot, one frame in memory at a time.
+
+    Args:
+        path: Snapshot file path
+        ttl_seconds: Contexts idle longer than this are skipped
+        now: Reference time, defaults to the current time
+
+    Yields:
+        (engine key, context) for every unexpired context
+    """
+    cutoff = (now if now is not None else time.time()) - ttl_seconds
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a conversation snapshot")
+        intents, ring_codes = _read_intent_table(f)
+        while header := _read_exact(f, _FRAME.size):
+            key_length, count, payload_length = _FRAME.unpack(header)
+            key = _read_exact(f, key_length)
+            payload = _read_exact(f, payload_length)
+            if key is None or payload is None:
+                logger.warning(f"Snapshot {path} is truncated; stopping restore")
+                return
+
+            engine_key = key.decode("utf-8")
+            buffer = memoryview(payload)
+            offset = 0
+            for _ in range(count):
+                context, offset = decode_context(buffer, offset, intents, ring_codes)
+                if context.updated_at >= cutoff:
+                    yield engine_key, context
+
+
+def restore_contexts(
+    path: str,
+    ttl_seconds: float,
+    engine_for: Callable[[str], ConversationEngine],
+    now: Optional[float] = None
+) -> int:
+    """
+    Restore unexpired contexts from a snapshot into their engines.
+
+    Args:
+        path: Snapshot file path
+        ttl_seconds: Contexts idle longer than this are skipped
+        engine_for: Callable mapping an engine key to its ConversationEngine
+        now: Reference time, defaults to the current time
+
+    Returns:
+        Number of contexts restored
+    """
+    restored = 0
+    engines: Dict[str, ConversationEngine] = {}
+    for engine_key, context in read_snapshot(path, ttl_seconds, now):
+        engine = engines.get(engine_key)
+        if engine is None:
+            engine = engines[engine_key] = engine_for(engine_key)
+        engine.active_contexts[context.session_id] = context
+        restored += 1
+
+    logger.info(f"Restored {restored} conversation contexts from {path}")
+    return restored
@@ -1,11 +1,30 @@
 """Conversation engine for managing dialog flows and context."""
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
 
 from pydantic import BaseModel
 
+from src.core.response_cache import ResponseCache
+from src.core.schedule import WeeklySchedule, format_time
+from src.models.unit import Unit
+
+if TYPE_CHECKING:
+    from src.services.availability import AvailabilityIndex
+    from src.services.facility_locator import FacilityLocator
+    from src.services.facility_registry import FacilityRecord
+    from src.services.pricing import PriceBook
+    from src.services.storage_service import StorageService
+
+
+def _spoken_list(items: List[str]) -> str:
+    """Join items the way they are read aloud, e.g. "a, b, and c"."""
+    if len(items) <= 2:
+        return " and ".join(items)
+    return f"{', '.join(items[:-1])}, and {items[-1]}"
+
 
 class Intent(str, Enum):
     """Supported conversation intents."""
@@ -28,44 +47,132 @@ class Entity(BaseModel):
     confidence: float
 
 
-@dataclass
+class EntityRecord(NamedTuple):
+    """Compact entity stored on a live conversation context."""
+    
+    type: str
+    value: str
+    confidence: float
+
+
+INTENT_HISTORY_SIZE = 8
+_INTENTS = list(Intent)
+_INTENT_CODES = {intent: code for code, intent in enumerate(_INTENTS)}
+
+
+@dataclass(slots=True)
 class ConversationContext:
-    """Maintains context for a conversation session."""
+    """
+    Maintains context for a conversation session.
+    
+    Kept deliberately small since a worker holds one per live call:
+    slotted, float timestamps, entities as tuples, and intent history as a
+    fixed-size ring buffer of one-byte intent codes.
+    """
     
     session_id: str
-    start_time: datetime = field(default_factory=datetime.now)
-    last_update: datetime = field(default_factory=datetime.now)
+    started_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     turn_count: int = 0
     current_intent: Intent = Intent.UNKNOWN
-    previous_intents: List[Intent] = field(default_factory=list)
-    entities: Dict[str, Entity] = field(default_factory=dict)
-    user_preferences: Dict[str, str] = field(default_factory=dict)
+    entities: Dict[str, EntityRecord] = field(default_factory=dict)
+    user_preferences: Optional[Dict[str, str]] = None
+    # Size the last turn offered to reserve; only the very next turn may accept it
+    offered_size: Optional[str] = None
+    _intent_ring: bytearray = field(default_factory=lambda: bytearray(INTENT_HISTORY_SIZE), repr=False)
+    _intent_count: int = field(default=0, repr=False)
+    
+    @property
+    def start_time(self) -> datetime:
+        """Session start as a datetime."""
+        return datetime.fromtimestamp(self.started_at)
+    
+    @property
+    def last_update(self) -> datetime:
+        """Last activity as a datetime."""
+        return datetime.fromtimestamp(self.updated_at)
+    
+    @property
+    def previous_intents(self) -> List[Intent]:
+        """Most recent prior intents, oldest first, at most INTENT_HISTORY_SIZE."""
+        size = len(self._intent_ring)
+        count = min(self._intent_count, size)
+        start = self._intent_count - count
+        return [_INTENTS[self._intent_ring[(start + i) % size]] for i in range(count)]
     
     def update_intent(self, intent: Intent):
         """Update current intent and track history."""
         if self.current_intent != Intent.UNKNOWN:
-            self.previous_intents.append(self.current_intent)
+            self._intent_ring[self._intent_count % len(self._intent_ring)] = _INTENT_CODES[self.current_intent]
+            self._intent_count += 1
         self.current_intent = intent
-        self.last_update = datetime.now()
+        self.updated_at = time.time()
         self.turn_count += 1
     
     def add_entity(self, entity: Entity):
         """Add or update an entity in the context."""
-        self.entities[entity.type] = entity
-        self.last_update = datetime.now()
+        self.entities[entity.type] = EntityRecord(entity.type, entity.value, entity.confidence)
+        self.updated_at = time.time()
     
     def set_preference(self, key: str, value: str):
         """Set a user preference."""
+        if self.user_preferences is None:
+            self.user_preferences = {}
         self.user_preferences[key] = value
-        self.last_update = datetime.now()
+        self.updated_at = time.time()
 
 
 class ConversationEngine:
     """Core conversation management engine."""
     
-    def __init__(self):
-        """Initialize conversation engine."""
+    # Entities each cacheable intent's response depends on. Hours answers
+    # depend on the clock, so they are never cached. Location answers list
+    # other facilities with the size free, so they are keyed on every
+    # facility's availability rather than this one's.
+    CACHEABLE_INTENTS = {
+        Intent.AVAILABILITY: ('unit_size',),
+        Intent.PRICING: ('unit_size',),
+        Intent.LOCATION: ('zip_code', 'unit_size'),
+        Intent.INFORMATION: (),
+        Intent.PAYMENT: (),
+        Intent.GENERAL: (),
+        Intent.UNKNOWN: (),
+    }
+    
+    def __init__(
+        self,
+        schedule: Optional[WeeklySchedule] = None,
+        facility: Optional["FacilityRecord"] = None,
+        locator: Optional["FacilityLocator"] = None,
+        facility_id: Optional[str] = None,
+        price_book: Optional["PriceBook"] = None,
+        availability: Optional["AvailabilityIndex"] = None,
+        response_cache: Optional[ResponseCache] = None,
+        storage_service: Optional["StorageService"] = None
+    ):
+        """
+        Initialize conversation engine.
+        
+        Args:
+            schedule: Optional compiled facility hours used to answer hours questions
+            facility: Optional facility the engine answers for
+            locator: Optional nearest-facility index for location questions
+            facility_id: ID used to look up the facility's inventory and prices
+            price_book: Optional published rates for pricing questions
+            availability: Optional per-facility availability summary
+            response_cache: Optional cache shared by engines across facilities
+            storage_service: Optional facility inventory for closest-fit unit recommendations
+        """
         self.active_contexts: Dict[str, ConversationContext] = {}
+        self.schedule = schedule
+        self.facility = facility
+        self.locator = locator
+        self.facility_id = facility_id or (facility.facility_id if facility else None)
+        self.price_book = price_book
+        self.availability = availability
+        self.response_cache = response_cache
+        self.storage_service = storage_service
+        self.data_version = 0  # Bumped when facility data is swapped in
     
     def get_or_create_context(self, session_id: str) -> ConversationContext:
         """Get existing context or create new one."""
@@ -98,8 +205,54 @@ class ConversationEngine:
         if entities:
             for entity in entities:
                 context.add_entity(entity)
+        # Set here rather than in the handler so cached answers make the offer too
+        context.offered_size = self._offered_size(context) if intent == Intent.AVAILABILITY else None
+        
+        cache_key = self._cache_key(intent, context)
+        if cache_key is not None:
+            if (cached := self.response_cache.get(cache_key)) is not None:
+                return cached
+            response = self._generate_response(intent, context)
+            self.response_cache.put(cache_key, response)
+            return response
+        
+        return self._generate_response(intent, context)
+    
+    def _cache_key(self, intent: Intent, context: ConversationContext) -> Optional[tuple]:
+        """
+        Build the response cache key for a turn.
         
-        # Generate response based on intent and context
+        Args:
+            intent: Detected intent
+            context: Conversation context after this turn's entities were added
+            
+        Returns:
+            (facility, intent, entity signature, inventory version), or None
+            if the response should not be cached
+        """
+        if self.response_cache is None or intent not in self.CACHEABLE_INTENTS:
+            return None
+        
+        signature = tuple(
+            context.entities[entity_type].value.strip().lower()
+            if entity_type in context.entities else None
+            for entity_type in self.CACHEABLE_INTENTS[intent]
+        )
+        if self.availability is None:
+            availability_version = 0
+        elif intent == Intent.LOCATION:
+            availability_version = self.availability.global_version
+        else:
+            availability_version = self.availability.version(self.facility_id)
+        version = (
+            self.data_version,
+            availability_version,
+            self.price_book.version if self.price_book else 0,
+        )
+        return (self.facility_id, intent, signature, version)
+    
+    def _generate_response(self, intent: Intent, context: ConversationContext) -> str:
+        """Generate response based on intent and context."""
         if intent == Intent.AVAILABILITY:
             return self._handle_availability(context)
         elif intent == Intent.PRICING:
@@ -115,18 +268,97 @@ class ConversationEngine:
         else:
             return self._handle_general(context)
     
+    def _offered_size(self, context: ConversationContext) -> Optional[str]:
+        """The requested size if the availability answer offers to reserve one"""
+        unit_size = context.entities.get('unit_size')
+        if unit_size is None or self.availability is None or self.facility_id not in self.availability:
+            return None
+        match = self.availability.get(self.facility_id, unit_size.value)
+        return unit_size.value if match and match.available_units else None
+    
     def _handle_availability(self, context: ConversationContext) -> str:
         """Handle availability intent."""
-        # TODO: Integrate with actual inventory system
+        if self.availability is None or self.facility_id not in self.availability:
+            return (
+                "We have several unit sizes available. "
+                "Our most popular sizes are 5x5, 5x10, and 10x10. "
+                "Would you like to know more about a specific size?"
+            )
+        
+        in_stock = [
+            item for item in self.availability.summary(self.facility_id)
+            if item.available_units
+        ]
+        unit_size = context.entities.get('unit_size')
+        if unit_size:
+            match = self.availability.get(self.facility_id, unit_size.value)
+            if match and match.available_units:
+                return (
+                    f"Yes, we have {match.available_units} {unit_size.value} "
+                    f"unit{'s' if match.available_units > 1 else ''} available, "
+                    f"starting at ${match.min_price:.2f} per month. "
+                    "Would you like to reserve one?"
+                )
+            if in_stock:
+                options = self._closest_options(unit_size.value, in_stock)
+                return (
+                    f"We don't have any {unit_size.value} units available right now, "
+                    f"but the closest sizes we have are {options} per month. "
+                    "Would either of those work for you?"
+                )
+        
+        if not in_stock:
+            return (
+                "We're fully booked at the moment. "
+                "Would you like me to check our other locations or put you on a waitlist?"
+            )
+        
+        options = _spoken_list([
+            f"{item.available_units} {item.size} from ${item.min_price:.2f}" for item in in_stock[:3]
+        ])
         return (
-            "We have several unit sizes available. "
-            "Our most popular sizes are 5x5, 5x10, and 10x10. "
+            f"Right now we have {options} per month. "
             "Would you like to know more about a specific size?"
         )
     
+    def _closest_options(self, size: str, in_stock: list) -> str:
+        """Spoken list of the in-stock units or sizes that best fit an unavailable size"""
+        width, length = Unit.parse_size(size)
+        if self.storage_service is not None and width is not None:
+            # The summary has the last word on what is still free
+            in_stock_sizes = {item.size for item in in_stock}
+            recommended = {}
+            for unit in self.storage_service.recommend_units(width, length, limit=4):
+                if unit.size in in_stock_sizes:
+                    recommended.setdefault(unit.size, unit.price)
+            if recommended:
+                return _spoken_list([f"{size} from ${price:.2f}" for size, price in list(recommended.items())[:2]])
+
+        requested = Unit.square_feet_for(size)
+        closest = sorted(in_stock, key=lambda item: (abs(item.square_feet - requested), item.min_price))[:2]
+        return _spoken_list([f"{item.size} from ${item.min_price:.2f}" for item in closest])
+    
     def _handle_pricing(self, context: ConversationContext) -> str:
         """Handle pricing intent."""
-        # TODO: Integrate with pricing engine
+        table = self.price_book.table if self.price_book else None
+        quotes = table.sizes_for(self.facility_id) if table else []
+        
+        unit_size = context.entities.get('unit_size')
+        if unit_size and quotes:
+            if (rate := table.get(self.facility_id, unit_size.value)) is not None:
+                return (
+                    f"A {unit_size.value} unit is currently ${rate:.2f} per month. "
+                    "Would you like me to check availability for that size?"
+                )
+        
+        if quotes:
+            listed = [f"${rate:.2f} for a {size}" for size, rate in quotes[:3]]
+            listed[0] = listed[0].replace(" for a", " per month for a", 1)
+            return (
+                f"Our current rates are {_spoken_list(listed)}. "
+                "Would you like me to check availability for any of these sizes?"
+            )
+        
         return (
             "Our units start at $49 per month for a 5x5, "
             "$89 for a 5x10, and $149 for a 10x10. "
@@ -143,15 +375,49 @@ class ConversationEngine:
     
     def _handle_hours(self, context: ConversationContext) -> str:
         """Handle hours intent."""
-        return (
-            "Our office is open Monday through Friday from 9 AM to 6 PM, "
-            "and Saturday from 9 AM to 5 PM. However, tenants have 24/7 access "
-            "to their units using their secure entry code."
-        )
+        if self.schedule is None:
+            return (
+                "Our office is open Monday through Friday from 9 AM to 6 PM, "
+                "and Saturday from 9 AM to 5 PM. However, tenants have 24/7 access "
+                "to their units using their secure entry code."
+            )
+        
+        now = datetime.now()
+        if self.schedule.is_open(now):
+            status = "We're open right now."
+        elif next_open := self.schedule.next_open(now):
+            opens_at = format_time(next_open.hour * 60 + next_open.minute)
+            status = f"We're closed right now, and we open again {next_open:%A} at {opens_at}."
+        else:
+            status = "We're closed right now."
+        return f"{self.schedule.describe()} {status}"
     
     def _handle_location(self, context: ConversationContext) -> str:
         """Handle location intent."""
-        # TODO: Integrate with facility information
+        zip_code = context.entities.get('zip_code')
+        if zip_code and self.locator:
+            unit_size = context.entities.get('unit_size')
+            nearby = self.locator.nearest_to_zip(
+                zip_code.value,
+                limit=3,
+                size=unit_size.value if unit_size else None
+            )
+            if nearby:
+                places = "; ".join(
+                    f"{facility.name} at {facility.address}, about {distance:.0f} miles away"
+                    for facility, distance in nearby
+                )
+                return (
+                    f"The closest locations to {zip_code.value} are {places}. "
+                    "Would you like directions or would you prefer me to text them to you?"
+                )
+        
+        if self.facility:
+            return (
+                f"We're conveniently located at {self.facility.address} in {self.facility.city}. "
+                "Would you like directions or would you prefer me to text them to you?"
+            )
+        
         return (
             "We're conveniently located at 123 Storage Lane. "
             "Would you like directions or would you prefer me to text them to you?"
@@ -1,8 +1,11 @@
+import math
 import re
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 import logging
 
+from src.core.numbers import normalize_numbers
+
 logger = logging.getLogger('storage_agent.entities')
 
 @dataclass
@@ -40,8 +43,8 @@ class EntityExtractor:
     ]
     
     DURATION_PATTERNS = [
-        r'(?:for\s+)?(\d+)\s+(month|week|year)s?',  # e.g., "for 3 months"
-        r'(\d+)(?:-|\s+)(month|week|year)',  # e.g., "6-month" or "6 month"
+        r'(?:for\s+)?(\d+(?:\.\d+)?)\s+(month|week|year)s?',  # e.g., "for 3 months", "6.5 months"
+        r'(\d+(?:\.\d+)?)(?:-|\s+)(month|week|year)',  # e.g., "6-month" or "6 month"
     ]
     
     MOVE_IN_PATTERNS = [
@@ -49,13 +52,23 @@ class EntityExtractor:
         r'move\s+in\s+on\s+(\d{1,2}(?:st|nd|rd|th)?\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec))',
         r'starting\s+(today|tomorrow|next\s+week|next\s+month)',
     ]
+    
+    ZIP_CODE_PATTERNS = [
+        r'\b(\d{5})(?:-\d{4})?\b',  # e.g., "62701" or "62701-1234"
+    ]
+    
+    # Compiled once at import instead of going through re's cache on every call
+    _UNIT_SIZE_REGEXES = [re.compile(pattern) for pattern in UNIT_SIZE_PATTERNS]
+    _DURATION_REGEXES = [re.compile(pattern) for pattern in DURATION_PATTERNS]
+    _MOVE_IN_REGEXES = [re.compile(pattern) for pattern in MOVE_IN_PATTERNS]
+    _ZIP_CODE_REGEXES = [re.compile(pattern) for pattern in ZIP_CODE_PATTERNS]
 
     def extract_unit_size(self, text: str) -> Optional[UnitSize]:
         """Extract storage unit dimensions from text"""
         text = text.lower()
         
-        for pattern in self.UNIT_SIZE_PATTERNS:
-            if match := re.search(pattern, text):
+        for regex in self._UNIT_SIZE_REGEXES:
+            if match := regex.search(text):
                 try:
                     # Handle different formats
                     if len(match.groups()) == 2:
@@ -81,10 +94,15 @@ class EntityExtractor:
         """Extract rental duration from text"""
         text = text.lower()
         
-        for pattern in self.DURATION_PATTERNS:
-            if match := re.search(pattern, text):
-                amount = int(match.group(1))
+        for regex in self._DURATION_REGEXES:
+            if match := regex.search(text):
+                amount = float(match.group(1))
                 unit = match.group(2)
+                if not amount.is_integer() and unit == 'year':
+                    # "a year and a half" is 18 months
+                    amount, unit = amount * 12, 'month'
+                # Rentals are billed in whole periods, so part of one counts as one
+                amount = math.ceil(amount)
                 logger.debug(f"Extracted duration: {amount} {unit}(s)")
                 return Duration(
                     value=f"{amount} {unit}{'s' if amount > 1 else ''}",
@@ -98,16 +116,27 @@ class EntityExtractor:
         """Extract desired move-in date from text"""
         text = text.lower()
         
-        for pattern in self.MOVE_IN_PATTERNS:
-            if match := re.search(pattern, text):
+        for regex in self._MOVE_IN_REGEXES:
+            if match := regex.search(text):
                 date_str = match.group(1)
                 logger.debug(f"Extracted move-in date: {date_str}")
                 return Entity(value=date_str)
         
         return None
 
+    def extract_zip_code(self, text: str) -> Optional[Entity]:
+        """Extract a ZIP code from text"""
+        for regex in self._ZIP_CODE_REGEXES:
+            if match := regex.search(text):
+                zip_code = match.group(1)
+                logger.debug(f"Extracted ZIP code: {zip_code}")
+                return Entity(value=zip_code)
+        
+        return None
+
     def extract_all(self, text: str) -> Dict[str, Entity]:
-        """Extract all possible entities from text"""
+        """Extract all possible entities from text, reading spoken numbers as digits"""
+        text = normalize_numbers(text)
         entities = {}
         
         if unit_size := self.extract_unit_size(text):
@@ -119,5 +148,8 @@ class EntityExtractor:
         if move_in := self.extract_move_in_date(text):
             entities['move_in_date'] = move_in
             
+        if zip_code := self.extract_zip_code(text):
+            entities['zip_code'] = zip_code
+            
         logger.info(f"Extracted entities: {entities}")
         return entities
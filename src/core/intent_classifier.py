@@ -0,0 +1,374 @@
+"""Hashed n-gram naive Bayes intent classifier with calibrated confidences."""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from zlib import crc32
+
+from src.core.conversation import Intent
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
+
+# Labeled utterances the default model is trained from when no saved model exists
+SEED_CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'intent_corpus.jsonl')
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_features(token: str, n_features: int) -> Tuple[int, ...]:
+    """Hashed word and character 4-gram indices for one word; callers reuse a small vocabulary"""
+    mask = n_features - 1
+    padded = f"<{token}>"
+    return (crc32(token.encode()) & mask,) + tuple(
+        crc32(f"#{padded[start:start + 4]}".encode()) & mask
+        for start in range(max(len(padded) - 3, 1))
+    )
+
+
+def hashed_features(text: str, n_features: int) -> List[int]:
+    """
+    Feature indices for an utterance: hashed words, word bigrams and
+    character 4-grams of each word
+
+    The character n-grams let related word forms ("located", "location")
+    share evidence, which matters with a small training corpus. crc32 is
+    used rather than hash() so indices are stable across processes and a
+    saved model keeps working after a restart.
+
+    Args:
+        text: Utterance
+        n_features: Size of the hashed feature space, a power of two
+
+    Returns:
+        One index per n-gram; repeated n-grams repeat their index
+    """
+    mask = n_features - 1
+    tokens = _TOKEN.findall(text.lower())
+    features = [crc32(f"{first} {second}".encode()) & mask for first, second in zip(tokens, tokens[1:])]
+    for token in tokens:
+        features.extend(_word_features(token, n_features))
+    return features
+
+
+def load_corpus(path: str) -> Tuple[List[str], List[Intent]]:
+    """
+    Read a labeled JSONL corpus with one {"text": ..., "intent": ...} per line
+
+    Args:
+        path: Corpus file
+
+    Returns:
+        Tuple of (utterances, intents)
+    """
+    texts, intents = [], []
+    with open(path, encoding='utf-8') as corpus:
+        for line in corpus:
+            if line.strip():
+                example = json.loads(line)
+                texts.append(example['text'])
+                intents.append(Intent(example['intent']))
+    return texts, intents
+
+
+class IntentClassifier:
+    """
+    Multinomial naive Bayes over hashed n-grams, scored with NumPy
+
+    Naive Bayes log-probabilities are far too confident, so scores are
+    divided by a temperature fitted on held-out examples before the
+    softmax; the resulting probabilities are usable as confidences.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[Intent],
+        weights: "np.ndarray",
+        bias: "np.ndarray",
+        temperature: float = 1.0
+    ):
+        """
+        Initialize from trained parameters
+
+        Args:
+            labels: Intent for each column of ``weights``
+            weights: (n_features, n_labels) log-likelihood of each feature per intent
+            bias: (n_labels,) log prior of each intent
+            temperature: Divides scores before the softmax
+        """
+        self.labels = tuple(labels)
+        self.weights = weights
+        self.bias = bias
+        self.temperature = temperature
+        self.n_features = weights.shape[0]
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        intents: Sequence[Intent],
+        n_features: int = 1 << 14,
+        alpha: float = 0.05,
+        validation_split: float = 0.2,
+        seed: int = 0
+    ) -> "IntentClassifier":
+        """
+        Train on labeled utterances
+
+        A stratified ``validation_split`` is held out to fit the temperature,
+        then the final model is trained on every example.
+
+        Args:
+            texts: Utterances
+            intents: Intent of each utterance
+            n_features: Hashed feature space size, a power of two
+            alpha: Additive smoothing
+            validation_split: Share of each intent held out for calibration
+            seed: Seed for the held-out split
+
+        Returns:
+            Trained classifier
+        """
+        import numpy as np
+
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        labels = [intent for intent in Intent if intent in set(intents)]
+        codes = np.array([labels.index(intent) for intent in intents])
+        rows = [hashed_features(text, n_features) for text in texts]
+
+        rng = np.random.default_rng(seed)
+        held_out = np.zeros(len(texts), dtype=bool)
+        for code in range(len(labels)):
+            members = np.flatnonzero(codes == code)
+            count = int(len(members) * validation_split)
+            held_out[rng.choice(members, count, replace=False)] = True
+
+        temperature = 1.0
+        if held_out.any():
+            train = np.flatnonzero(~held_out)
+            model = cls._estimate(labels, [rows[i] for i in train], codes[train], n_features, alpha)
+            scores = model.scores([rows[i] for i in np.flatnonzero(held_out)])
+            temperature = fit_temperature(scores, codes[held_out])
+
+        model = cls._estimate(labels, rows, codes, n_features, alpha)
+        model.temperature = temperature
+        return model
+
+    @classmethod
+    def _estimate(cls, labels, rows, codes, n_features, alpha) -> "IntentClassifier":
+        import numpy as np
+
+        counts = np.zeros((n_features, len(labels)), dtype=np.float64)
+        for features, code in zip(rows, codes):
+            np.add.at(counts[:, code], features, 1)
+        likelihood = np.log(counts + alpha) - np.log(counts.sum(axis=0) + alpha * n_features)
+        prior = np.log(np.bincount(codes, minlength=len(labels)) / len(codes))
+        return cls(labels, likelihood.astype(np.float32), prior.astype(np.float32))
+
+    def scores(self, rows: Sequence[Sequence[int]]) -> "np.ndarray":
+        """
+        Uncalibrated log-joint scores for pre-hashed utterances
+
+        Args:
+            rows: Feature indices per utterance, from hashed_features
+
+        Returns:
+            (len(rows), n_labels) array
+        """
+        import numpy as np
+
+        lengths = [len(features) for features in rows]
+        flat = np.fromiter((index for features in rows for index in features), dtype=np.intp, count=sum(lengths))
+        # Sum each utterance's feature rows in one pass over the concatenated indices
+        sums = np.zeros((len(rows), len(self.labels)), dtype=np.float32)
+        nonempty = np.flatnonzero(lengths)
+        if len(flat):
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+            sums[nonempty] = np.add.reduceat(self.weights[flat], starts, axis=0)
+        return sums + self.bias
+
+    def predict_proba_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        """
+        Calibrated probabilities for many utterances at once
+
+        Args:
+            texts: Utterances
+
+        Returns:
+            (len(texts), n_labels) array; columns follow ``self.labels``
+        """
+        return _softmax(self.scores([hashed_features(text, self.n_features) for text in texts]) / self.temperature)
+
+    def predict_batch(self, texts: Sequence[str]) -> List[Tuple[Intent, float]]:
+        """Most likely intent and its confidence for each utterance"""
+        probabilities = self.predict_proba_batch(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[code], float(row[code])) for code, row in zip(best, probabilities)]
+
+    def _probabilities(self, text: str) -> "np.ndarray":
+        import numpy as np
+
+        features = hashed_features(text, self.n_features)
+        scores = self.weights[features].sum(axis=0) + self.bias if features else self.bias
+        scores = scores / self.temperature
+        exp = np.exp(scores - scores.max())
+        return exp / exp.sum()
+
+    def predict(self, text: str) -> Tuple[Intent, float]:
+        """
+        Most likely intent for one utterance
+
+        Args:
+            text: Utterance
+
+        Returns:
+            Tuple of (intent, calibrated confidence)
+        """
+        probabilities = self._probabilities(text)
+        code = int(probabilities.argmax())
+        return self.labels[code], float(probabilities[code])
+
+    def predict_proba(self, text: str) -> Dict[Intent, float]:
+        """
+        Calibrated confidence for every intent
+
+        Args:
+            text: Utterance
+
+        Returns:
+            Mapping of each Intent to its probability; intents the model
+            was never trained on get 0.0
+        """
+        probabilities = self._probabilities(text)
+        confidences = dict.fromkeys(Intent, 0.0)
+        confidences.update(zip(self.labels, probabilities.tolist()))
+        return confidences
+
+    def save(self, path: str) -> None:
+        """Write the model to a .npz file"""
+        import numpy as np
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            labels=np.array([intent.value for intent in self.labels]),
+            weights=self.weights,
+            bias=self.bias,
+            temperature=np.array(self.temperature)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        """
+        Read a model written by save
+
+        Intents that no longer exist are dropped, so a model survives an
+        Intent being removed.
+        """
+        import numpy as np
+
+        with np.load(path) as data:
+            known = {intent.value: intent for intent in Intent}
+            keep = [code for code, value in enumerate(data['labels'].tolist()) if value in known]
+            labels = [known[data['labels'][code].item()] for code in keep]
+            return cls(
+                labels,
+                np.ascontiguousarray(data['weights'][:, keep]),
+                data['bias'][keep],
+                float(data['temperature'])
+            )
+
+
+def _softmax(scores: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def fit_temperature(scores: "np.ndarray", codes: "np.ndarray") -> float:
+    """
+    Temperature minimizing held-out negative log-likelihood
+
+    Args:
+        scores: (n, n_labels) uncalibrated scores
+        codes: (n,) true label column of each row
+
+    Returns:
+        Best temperature on a log-spaced grid
+    """
+    import numpy as np
+
+    temperatures = np.geomspace(0.05, 100, 400)
+    scaled = scores[None, :, :] / temperatures[:, None, None]
+    scaled -= scaled.max(axis=2, keepdims=True)
+    log_probabilities = scaled - np.log(np.exp(scaled).sum(axis=2, keepdims=True))
+    nll = -log_probabilities[:, np.arange(len(codes)), codes].mean(axis=1)
+    return float(temperatures[nll.argmin()])
+
+
+def _entity_intent(entities: Dict) -> Intent:
+    """The original rule: infer intent from which entities were found"""
+    if 'unit_size' in entities:
+        return Intent.AVAILABILITY
+    if 'duration' in entities:
+        return Intent.PRICING
+    if 'zip_code' in entities:
+        return Intent.LOCATION
+    return Intent.UNKNOWN
+
+
+def resolve_intent(
+    text: str,
+    entities: Dict,
+    classifier: Optional[IntentClassifier] = None,
+    threshold: float = 0.5
+) -> Tuple[Intent, float]:
+    """
+    Decide a turn's intent from the classifier, falling back to entity rules
+
+    Args:
+        text: Utterance
+        entities: Entities extracted from it, keyed by type
+        classifier: Optional trained classifier
+        threshold: Minimum confidence to trust the classifier over the rules
+
+    Returns:
+        Tuple of (intent, confidence)
+    """
+    if classifier is None:
+        intent = _entity_intent(entities)
+        return intent, 1.0 if intent != Intent.UNKNOWN else 0.0
+    intent, confidence = classifier.predict(text)
+    if confidence >= threshold:
+        return intent, confidence
+    fallback = _entity_intent(entities)
+    return (fallback, 1.0) if fallback != Intent.UNKNOWN else (Intent.UNKNOWN, confidence)
+
+
+@lru_cache()
+def get_intent_classifier() -> IntentClassifier:
+    """
+    Get the process-wide classifier
+
+    Loads INTENT_MODEL_PATH when it exists, otherwise trains from the seed
+    corpus shipped with the code, which takes milliseconds and needs no network.
+    """
+    from src.core.config import get_settings
+
+    path = get_settings().INTENT_MODEL_PATH
+    if path and os.path.exists(path):
+        classifier = IntentClassifier.load(path)
+        logger.info(f"Loaded intent classifier from {path}")
+    else:
+        classifier = IntentClassifier.fit(*load_corpus(SEED_CORPUS_PATH))
+        logger.info("Trained intent classifier from the seed corpus")
+    return classifier
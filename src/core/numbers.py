@@ -0,0 +1,256 @@
+"""Rewrite spoken numbers in transcripts as digits before entity extraction."""
+import re
+from typing import List, Optional, Tuple
+
+_UNITS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13,
+    'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+_TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+_SCALES = {'hundred': 100, 'thousand': 1000}
+_ORDINALS = {
+    'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5, 'sixth': 6, 'seventh': 7,
+    'eighth': 8, 'ninth': 9, 'tenth': 10, 'eleventh': 11, 'twelfth': 12, 'thirteenth': 13,
+    'fourteenth': 14, 'fifteenth': 15, 'sixteenth': 16, 'seventeenth': 17, 'eighteenth': 18,
+    'nineteenth': 19, 'twentieth': 20, 'thirtieth': 30,
+}
+# Read digit by digit, as in ZIP codes: "six two seven oh one"
+_DIGITS = {**{word: value for word, value in _UNITS.items() if value < 10}, 'oh': 0}
+# Units a bare "a" can count, as in "for a month" or "a year and a half"
+_COUNTABLE = frozenset({'day', 'week', 'month', 'year'})
+# Words around a number that make it part of a size: "one by ten", "ten by one"
+_SIZE_WORDS = frozenset({'by', 'x', 'ft', 'foot', 'feet', 'square'})
+_MONTHS = frozenset({
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+    'october', 'november', 'december', 'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug',
+    'sep', 'sept', 'oct', 'nov', 'dec',
+})
+
+# Word kinds for the state machine
+_UNIT, _TEN, _SCALE, _ORDINAL = range(4)
+_KINDS = {
+    **{word: (_UNIT, value) for word, value in _UNITS.items()},
+    **{word: (_TEN, value) for word, value in _TENS.items()},
+    **{word: (_SCALE, value) for word, value in _SCALES.items()},
+    **{word: (_ORDINAL, value) for word, value in _ORDINALS.items()},
+}
+
+# Cheap pre-check so utterances without number words skip tokenizing
+_NUMBER_WORD = re.compile(
+    r'\b(?:' + '|'.join(sorted(set(_KINDS) | {'half', 'oh'}, key=len, reverse=True))
+    + r'|a[ -](?:' + '|'.join(_COUNTABLE) + r')s?)\b'
+)
+# Word, digit and separator runs; joining them back reproduces the text
+_TOKENS = re.compile(r'[a-z]+|\d+|[^a-z\d]+')
+# What may separate words of one number: "twenty five", "twenty-five"
+_JOINER = re.compile(r'(?: +|-)')
+
+
+def _ordinal_suffix(value: int) -> str:
+    if 10 <= value % 100 <= 20:
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(value % 10, 'th')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if value == int(value) else str(value)
+
+
+class _Cursor:
+    """Lookahead over the token list of one utterance"""
+
+    __slots__ = ('tokens',)
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+
+    def word_after(self, index: int) -> Optional[Tuple[int, str]]:
+        """The word following ``index`` if only a joiner separates them"""
+        if index + 2 < len(self.tokens) and _JOINER.fullmatch(self.tokens[index + 1]):
+            return index + 2, self.tokens[index + 2]
+        return None
+
+    def word_before(self, index: int) -> Optional[str]:
+        """The word preceding ``index`` if only a joiner separates them"""
+        if index >= 2 and _JOINER.fullmatch(self.tokens[index - 1]):
+            return self.tokens[index - 2]
+        return None
+
+    def half_after(self, index: int) -> Optional[int]:
+        """Index of the last token of a following "and a half", if there is one"""
+        words = []
+        position = index
+        for _ in range(3):
+            following = self.word_after(position)
+            if following is None:
+                return None
+            position, word = following
+            words.append(word)
+        return position if words in (['and', 'a', 'half'], ['and', 'one', 'half']) else None
+
+
+def _read_number(cursor: _Cursor, start: int) -> Optional[Tuple[str, int]]:
+    """
+    Read the longest number phrase starting at word ``start``
+
+    Returns:
+        Tuple of (digits, index of the phrase's last token), or None when
+        the word does not start a number
+    """
+    tokens = cursor.tokens
+
+    # Digit-by-digit runs of three or more ("six two seven oh one")
+    run = [start]
+    while tokens[run[-1]] in _DIGITS and (following := cursor.word_after(run[-1])) and following[1] in _DIGITS:
+        run.append(following[0])
+    if len(run) >= 3 and all(tokens[index] in _DIGITS for index in run):
+        return ''.join(str(_DIGITS[tokens[index]]) for index in run), run[-1]
+
+    total = 0
+    current = 0
+    last_kind = None
+    end = start
+    index = start
+    while True:
+        word = tokens[index]
+        kind, value = _KINDS.get(word, (None, 0))
+        if word == 'a' and last_kind is None:
+            # "a hundred" / "a thousand"
+            following = cursor.word_after(index)
+            if not following or following[1] not in _SCALES:
+                break
+            kind, value = _UNIT, 1
+        elif kind is None:
+            break
+        elif kind == _UNIT:
+            # "twenty five" and "hundred five" continue a number; "five five" does not
+            if last_kind == _UNIT or (last_kind == _TEN and value >= 10):
+                break
+        elif kind == _TEN:
+            if last_kind in (_UNIT, _TEN):
+                break
+        elif kind == _SCALE:
+            if last_kind not in (_UNIT, _TEN) and last_kind is not None:
+                break
+            if value == 100:
+                current = (current or 1) * 100
+            else:
+                total += (current or 1) * value
+                current = 0
+            last_kind, end = _SCALE, index
+        elif kind == _ORDINAL:
+            if last_kind in (_UNIT, _ORDINAL) or (last_kind == _TEN and value >= 10):
+                break
+            number = total + current + value
+            return f"{number}{_ordinal_suffix(number)}", index
+
+        if kind in (_UNIT, _TEN):
+            current += value
+            last_kind, end = kind, index
+
+        following = cursor.word_after(end)
+        if following is None:
+            break
+        index = following[0]
+        if last_kind == _SCALE and following[1] == 'and':
+            # "one hundred and fifty"
+            after_and = cursor.word_after(index)
+            if after_and and after_and[1] in _KINDS and _KINDS[after_and[1]][0] in (_UNIT, _TEN):
+                index = after_and[0]
+                continue
+            break
+
+    if last_kind is None:
+        return None
+    number: float = total + current
+    if (half := cursor.half_after(end)) is not None:
+        return _format(number + 0.5), half
+    return _format(number), end
+
+
+def _reads_as_number(cursor: _Cursor, start: int, end: int) -> bool:
+    """
+    Whether the number phrase from ``start`` to ``end`` should be rewritten
+
+    A lone "one" or ordinal is an everyday word too ("the one near", "wait
+    a second"), so it only counts as part of a size, duration or date.
+    """
+    word = cursor.tokens[start]
+    if start != end or (word != 'one' and word not in _ORDINALS):
+        return True
+    following = cursor.word_after(end)
+    following = following[1] if following else None
+    before = cursor.word_before(start)
+    if word in _ORDINALS:
+        # "the third of march", "third march", "march third"
+        return following in _MONTHS or following == 'of' or before in _MONTHS
+    return (
+        following in _SIZE_WORDS or before in ('by', 'x')
+        or (following is not None and following.rstrip('s') in _COUNTABLE)
+    )
+
+
+def normalize_numbers(text: str) -> str:
+    """
+    Rewrite spoken numbers as digits in one left-to-right pass
+
+    Handles cardinals up to the thousands ("ten" -> "10", "one hundred and
+    fifty" -> "150", "twenty-five" -> "25"), ordinals ("twenty first" ->
+    "21st"), digit-by-digit runs ("six two seven oh one" -> "62701"), "and a
+    half" ("six and a half" -> "6.5", "a year and a half" -> "1.5 year") and
+    a counted "a" ("for a month" -> "for 1 month"). A lone "one" or ordinal
+    is only rewritten as part of a size, duration or date ("one by ten",
+    "the third of march"), so "the one near" and "wait a second" stay as
+    they are. Text without number words is returned lowercased and
+    otherwise unchanged.
+
+    Args:
+        text: Transcribed utterance
+
+    Returns:
+        Lowercased text with numbers as digits
+    """
+    text = text.lower()
+    if not _NUMBER_WORD.search(text):
+        return text
+
+    tokens = _TOKENS.findall(text)
+    cursor = _Cursor(tokens)
+    out = []
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token == 'a':
+            following = cursor.word_after(index)
+            if following and following[1].rstrip('s') in _COUNTABLE:
+                half = cursor.half_after(following[0])
+                if half is not None:
+                    # "a year and a half" -> "1.5 year"
+                    out.append(f"1.5{tokens[index + 1]}{following[1]}")
+                    index = half + 1
+                    continue
+                # "for a month" -> "for 1 month"
+                out.append('1')
+                index += 1
+                continue
+        if token.isdigit():
+            # Digits already, but a spoken "and a half" may follow: "6 and a half"
+            half = cursor.half_after(index)
+            if half is not None:
+                out.append(f"{token}.5")
+                index = half + 1
+                continue
+        elif token in _KINDS or token in _DIGITS or token == 'a':
+            number = _read_number(cursor, index)
+            if number is not None and _reads_as_number(cursor, index, number[1]):
+                digits, end = number
+                out.append(digits)
+                index = end + 1
+                continue
+        out.append(token)
+        index += 1
+    return ''.join(out)
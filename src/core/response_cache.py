@@ -0,0 +1,61 @@
+"""Bounded cache for generated conversation responses."""
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Hashable, Optional
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of response text
+
+    Keys carry the inventory/price version they were generated against, so
+    bumping a version makes older entries unreachable and they simply age
+    out of the LRU instead of needing explicit invalidation.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize cache.
+        
+        Args:
+            max_entries: Maximum number of responses kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[str]:
+        """Get a cached response and mark it recently used."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+    
+    def put(self, key: Hashable, response: str) -> None:
+        """Cache a response, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    return ResponseCache()
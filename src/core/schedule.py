@@ -0,0 +1,246 @@
+"""Compiled weekly opening-hours schedules for facilities."""
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+Interval = Tuple[int, int]  # [start, end) in minutes
+
+
+def _parse_minutes(value: str) -> int:
+    """Convert an "HH:MM" string to minutes since midnight"""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _day_intervals(spec: Optional[Dict[str, str]]) -> List[Interval]:
+    """
+    Convert one day's {"open", "close"} entry into minute intervals
+
+    The close minute is inclusive, matching the original string comparison
+    where 18:00 still counted as open. A close earlier than the open time
+    means the facility is open overnight into the next day.
+    """
+    if not spec:
+        return []
+    start = _parse_minutes(spec["open"])
+    end = _parse_minutes(spec["close"]) + 1
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return [(start, end)]
+
+
+def _merge(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or touching intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def minute_of_week(datetime_obj: datetime) -> int:
+    """Minutes elapsed since Monday 00:00 for the given datetime"""
+    return (
+        datetime_obj.weekday() * MINUTES_PER_DAY
+        + datetime_obj.hour * 60
+        + datetime_obj.minute
+    )
+
+
+def format_time(minutes: int) -> str:
+    """Render minutes since midnight the way the agent speaks times"""
+    hour, minute = divmod(minutes % MINUTES_PER_DAY, 60)
+    suffix = "AM" if hour < 12 else "PM"
+    hour = hour % 12 or 12
+    return f"{hour} {suffix}" if minute == 0 else f"{hour}:{minute:02d} {suffix}"
+
+
+class WeeklySchedule:
+    """
+    Facility hours compiled into a sorted minute-of-week interval table
+
+    Regular hours become non-overlapping [start, end) intervals over the
+    week, so checking a time is a single binary search. Holidays override
+    the hours that start on one calendar date; overnight hours still carry
+    across midnight into and out of a holiday.
+    """
+
+    __slots__ = ("_starts", "_ends", "_regular", "_holidays", "_days")
+
+    def __init__(
+        self,
+        intervals: Sequence[Interval],
+        holidays: Optional[Dict[date, List[Interval]]] = None,
+        days: Optional[Dict[str, Optional[Interval]]] = None
+    ):
+        """
+        Initialize schedule from precomputed intervals
+
+        Args:
+            intervals: Minute-of-week intervals; may extend past the end of the week
+            holidays: Per-date minute-of-day intervals replacing regular hours;
+                may extend past midnight
+            days: Regular hours per day name, used to describe the schedule
+        """
+        wrapped = []
+        regular: Tuple[List[Interval], ...] = tuple([] for _ in DAYS)
+        for start, end in intervals:
+            index, minute = divmod(start, MINUTES_PER_DAY)
+            regular[index % len(DAYS)].append((minute, minute + end - start))
+            if end > MINUTES_PER_WEEK:
+                # Sunday overnight hours wrap around to Monday morning
+                wrapped.append((start, MINUTES_PER_WEEK))
+                wrapped.append((0, end - MINUTES_PER_WEEK))
+            else:
+                wrapped.append((start, end))
+        merged = _merge(wrapped)
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+        self._regular = regular
+        self._holidays = holidays or {}
+        self._days = days or {}
+
+    @classmethod
+    def compile(cls, hours: Optional[Dict]) -> "WeeklySchedule":
+        """
+        Compile a facility ``hours`` JSON document
+
+        Args:
+            hours: {"monday": {"open": "09:00", "close": "18:00"}, ...,
+                   "holidays": {"2025-12-25": null, "2025-12-24": {...}}}
+
+        Returns:
+            Compiled WeeklySchedule
+        """
+        hours = hours or {}
+        intervals: List[Interval] = []
+        days: Dict[str, Optional[Interval]] = {}
+        for index, day in enumerate(DAYS):
+            try:
+                day_intervals = _day_intervals(hours.get(day))
+            except (KeyError, ValueError, AttributeError):
+                logger.warning(f"Ignoring malformed hours for {day}: {hours.get(day)}")
+                day_intervals = []
+            days[day] = day_intervals[0] if day_intervals else None
+            offset = index * MINUTES_PER_DAY
+            intervals.extend((start + offset, end + offset) for start, end in day_intervals)
+
+        holidays: Dict[date, List[Interval]] = {}
+        for day_str, spec in (hours.get("holidays") or {}).items():
+            try:
+                holidays[date.fromisoformat(day_str)] = _day_intervals(spec)
+            except (KeyError, ValueError, AttributeError):
+                logger.warning(f"Ignoring malformed holiday hours for {day_str}: {spec}")
+
+        return cls(intervals, holidays, days)
+
+    def _weekly_open(self, minute: int) -> bool:
+        """Binary search the weekly interval table"""
+        index = bisect_right(self._starts, minute) - 1
+        return index >= 0 and minute < self._ends[index]
+
+    def _hours_on(self, day: date) -> List[Interval]:
+        """Intervals starting on a calendar date, in minutes since its midnight"""
+        holiday = self._holidays.get(day)
+        return holiday if holiday is not None else self._regular[day.weekday()]
+
+    def is_open(self, datetime_obj: datetime) -> bool:
+        """Check if the schedule is open at the given datetime"""
+        day = datetime_obj.date()
+        previous = day - timedelta(days=1)
+        if day not in self._holidays and previous not in self._holidays:
+            return self._weekly_open(minute_of_week(datetime_obj))
+
+        minute = datetime_obj.hour * 60 + datetime_obj.minute
+        # The previous day's overnight hours carry past midnight
+        return (
+            any(start <= minute < end for start, end in self._hours_on(day))
+            or any(start <= minute + MINUTES_PER_DAY < end for start, end in self._hours_on(previous))
+        )
+
+    def _openings_on(self, day: date) -> List[int]:
+        """Opening minutes (since midnight) on a calendar date"""
+        return sorted(start for start, _ in self._hours_on(day))
+
+    def next_open(self, datetime_obj: datetime) -> Optional[datetime]:
+        """
+        Find the next time the schedule opens
+
+        Args:
+            datetime_obj: Reference time
+
+        Returns:
+            ``datetime_obj`` itself if already open, the next opening time
+            otherwise, or None if the schedule never opens
+        """
+        if self.is_open(datetime_obj):
+            return datetime_obj
+        if not self._starts and not self._holidays:
+            return None
+
+        midnight = datetime_obj.replace(hour=0, minute=0, second=0, microsecond=0)
+        minute = datetime_obj.hour * 60 + datetime_obj.minute
+        # A week of regular hours plus however many holidays could be in the way
+        for offset in range(8 + len(self._holidays)):
+            day = midnight + timedelta(days=offset)
+            for start in self._openings_on(day.date()):
+                if offset > 0 or start > minute:
+                    return day + timedelta(minutes=start)
+        return None
+
+    def describe(self) -> str:
+        """Describe regular hours as a spoken sentence"""
+        groups: List[Tuple[List[str], Optional[Interval]]] = []
+        for day in DAYS:
+            interval = self._days.get(day)
+            if groups and groups[-1][1] == interval:
+                groups[-1][0].append(day)
+            else:
+                groups.append(([day], interval))
+
+        parts = []
+        for group_days, interval in groups:
+            if interval is None:
+                continue
+            if len(group_days) == 1:
+                label = group_days[0].title()
+            elif len(group_days) == 2:
+                label = f"{group_days[0].title()} and {group_days[1].title()}"
+            else:
+                label = f"{group_days[0].title()} through {group_days[-1].title()}"
+            parts.append(
+                f"{label} from {format_time(interval[0])} to {format_time(interval[1] - 1)}"
+            )
+
+        if not parts:
+            return "Our office is currently closed."
+        if len(parts) == 1:
+            return f"Our office is open {parts[0]}."
+        return f"Our office is open {', '.join(parts[:-1])}, and {parts[-1]}."
+
+
+def open_facilities(schedules: Dict[int, WeeklySchedule], datetime_obj: datetime) -> List[int]:
+    """
+    Find which facilities are open at a given time
+
+    Args:
+        schedules: Compiled schedules keyed by facility ID
+        datetime_obj: Time to check
+
+    Returns:
+        IDs of facilities open at that time
+    """
+    return [
+        facility_id for facility_id, schedule in schedules.items()
+        if schedule.is_open(datetime_obj)
+    ]
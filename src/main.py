@@ -1,49 +1,273 @@
 """Main application entry point."""
-import uvicorn
-from fastapi import FastAPI
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+from typing import Callable
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.core.config import get_settings
-from src.routes import voice
+from src.core.context_store import claim_snapshots, restore_contexts, snapshot_contexts, worker_snapshot_path
+from src.core.entities import EntityExtractor
+from src.core.intent_classifier import get_intent_classifier
+from src.models.base import init_database, warm_connection_pool
+from src.models.pool import PoolConfig
+from src.models.routing import RoutingSessionManager, configure_session_manager
+from src.routes import metrics, reports, voice
+from src.services.admission import AdmissionMiddleware, get_admission_controller
+from src.services.availability import get_availability_index
+from src.services.facility_registry import get_facility_registry
+from src.services.inventory_sync import InventorySync
+from src.services.messaging import get_messenger
+from src.services.pricing import get_price_book, reprice_from_database
+from src.services.reservation_sweeper import expire_pending_reservations
+from src.services.rollups import attach_rollup_listeners
+from src.services.transcripts import get_transcript_writer, write_transcripts
+from src.services.twiml import hold_response, warm_templates
+from src.utils.logger import get_logger, setup_logging
+
+logger = get_logger(__name__)
 
 settings = get_settings()
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    description="AI-powered storage facility management system",
-)
-
-# CORS middleware configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(voice.router, prefix="/voice", tags=["voice"])
-
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {
-        "name": settings.PROJECT_NAME,
-        "version": settings.VERSION,
-        "status": "operational"
-    }
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "environment": settings.ENVIRONMENT
+def _with_writer(db: RoutingSessionManager, work: Callable) -> None:
+    """Run work that writes on a primary session, committing if it succeeds"""
+    with db.writer() as session:
+        work(session)
+
+
+def _with_reader(db: RoutingSessionManager, work: Callable, consistent: bool = False) -> None:
+    """Run read-only work on a replica session, falling back to the primary"""
+    with db.reader(consistent=consistent) as session:
+        work(session)
+
+
+async def _run_periodically(name: str, interval: int, work: Callable) -> None:
+    """Run blocking work in a worker thread every ``interval`` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(work)
+        except Exception as e:
+            logger.error(f"Error running {name}: {e}")
+
+
+async def _restore_sessions() -> None:
+    """Warm-restore conversations that were live when the last workers stopped"""
+    for path in await asyncio.to_thread(claim_snapshots, settings.SESSION_SNAPSHOT_PATH):
+        try:
+            await asyncio.to_thread(
+                restore_contexts, path, settings.SESSION_TTL_SECONDS, voice.conversation_engine_for
+            )
+        except Exception as e:
+            logger.error(f"Error restoring conversation snapshot: {e}")
+        finally:
+            # A snapshot is only good for the restart right after it was taken
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+
+async def _snapshot_sessions() -> None:
+    """Save live conversations so the next worker can pick them up"""
+    engines = {
+        facility_id: service.conversation_engine
+        for facility_id, service in voice.active_twilio_services().items()
     }
+    try:
+        await snapshot_contexts(engines, worker_snapshot_path(settings.SESSION_SNAPSHOT_PATH))
+    except Exception as e:
+        logger.error(f"Error snapshotting conversations: {e}")
+
+
+async def _prewarm(Session) -> None:
+    """Pay one-time costs before the worker reports ready, not on the first call"""
+    warm_templates()
+    EntityExtractor().extract_all("a 10x10 unit for 3 months near 62701")
+    voice.service_for_facility(None)
+    get_intent_classifier().predict("what are your hours")
+    if Session is not None:
+        try:
+            await asyncio.to_thread(warm_connection_pool, Session)
+        except Exception as e:
+            logger.error(f"Error warming database pool: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load facilities and prices before serving calls and keep them fresh"""
+    # Configured on startup, not when the app is built, so importing this
+    # module never creates the log directory or opens the log file
+    setup_logging(settings.LOG_LEVEL)
+    registry = get_facility_registry()
+    price_book = get_price_book()
+    availability = get_availability_index()
+    transcripts = get_transcript_writer()
+    messenger = get_messenger()
+    background_tasks = []
+    inventory_sync = None
+    
+    try:
+        Session = await asyncio.to_thread(
+            init_database, str(settings.DATABASE_URL), PoolConfig.from_settings(settings)
+        )
+    except Exception as e:
+        Session = None
+        logger.warning(f"Database unavailable, serving default facility only: {e}")
+    
+    if Session is not None:
+        attach_rollup_listeners()
+        replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        db = configure_session_manager(await asyncio.to_thread(
+            RoutingSessionManager.from_urls,
+            Session.session_factory.kw['bind'],
+            replica_urls,
+            PoolConfig.from_settings(settings),
+            retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+            read_your_writes_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        ))
+        registry.attach_database(db)
+        
+        # Availability deltas are applied on top of this snapshot, so it must
+        # come from the primary rather than a replica that may be behind
+        reconcile_availability = partial(
+            _with_reader, db, availability.load_from_database, consistent=True
+        )
+        reload_registry = partial(_with_reader, db, registry.load_from_database)
+        reprice = partial(
+            _with_reader, db, lambda session: reprice_from_database(session, price_book)
+        )
+        sweep_reservations = partial(
+            _with_writer,
+            db,
+            lambda session: expire_pending_reservations(
+                session,
+                settings.RESERVATION_HOLD_MINUTES,
+                settings.RESERVATION_SWEEP_BATCH_SIZE,
+                availability=availability
+            )
+        )
+        scheduled = [
+            ("availability reconcile", settings.AVAILABILITY_RECONCILE_SECONDS, reconcile_availability),
+            ("facility registry refresh", settings.FACILITY_REGISTRY_REFRESH_SECONDS, reload_registry),
+            ("repricing", settings.PRICING_REFRESH_SECONDS, reprice),
+            ("reservation sweep", settings.RESERVATION_SWEEP_SECONDS, sweep_reservations),
+        ]
+        if settings.INVENTORY_API_URL:
+            inventory_sync = InventorySync(
+                settings.INVENTORY_API_URL, page_size=settings.INVENTORY_SYNC_PAGE_SIZE
+            )
+            sync_inventory = partial(
+                _with_writer, db, lambda session: inventory_sync.sync_all(session, availability)
+            )
+            scheduled.append(("inventory sync", settings.INVENTORY_SYNC_SECONDS, sync_inventory))
+        if replica_urls:
+            scheduled.append(("replica health check", settings.DATABASE_REPLICA_RETRY_SECONDS, db.check_health))
+        for name, interval, work in scheduled:
+            try:
+                await asyncio.to_thread(work)
+            except Exception as e:
+                logger.error(f"Error running {name}: {e}")
+            background_tasks.append(asyncio.create_task(_run_periodically(name, interval, work)))
+        
+        transcripts.start(
+            lambda batch: _with_writer(db, lambda session: write_transcripts(session, batch))
+        )
+    
+    messenger.start()
+    await _restore_sessions()
+    await _prewarm(Session)
+    app.state.ready = True
+    
+    yield
+    
+    app.state.ready = False
+    for task in background_tasks:
+        task.cancel()
+    
+    await transcripts.stop()
+    await messenger.stop()
+    if inventory_sync is not None:
+        inventory_sync.close()
+    await _snapshot_sessions()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application.
+    
+    Building the app has no side effects: logging is configured by the
+    lifespan when the server starts, and heavy optional dependencies
+    (twilio, numpy, httpx) are imported where they are first used, so
+    importing this module stays within the budget checked by
+    benchmarks/import_time.py.
+    """
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        description="AI-powered storage facility management system",
+        lifespan=lifespan,
+    )
+    app.state.ready = False
+    
+    # CORS middleware configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Sheds voice webhooks past the adaptive concurrency limit with a
+    # pre-rendered "please hold" instead of letting them queue into timeouts
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=get_admission_controller(),
+        paths=("/voice/incoming", "/voice/process"),
+        shed_response=hold_response,
+    )
+    
+    # Include routers
+    app.include_router(voice.router, prefix="/voice", tags=["voice"])
+    app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+    app.include_router(reports.router, prefix="/reports", tags=["reports"])
+    
+    @app.get("/")
+    async def root():
+        """Root endpoint."""
+        return {
+            "name": settings.PROJECT_NAME,
+            "version": settings.VERSION,
+            "status": "operational"
+        }
+    
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint."""
+        return {
+            "status": "healthy",
+            "environment": settings.ENVIRONMENT
+        }
+    
+    @app.get("/ready")
+    async def readiness_check(request: Request):
+        """Readiness endpoint; 503 until startup pre-warming finishes."""
+        if not request.app.state.ready:
+            return JSONResponse({"status": "starting"}, status_code=503)
+        return {"status": "ready"}
+    
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
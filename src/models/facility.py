@@ -1,7 +1,11 @@
+from typing import Iterator, Optional
+
 from sqlalchemy import Column, Integer, String, Float, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Query, Session, object_session, raiseload, relationship, selectinload
 
+from src.core.schedule import WeeklySchedule
 from src.models.base import Base
+from src.models.unit import Unit
 
 class Facility(Base):
     """Storage facility model"""
@@ -14,6 +18,8 @@ class Facility(Base):
     state = Column(String, nullable=False)
     zip_code = Column(String, nullable=False)
     phone = Column(String, nullable=False)
+    # Twilio number callers dial to reach this facility's agent (E.164)
+    twilio_number = Column(String, unique=True)
     email = Column(String)
     
     # Operating hours stored as JSON
@@ -32,35 +38,112 @@ class Facility(Base):
     api_secret = Column(String)
     
     # Relationships
-    units = relationship("Unit", back_populates="facility")
+    # Units are never lazy-loaded: large facilities hold thousands of them, so
+    # callers must either query through units_query() or opt in with
+    # Facility.with_units().
+    units = relationship("Unit", back_populates="facility", lazy="raise_on_sql")
     reservations = relationship("Reservation", back_populates="facility")
 
     def __repr__(self):
         return f"<Facility(name='{self.name}', city='{self.city}')>"
 
-    def get_available_units(self, size: str = None) -> list:
-        """Get list of available units, optionally filtered by size"""
-        query = [unit for unit in self.units if unit.available]
+    @classmethod
+    def with_units(cls):
+        """Loader option that eagerly loads units in a single SELECT ... IN query"""
+        return selectinload(cls.units)
+
+    def units_query(
+        self,
+        session: Optional[Session] = None,
+        available: Optional[bool] = None,
+        size: Optional[str] = None,
+        min_width: Optional[int] = None,
+        min_length: Optional[int] = None,
+        min_square_feet: Optional[int] = None,
+        max_square_feet: Optional[int] = None
+    ) -> Query:
+        """
+        Build a query over this facility's units with filters applied in SQL
+        
+        Args:
+            session: Session to query with, defaults to the facility's own session
+            available: Optional availability filter
+            size: Optional size filter (e.g., "10x10")
+            min_width: Optional minimum width in feet
+            min_length: Optional minimum length in feet
+            min_square_feet: Optional minimum area
+            max_square_feet: Optional maximum area
+            
+        Returns:
+            Query of Unit rows; unit reservations are never lazy-loaded from it
+        """
+        session = session or object_session(self)
+        if session is None:
+            raise RuntimeError(f"{self!r} is not attached to a session")
+        
+        query = (
+            session.query(Unit)
+            .filter(Unit.facility_id == self.id)
+            .options(raiseload(Unit.reservations))
+        )
+        if available is not None:
+            query = query.filter(Unit.available == available)
         if size:
-            query = [unit for unit in query if unit.size == size]
+            query = query.filter(Unit.size == size)
+        if min_width is not None:
+            query = query.filter(Unit.width_ft >= min_width)
+        if min_length is not None:
+            query = query.filter(Unit.length_ft >= min_length)
+        if min_square_feet is not None:
+            query = query.filter(Unit.square_feet >= min_square_feet)
+        if max_square_feet is not None:
+            query = query.filter(Unit.square_feet <= max_square_feet)
         return query
 
+    def get_available_units(self, size: str = None) -> list:
+        """Get list of available units, optionally filtered by size"""
+        return self.units_query(available=True, size=size).order_by(Unit.unit_id).all()
+
     def get_unit_by_id(self, unit_id: str):
         """Get unit by its identifier (e.g., 'A101')"""
-        for unit in self.units:
-            if unit.unit_id == unit_id:
-                return unit
-        return None
+        return self.units_query().filter(Unit.unit_id == unit_id).one_or_none()
+
+    def iter_units(
+        self,
+        available: Optional[bool] = None,
+        size: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Unit]:
+        """
+        Stream units in fixed-size batches instead of loading them all at once
+        
+        Args:
+            available: Optional availability filter
+            size: Optional size filter (e.g., "10x10")
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Unit rows ordered by primary key
+        """
+        query = self.units_query(available=available, size=size).order_by(Unit.id)
+        yield from query.yield_per(batch_size)
+
+    @property
+    def schedule(self) -> WeeklySchedule:
+        """Operating hours compiled once per facility, recompiled if hours are replaced"""
+        cached = self.__dict__.get('_schedule_cache')
+        if cached is None or cached[0] is not self.hours:
+            cached = (self.hours, WeeklySchedule.compile(self.hours))
+            self.__dict__['_schedule_cache'] = cached
+        return cached[1]
 
     def is_open(self, datetime_obj) -> bool:
         """Check if facility is open at given datetime"""
         try:
-            day = datetime_obj.strftime('%A').lower()
-            if day not in self.hours:
-                return False
-            
-            time_str = datetime_obj.strftime('%H:%M')
-            return self.hours[day]['open'] <= time_str <= self.hours[day]['close']
-            
-        except (KeyError, AttributeError):
+            return self.schedule.is_open(datetime_obj)
+        except AttributeError:
             return False
+
+    def next_open(self, datetime_obj):
+        """Get the next time the facility opens, or None if it never does"""
+        return self.schedule.next_open(datetime_obj)
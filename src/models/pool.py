@@ -0,0 +1,187 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds of the checkout wait histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool policy for one engine"""
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30
+    recycle: int = 1800
+    pre_ping: bool = True
+    use_lifo: bool = False
+    # Running behind a transaction-pooling proxy such as PgBouncer, where
+    # consecutive statements may land on different server connections
+    transaction_pooling: bool = False
+
+    @classmethod
+    def from_settings(cls, settings) -> "PoolConfig":
+        """Build the pool policy from application settings"""
+        return cls(
+            size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            timeout=settings.DATABASE_POOL_TIMEOUT,
+            recycle=settings.DATABASE_POOL_RECYCLE,
+            pre_ping=settings.DATABASE_POOL_PRE_PING,
+            use_lifo=settings.DATABASE_POOL_USE_LIFO,
+            transaction_pooling=settings.DATABASE_TRANSACTION_POOLING
+        )
+
+
+class PoolStats:
+    """Counters and a checkout wait-time histogram for one pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_histogram: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._lock = Lock()
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_histogram[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def snapshot(self) -> Dict:
+        """Counters as a JSON-friendly dict"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["le_inf"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_avg_ms": round(self.wait_total_ms / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including ones that time out"""
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        if '_dispatch' not in kwargs:
+            # A recreated pool inherits these listeners along with the stats
+            event.listen(self, 'connect', self._on_connect)
+            event.listen(self, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.stats.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.stats.invalidations += 1
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait((perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.stats.record_wait((perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def status_snapshot(self) -> Dict:
+        """Live pool occupancy plus accumulated stats"""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            **self.stats.snapshot(),
+        }
+
+
+def engine_options(database_url: str, config: PoolConfig) -> Dict:
+    """
+    Keyword arguments for create_engine that apply a pool policy
+
+    Args:
+        database_url: Database URL, used to pick driver-specific options
+        config: Pool policy
+
+    Returns:
+        Keyword arguments for sqlalchemy.create_engine
+    """
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.size,
+        "max_overflow": config.max_overflow,
+        "pool_timeout": config.timeout,
+        "pool_recycle": config.recycle,
+        "pool_pre_ping": config.pre_ping,
+        "pool_use_lifo": config.use_lifo,
+    }
+    if config.transaction_pooling:
+        # Prepared statements live on one server connection, which a
+        # transaction-pooling proxy does not pin, so the driver must not cache them
+        driver = make_url(database_url).get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        elif driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver in ("psycopg2", "pg8000"):
+            # These never prepare statements server-side, and their named
+            # cursors only live inside a transaction, so nothing needs turning off
+            logger.info(f"Transaction pooling needs no connection options for {driver}")
+        else:
+            logger.warning(
+                f"DATABASE_TRANSACTION_POOLING is ignored for driver {driver}; "
+                "its prepared statement cache, if any, stays on"
+            )
+    return options
+
+
+_engines: Dict[str, object] = {}
+
+
+def register_pool(name: str, engine) -> None:
+    """Expose an engine's pool stats under ``name``"""
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        _engines[name] = engine
+    else:
+        logger.warning(f"Engine {name} does not use an instrumented pool; stats unavailable")
+
+
+def pool_stats() -> Dict[str, Dict]:
+    """Snapshot of every registered engine's pool, keyed by name"""
+    # Read engine.pool each time since dispose() replaces it
+    return {name: engine.pool.status_snapshot() for name, engine in _engines.items()}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -15,6 +15,10 @@ class ReservationStatus(enum.Enum):
 class Reservation(Base):
     """Storage unit reservation model"""
     __tablename__ = 'reservations'
+    __table_args__ = (
+        # Lets the expiry sweeper find the oldest PENDING rows without a scan
+        Index('ix_reservations_status_created_at', 'status', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True)
     reservation_id = Column(String, unique=True, nullable=False)  # e.g., "R20250126123456"
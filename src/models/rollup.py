@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+
+from src.models.base import Base
+
+class OccupancyDailyRollup(Base):
+    """
+    Reservation activity per facility, unit size and day
+
+    Rows hold deltas rather than totals so each reservation state change
+    only touches the days it affects; occupancy and monthly recurring
+    revenue on a given day are the running sums of the deltas up to it.
+    """
+    __tablename__ = 'occupancy_daily_rollups'
+
+    facility_id = Column(Integer, ForeignKey('facilities.id', ondelete='CASCADE'), primary_key=True)
+    size = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    
+    # Reservations created, by created_at
+    new_reservations = Column(Integer, nullable=False, default=0)
+    # Rentals starting (by start_date) and ending (by end_date)
+    move_ins = Column(Integer, nullable=False, default=0)
+    move_outs = Column(Integer, nullable=False, default=0)
+    cancellations = Column(Integer, nullable=False, default=0)
+    # Change in the sum of monthly_price over occupied units
+    mrr_delta = Column(Float, nullable=False, default=0.0)
+    # Contract value (monthly_price * duration_months) of rentals starting that day
+    booked_revenue = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<OccupancyDailyRollup(facility_id={self.facility_id}, size='{self.size}', day={self.day})>"
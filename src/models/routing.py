@@ -0,0 +1,252 @@
+from contextlib import contextmanager
+from itertools import count
+from threading import Lock
+from time import monotonic
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.pool import PoolConfig, engine_options, register_pool
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Replica:
+    """A replica engine and when it may be tried again after failing"""
+
+    __slots__ = ("name", "engine", "sessionmaker", "down_until")
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = sessionmaker(bind=engine)
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= monotonic()
+
+
+class ReadYourWrites:
+    """
+    One flow's recent writes, so that flow's reads can follow them to the primary
+
+    A flow that must see what it wrote, such as a facility's bookings,
+    keeps one and passes it to both writer() and reader(). Other readers
+    keep using replicas. It is a plain object rather than a ContextVar so
+    it still applies when the write ran in a worker thread.
+    """
+
+    __slots__ = ("primary_until",)
+
+    def __init__(self):
+        # Until when (monotonic seconds) this flow's reads must see the primary
+        self.primary_until = 0.0
+
+    @property
+    def pending(self) -> bool:
+        """Whether a recent write may not have reached the replicas yet"""
+        return self.primary_until > monotonic()
+
+
+def _note_flush(session: Session, flush_context) -> None:
+    if session.new or session.deleted or any(session.is_modified(instance) for instance in session.dirty):
+        session.info['wrote'] = True
+
+
+def _note_statement(orm_execute_state):
+    if orm_execute_state.is_select:
+        return None
+    # Executed here to see how many rows an UPDATE, DELETE or INSERT touched
+    result = orm_execute_state.invoke_statement()
+    if not result.returns_rows and result.rowcount:
+        orm_execute_state.session.info['wrote'] = True
+    return result
+
+
+class RoutingSessionManager:
+    """
+    Routes read-only work to replicas and writes to the primary
+
+    Readers take replicas in round-robin order, skipping any that failed
+    recently; when none are healthy they fall back to the primary. Writers
+    always use the primary. A writer given a ReadYourWrites sends that
+    flow's reads to the primary for ``read_your_writes_seconds`` after a
+    commit that changed rows, so they never miss the write because of
+    replication lag. Background writers pass none and never hold readers
+    on the primary.
+    """
+
+    def __init__(
+        self,
+        primary,
+        replicas: Sequence = (),
+        retry_seconds: float = 30.0,
+        read_your_writes_seconds: float = 5.0
+    ):
+        """
+        Initialize the router
+
+        Args:
+            primary: Primary engine
+            replicas: Replica engines, in round-robin order
+            retry_seconds: How long a failed replica is skipped
+            read_your_writes_seconds: How long a flow's reads stick to the primary after it commits
+        """
+        self.primary = primary
+        self._primary_sessionmaker = sessionmaker(bind=primary)
+        event.listen(self._primary_sessionmaker, 'after_flush', _note_flush)
+        event.listen(self._primary_sessionmaker, 'do_orm_execute', _note_statement)
+        self._replicas: List[_Replica] = [
+            _Replica(f"replica-{index}", engine) for index, engine in enumerate(replicas, start=1)
+        ]
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._turn = count()
+        self._lock = Lock()
+
+    @classmethod
+    def from_urls(
+        cls,
+        primary,
+        replica_urls: Sequence[str],
+        pool: Optional[PoolConfig] = None,
+        **kwargs
+    ) -> "RoutingSessionManager":
+        """
+        Build a router over an existing primary engine and replica URLs
+
+        Args:
+            primary: Primary engine, e.g. from init_database
+            replica_urls: Replica database URLs
+            pool: Pool policy for each replica engine
+            **kwargs: Passed to the constructor
+
+        Returns:
+            RoutingSessionManager
+        """
+        pool = pool or PoolConfig()
+        replicas = []
+        for index, url in enumerate(replica_urls, start=1):
+            engine = create_engine(url, **engine_options(url, pool))
+            register_pool(f"replica-{index}", engine)
+            replicas.append(engine)
+        return cls(primary, replicas, **kwargs)
+
+    @property
+    def healthy_replicas(self) -> List[str]:
+        """Names of replicas currently eligible for reads"""
+        return [replica.name for replica in self._replicas if replica.healthy]
+
+    def _mark_down(self, replica: _Replica, error: Exception) -> None:
+        replica.down_until = monotonic() + self.retry_seconds
+        logger.warning(f"Replica {replica.name} unavailable for {self.retry_seconds}s: {error}")
+
+    def _next_replicas(self) -> Iterator[_Replica]:
+        """Healthy replicas starting from the next one in round-robin order"""
+        if not self._replicas:
+            return
+        with self._lock:
+            start = next(self._turn) % len(self._replicas)
+        for offset in range(len(self._replicas)):
+            replica = self._replicas[(start + offset) % len(self._replicas)]
+            if replica.healthy:
+                yield replica
+
+    def _replica_session(self) -> Optional[Session]:
+        """Open a session on the first healthy replica that accepts a connection"""
+        for replica in self._next_replicas():
+            session = replica.sessionmaker()
+            try:
+                # Connect now so a dead replica is skipped before any work runs
+                session.connection()
+                session.info['replica'] = replica.name
+                return session
+            except DBAPIError as e:
+                session.close()
+                self._mark_down(replica, e)
+        return None
+
+    @contextmanager
+    def reader(self, consistent: bool = False, after: Optional[ReadYourWrites] = None) -> Iterator[Session]:
+        """
+        Session for read-only work
+
+        Args:
+            consistent: Read from the primary, e.g. right after a write made elsewhere
+            after: The reading flow's writes; read from the primary while one is recent
+
+        Yields:
+            Session on a replica, or on the primary when consistency is required
+            or no replica is healthy. Changes made through it are rolled back.
+        """
+        session = None
+        if not consistent and not (after is not None and after.pending):
+            session = self._replica_session()
+        if session is None:
+            session = self._primary_sessionmaker()
+        try:
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
+    @contextmanager
+    def writer(self, writes: Optional[ReadYourWrites] = None) -> Iterator[Session]:
+        """
+        Session on the primary that commits on success and rolls back on error
+
+        Args:
+            writes: The writing flow's writes, for its later reads; None for
+                background work whose writes nobody reads back right away
+
+        Yields:
+            Session on the primary
+        """
+        session = self._primary_sessionmaker()
+        try:
+            yield session
+            session.commit()
+            if writes is not None and self.read_your_writes_seconds and session.info.get('wrote'):
+                writes.primary_until = max(writes.primary_until, monotonic() + self.read_your_writes_seconds)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def check_health(self) -> List[str]:
+        """
+        Ping every replica, reviving ones that answer and marking down ones that do not
+
+        Returns:
+            Names of healthy replicas
+        """
+        for replica in self._replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                replica.down_until = 0.0
+            except DBAPIError as e:
+                self._mark_down(replica, e)
+        return self.healthy_replicas
+
+
+_manager: Optional[RoutingSessionManager] = None
+
+
+def configure_session_manager(manager: RoutingSessionManager) -> RoutingSessionManager:
+    """Install the process-wide session manager"""
+    global _manager
+    _manager = manager
+    return manager
+
+
+def get_session_manager() -> RoutingSessionManager:
+    """Get the process-wide session manager"""
+    if _manager is None:
+        raise RuntimeError("Database not initialized; call init_database() first")
+    return _manager
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+
+from src.models.base import Base
+
+class InventorySyncState(Base):
+    """Where each facility's inventory sync left off in the management system's change feed"""
+    __tablename__ = 'inventory_sync_state'
+
+    facility_id = Column(Integer, ForeignKey('facilities.id', ondelete='CASCADE'), primary_key=True)
+    # Opaque change-feed position and validator returned by the management system
+    cursor = Column(String)
+    etag = Column(String)
+    last_synced_at = Column(DateTime)
+    units_synced = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<InventorySyncState(facility_id={self.facility_id}, cursor='{self.cursor}')>"
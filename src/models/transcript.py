@@ -0,0 +1,35 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Float, Text, DateTime, JSON, Index
+from datetime import datetime
+
+from src.models.base import Base
+
+class CallTranscript(Base):
+    """One caller utterance and the agent's answer"""
+    __tablename__ = 'call_transcripts'
+    __table_args__ = (
+        Index('ix_call_transcripts_call_sid_turn', 'call_sid', 'turn'),
+        Index('ix_call_transcripts_created_at', 'created_at'),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    call_sid = Column(String, nullable=False)
+    # Registry facility ID the call was answered for ("default" when unregistered)
+    facility_id = Column(String, nullable=False)
+    turn = Column(Integer, nullable=False)
+    
+    utterance = Column(Text, nullable=False)
+    intent = Column(String, nullable=False)
+    # Extracted entities as {"unit_size": "10x10", ...}
+    entities = Column(JSON, default=dict)
+    response = Column(Text, nullable=False)
+    
+    # Per-stage processing time in milliseconds
+    extract_ms = Column(Float)
+    intent_ms = Column(Float)
+    respond_ms = Column(Float)
+    render_ms = Column(Float)
+    
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CallTranscript(call_sid='{self.call_sid}', turn={self.turn}, intent='{self.intent}')>"
@@ -1,16 +1,34 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+import re
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.dialects.postgresql import ARRAY
 
 from src.models.base import Base
 
+# Grammar for size strings like "10x10" or "10 X 20". The width/length
+# backfill migration (8d2e4b6a1c57) applies the same pattern in SQL, so a
+# row parses the same whether it was backfilled or written through the ORM.
+SIZE_PATTERN = r'^\s*([0-9]+)\s*x\s*([0-9]+)\s*$'
+_SIZE_REGEX = re.compile(SIZE_PATTERN, re.IGNORECASE)
+
 class Unit(Base):
     """Storage unit model"""
     __tablename__ = 'units'
+    __table_args__ = (
+        # Covers the facility-scoped availability/size lookups in Facility.units_query
+        Index('ix_units_facility_available_size', 'facility_id', 'available', 'size'),
+        # Dimension and area range queries ("at least 10 feet wide")
+        Index('ix_units_width_length', 'width_ft', 'length_ft'),
+        Index('ix_units_square_feet', 'square_feet'),
+    )
 
     id = Column(Integer, primary_key=True)
     unit_id = Column(String, unique=True, nullable=False)  # e.g., "A101"
     size = Column(String, nullable=False)  # e.g., "10x10"
+    # Parsed from size on assignment so dimensions can be range-queried in SQL
+    width_ft = Column(Integer)
+    length_ft = Column(Integer)
     square_feet = Column(Integer, nullable=False)
     floor = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)
@@ -26,21 +44,37 @@ class Unit(Base):
     def __repr__(self):
         return f"<Unit(unit_id='{self.unit_id}', size='{self.size}', available={self.available})>"
 
+    @staticmethod
+    def parse_size(size: str) -> tuple:
+        """Parse a size string like "10x10" into (width, length), or (None, None)"""
+        match = _SIZE_REGEX.match(size) if isinstance(size, str) else None
+        if match is None:
+            return (None, None)
+        return (int(match.group(1)), int(match.group(2)))
+
+    @classmethod
+    def square_feet_for(cls, size: str) -> int:
+        """Square footage for a size string like "10x10", or 0 if it can't be parsed"""
+        width, length = cls.parse_size(size)
+        return width * length if width is not None else 0
+
+    @validates('size')
+    def _sync_dimensions(self, key, size):
+        """Keep the materialized width/length columns in step with size"""
+        self.width_ft, self.length_ft = self.parse_size(size)
+        return size
+
     @property
     def dimensions(self) -> tuple:
         """Get unit dimensions as (width, length)"""
-        try:
-            width, length = self.size.lower().split('x')
-            return (int(width), int(length))
-        except (ValueError, AttributeError):
-            return (0, 0)
+        return (self.width_ft or 0, self.length_ft or 0)
 
     @property
     def width(self) -> int:
         """Get unit width"""
-        return self.dimensions[0]
+        return self.width_ft or 0
 
     @property
     def length(self) -> int:
         """Get unit length"""
-        return self.dimensions[1]
+        return self.length_ft or 0
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from typing import Dict
+
+from src.models.pool import pool_stats
+from src.services.admission import get_admission_controller
+from src.services.webhook_dedup import get_webhook_dedup_cache
+
+router = APIRouter()
+
+@router.get("/pool")
+async def connection_pool_stats() -> Dict:
+    """
+    Database connection pool occupancy and checkout wait times
+    
+    Returns:
+        Stats per engine: checked-out and overflow connections, checkout
+        and timeout counts, and a checkout wait-time histogram
+    """
+    return pool_stats()
+
+@router.get("/webhooks")
+async def webhook_dedup_stats() -> Dict:
+    """
+    Twilio webhook retry handling
+    
+    Returns:
+        Remembered responses, requests in flight, and how many retries were
+        answered from the cache or joined an in-flight request
+    """
+    return get_webhook_dedup_cache().stats()
+
+@router.get("/admission")
+async def admission_stats() -> Dict:
+    """
+    Voice webhook admission control
+    
+    Returns:
+        Current concurrency limit, requests running and waiting, and how
+        many were admitted, queued and shed
+    """
+    return get_admission_controller().stats()
@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+
+from src.models.routing import get_session_manager
+from src.services.rollups import occupancy_series, revenue_summary
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+# Longest period one request may cover; rollups keep each day cheap, but
+# the daily series still grows with the range
+MAX_REPORT_DAYS = 366 * 5
+
+
+def _period(start: Optional[date], end: Optional[date]) -> tuple:
+    """Default to the last 30 days and reject inverted or oversized ranges"""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Reports cover at most {MAX_REPORT_DAYS} days")
+    return start, end
+
+
+def _reader():
+    try:
+        return get_session_manager().reader()
+    except RuntimeError:
+        raise HTTPException(status_code=503, detail="Reporting database unavailable")
+
+
+@router.get("/facilities/{facility_id}/occupancy")
+def facility_occupancy(
+    facility_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    size: Optional[str] = None
+) -> Dict:
+    """
+    Daily occupancy, move-ins/outs and monthly recurring revenue
+    
+    Args:
+        facility_id: Facility primary key
+        start: First day, defaults to 29 days before end
+        end: Last day, defaults to today (UTC)
+        size: Optional unit size filter (e.g., "10x10")
+        
+    Returns:
+        Facility unit count and one entry per day
+    """
+    start, end = _period(start, end)
+    with _reader() as session:
+        return occupancy_series(session, facility_id, start, end, size)
+
+
+@router.get("/facilities/{facility_id}/revenue")
+def facility_revenue(facility_id: int, start: Optional[date] = None, end: Optional[date] = None) -> Dict:
+    """
+    Booked revenue, activity and ending recurring revenue per unit size
+    
+    Args:
+        facility_id: Facility primary key
+        start: First day, defaults to 29 days before end
+        end: Last day, defaults to today (UTC)
+        
+    Returns:
+        Per-size rows and facility totals
+    """
+    start, end = _period(start, end)
+    with _reader() as session:
+        return revenue_summary(session, facility_id, start, end)
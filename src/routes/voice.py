@@ -1,22 +1,70 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import Response
-from typing import Dict
+from typing import Dict, Optional
 import os
 
+from src.core.config import get_settings
+from src.core.conversation import ConversationEngine
+from src.core.intent_classifier import get_intent_classifier
+from src.core.response_cache import get_response_cache
+from src.services.availability import get_availability_index
+from src.services.facility_registry import FacilityRecord, get_facility_registry
+from src.services.messaging import get_messenger
+from src.services.pricing import get_price_book
+from src.services.transcripts import get_transcript_writer
 from src.services.twilio_service import TwilioService
+from src.services.webhook_dedup import IDEMPOTENCY_HEADER, get_webhook_dedup_cache, webhook_key
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
-def get_twilio_service() -> TwilioService:
-    """Dependency to get configured TwilioService instance"""
-    return TwilioService(
-        account_sid=os.getenv('TWILIO_ACCOUNT_SID'),
-        auth_token=os.getenv('TWILIO_AUTH_TOKEN'),
-        phone_number=os.getenv('TWILIO_PHONE_NUMBER')
-    )
+# One TwilioService per facility so conversation state survives across turns
+_twilio_services: Dict[str, TwilioService] = {}
+
+def active_twilio_services() -> Dict[str, TwilioService]:
+    """Get the TwilioService instances created so far, keyed by facility ID"""
+    return dict(_twilio_services)
+
+def service_for_facility(facility: Optional[FacilityRecord]) -> TwilioService:
+    """Get the TwilioService for a facility, or the default facility when None"""
+    registry = get_facility_registry()
+    facility_id = facility.facility_id if facility else registry.default_facility_id
+    
+    service = _twilio_services.get(facility_id)
+    if service is None:
+        service = TwilioService(
+            account_sid=os.getenv('TWILIO_ACCOUNT_SID'),
+            auth_token=os.getenv('TWILIO_AUTH_TOKEN'),
+            phone_number=os.getenv('TWILIO_PHONE_NUMBER'),
+            facility=facility,
+            storage_service=registry.storage_service_for(facility),
+            locator=registry.locator,
+            price_book=get_price_book(),
+            availability=get_availability_index(),
+            response_cache=get_response_cache(),
+            transcripts=get_transcript_writer(),
+            messenger=get_messenger(),
+            intent_classifier=get_intent_classifier(),
+            intent_threshold=get_settings().INTENT_CONFIDENCE_THRESHOLD
+        )
+        service.registry_version = registry.version
+        _twilio_services[facility_id] = service
+    elif service.registry_version != registry.version:
+        # Registry was reloaded since this service last saw it
+        service.update_facility(facility, registry.storage_service_for(facility), registry.locator)
+        service.registry_version = registry.version
+    return service
+
+def conversation_engine_for(facility_id: str) -> ConversationEngine:
+    """Get the conversation engine for a facility ID, e.g. to restore sessions into"""
+    return service_for_facility(get_facility_registry().get(facility_id)).conversation_engine
+
+async def get_twilio_service(request: Request) -> TwilioService:
+    """Dependency to get the TwilioService for the facility whose number was dialed"""
+    form_data = await request.form()
+    return service_for_facility(get_facility_registry().lookup(form_data.get('To')))
 
 @router.post("/incoming")
 async def handle_incoming_call(
@@ -59,6 +107,9 @@ async def process_speech(
     """
     Process speech input from Twilio
     
+    A retry of a request already processed for the call gets the original
+    response back instead of running the turn again.
+    
     Args:
         request: FastAPI request object
         twilio: TwilioService instance
@@ -85,7 +136,15 @@ async def process_speech(
         
         # Process input and generate response
         input_text = speech_result if speech_result else f"Option {dtmf_result}"
-        response = twilio.process_speech(input_text, call_sid)
+        render = lambda: twilio.process_speech(input_text, call_sid, caller=form_data.get('From'))
+        if call_sid:
+            key = webhook_key(call_sid, form_data, request.headers.get(IDEMPOTENCY_HEADER))
+            response, duplicate = await get_webhook_dedup_cache().respond(key, render)
+            if duplicate:
+                logger.info(f"Replayed response to a retried webhook for call {call_sid}")
+                return Response(content=response, media_type="application/xml")
+        else:
+            response = render()
         logger.info(f"Processed speech input for call {call_sid}: {speech_result[:100]}...")
         
         return Response(content=response, media_type="application/xml")
@@ -0,0 +1,230 @@
+import asyncio
+from collections import deque
+from functools import lru_cache
+from time import monotonic
+from typing import Callable, Deque, Dict, Iterable
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit that follows observed latency (AIMD)
+
+    While requests finish within ``target_latency`` and the limit is being
+    used, it grows by about one per ``limit`` completions. A slow request
+    shrinks it by ``backoff``, at most once per ``target_latency`` so a
+    burst of slow requests counts as one signal rather than collapsing
+    the limit to its floor.
+    """
+
+    def __init__(
+        self,
+        initial: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        target_latency: float = 1.0,
+        backoff: float = 0.9
+    ):
+        """
+        Initialize limit
+
+        Args:
+            initial: Starting limit
+            min_limit: Floor the limit never drops below
+            max_limit: Ceiling the limit never grows past
+            target_latency: Seconds a request may take before the limit shrinks
+            backoff: Factor applied to the limit on a slow request
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._last_decrease = float('-inf')
+
+    @property
+    def current(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, latency: float, in_flight: int) -> None:
+        """
+        Adjust the limit after a request finishes
+
+        Args:
+            latency: Seconds the request took
+            in_flight: Requests running when it finished, including itself
+        """
+        if latency > self.target_latency:
+            now = monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+                self._last_decrease = now
+                logger.warning(f"Voice latency {latency:.2f}s over target, limit now {self.current}")
+        elif in_flight * 2 >= self._limit:
+            # Only grow when the limit is actually constraining concurrency
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+
+class AdmissionController:
+    """
+    Admits requests up to an adaptive limit, with a bounded wait queue
+
+    Requests over the limit wait in FIFO order for up to ``queue_timeout``
+    seconds; once ``max_queue`` are waiting, or a wait times out, the
+    request is shed. Only used from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, limit: AdaptiveLimit, max_queue: int = 64, queue_timeout: float = 2.0):
+        """
+        Initialize controller
+
+        Args:
+            limit: Concurrency limit
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Seconds a request may wait before being shed
+        """
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring load shedding"""
+        return {
+            "limit": self.limit.current,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+        }
+
+    async def acquire(self) -> bool:
+        """
+        Wait for a slot
+
+        Returns:
+            True when admitted; the caller must call release. False when shed.
+        """
+        if self.in_flight < self.limit.current and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future in self._waiters:
+                self._waiters.remove(future)
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed a slot just as the client went away
+                self._give_back()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self, latency: float) -> None:
+        """
+        Free a slot taken by acquire
+
+        Args:
+            latency: Seconds the request took, which steers the limit
+        """
+        self.limit.on_sample(latency, self.in_flight)
+        self._give_back()
+
+    def _give_back(self) -> None:
+        self.in_flight -= 1
+        # Slots pass straight to waiters so they are not taken by newcomers
+        while self._waiters and self.in_flight < self.limit.current:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that puts matching paths behind an AdmissionController
+
+    A shed request is answered at once with ``shed_response`` as a 200 TwiML
+    document, so Twilio plays it instead of timing out on a queued request.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        paths: Iterable[str],
+        shed_response: Callable[[], str]
+    ):
+        """
+        Initialize middleware
+
+        Args:
+            app: Wrapped ASGI application
+            controller: Decides which requests run
+            paths: Exact request paths to limit
+            shed_response: Returns the TwiML for shed requests; should be pre-rendered
+        """
+        self.app = app
+        self.controller = controller
+        self.paths = frozenset(paths)
+        self.shed_response = shed_response
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire():
+            body = self.shed_response().encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/xml"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(monotonic() - started)
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller for the voice routes"""
+    from src.core.config import get_settings
+
+    settings = get_settings()
+    return AdmissionController(
+        AdaptiveLimit(
+            initial=settings.ADMISSION_INITIAL_LIMIT,
+            min_limit=settings.ADMISSION_MIN_LIMIT,
+            max_limit=settings.ADMISSION_MAX_LIMIT,
+            target_latency=settings.ADMISSION_TARGET_LATENCY_SECONDS
+        ),
+        max_queue=settings.ADMISSION_QUEUE_SIZE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    )
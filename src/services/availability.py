@@ -0,0 +1,325 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import RLock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.base import NO_VALUE
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BucketKey = Tuple[str, bool]  # (size, climate_controlled)
+
+
+@dataclass(frozen=True)
+class SizeAvailability:
+    """Free-unit counts and price range for one size at one facility"""
+    size: str
+    total_units: int
+    available_units: int
+    min_price: Optional[float]
+    max_price: Optional[float]
+    climate_controlled: Optional[bool] = None  # None when both classes are combined
+
+    @property
+    def square_feet(self) -> int:
+        from src.models.unit import Unit
+
+        return Unit.square_feet_for(self.size)
+
+
+class _Bucket:
+    """Unit count plus sorted prices of the units still available"""
+
+    __slots__ = ("total", "prices")
+
+    def __init__(self):
+        self.total = 0
+        self.prices: List[float] = []
+
+
+class AvailabilityIndex:
+    """
+    Per-facility summary of free units and prices by size and climate class
+
+    Each (facility, size, climate class) bucket keeps its unit count and
+    the sorted prices of its available units, so counts and min/max price
+    are read without touching the units table and a unit changing hands
+    is a single sorted insert or delete.
+    """
+
+    def __init__(self):
+        self._facilities: Dict[str, Dict[BucketKey, _Bucket]] = {}
+        self._versions: Dict[str, int] = {}
+        self._global_version = 0
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = RLock()
+
+    def __contains__(self, facility_id: str) -> bool:
+        return facility_id in self._facilities
+
+    def version(self, facility_id: str) -> int:
+        """Counter that changes whenever a facility's availability changes"""
+        return self._versions.get(facility_id, 0)
+
+    @property
+    def global_version(self) -> int:
+        """Counter that changes whenever any facility's availability changes"""
+        return self._global_version
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback for availability changes
+
+        Args:
+            listener: Called with the facility ID whenever its version changes
+        """
+        self._listeners.append(listener)
+
+    def _bump(self, facility_id: str) -> None:
+        self._versions[facility_id] = self._versions.get(facility_id, 0) + 1
+        self._global_version += 1
+        for listener in self._listeners:
+            try:
+                listener(facility_id)
+            except Exception as e:
+                logger.error(f"Error notifying availability listener for {facility_id}: {e}")
+
+    def load(self, facility_id: str, units: Iterable) -> bool:
+        """
+        Rebuild one facility's summary from its units
+
+        Args:
+            facility_id: Facility ID
+            units: Objects with size, climate_controlled, price and available attributes
+
+        Returns:
+            True if the summary changed; an identical rebuild keeps the version
+        """
+        return self._load_counts(
+            facility_id,
+            ((unit.size, unit.climate_controlled, unit.price, unit.available, 1) for unit in units)
+        )
+
+    def _load_counts(self, facility_id: str, rows: Iterable[Tuple]) -> bool:
+        """Rebuild a facility's summary from (size, climate_controlled, price, available, count) rows"""
+        buckets: Dict[BucketKey, _Bucket] = {}
+        for size, climate_controlled, price, available, units in rows:
+            bucket = buckets.setdefault((size, bool(climate_controlled)), _Bucket())
+            bucket.total += units
+            if available:
+                bucket.prices.extend([price] * units)
+        for bucket in buckets.values():
+            bucket.prices.sort()
+
+        with self._lock:
+            current = self._facilities.get(facility_id)
+            if current is not None and _same_buckets(current, buckets):
+                return False
+            self._facilities[facility_id] = buckets
+            self._bump(facility_id)
+            return True
+
+    def load_from_database(self, session) -> int:
+        """
+        Rebuild every facility's summary from the units table
+
+        Run periodically, this reconciles the summary with changes it never
+        saw: writes from other workers or processes, and raw SQL updates.
+        Units are counted per facility, size, climate class, price and
+        availability in SQL, so one row comes back per distinct price
+        rather than per unit. Only facilities whose summary differs get a
+        new version.
+
+        Args:
+            session: SQLAlchemy session
+
+        Returns:
+            Number of facilities loaded
+        """
+        from sqlalchemy import func
+
+        from src.models.unit import Unit
+
+        columns = (Unit.facility_id, Unit.size, Unit.climate_controlled, Unit.price, Unit.available)
+        by_facility: Dict[str, list] = {}
+        for facility_id, *row in session.query(*columns, func.count()).group_by(*columns):
+            by_facility.setdefault(str(facility_id), []).append(row)
+        changed = sum(self._load_counts(facility_id, rows) for facility_id, rows in by_facility.items())
+
+        logger.info(f"Loaded availability for {len(by_facility)} facilities ({changed} changed)")
+        return len(by_facility)
+
+    def mark_unavailable(self, facility_id: str, size: str, climate_controlled: bool, price: float) -> None:
+        """Record that a unit was taken"""
+        with self._lock:
+            bucket = self._facilities.get(facility_id, {}).get((size, bool(climate_controlled)))
+            if bucket is None:
+                return
+            index = bisect_left(bucket.prices, price)
+            if index < len(bucket.prices) and bucket.prices[index] == price:
+                del bucket.prices[index]
+                self._bump(facility_id)
+
+    def mark_available(self, facility_id: str, size: str, climate_controlled: bool, price: float) -> None:
+        """Record that a unit was released"""
+        with self._lock:
+            buckets = self._facilities.get(facility_id)
+            if buckets is None:
+                return
+            bucket = buckets.get((size, bool(climate_controlled)))
+            if bucket is None:
+                bucket = buckets[(size, bool(climate_controlled))] = _Bucket()
+                bucket.total = 1
+            if len(bucket.prices) < bucket.total:
+                insort(bucket.prices, price)
+                self._bump(facility_id)
+
+    def replace_unit(self, facility_id: str, old: Optional[Tuple], new: Optional[Tuple]) -> None:
+        """
+        Record a unit being added, changed or removed
+
+        Args:
+            facility_id: Facility ID
+            old: Previous (size, climate_controlled, price, available), or None if new
+            new: Current (size, climate_controlled, price, available), or None if removed
+        """
+        with self._lock:
+            buckets = self._facilities.get(facility_id)
+            if buckets is None:
+                return
+            if old is not None:
+                size, climate_controlled, price, available = old
+                bucket = buckets.get((size, bool(climate_controlled)))
+                if bucket is not None:
+                    bucket.total -= 1
+                    index = bisect_left(bucket.prices, price)
+                    if available and index < len(bucket.prices) and bucket.prices[index] == price:
+                        del bucket.prices[index]
+                    if bucket.total <= 0:
+                        del buckets[(size, bool(climate_controlled))]
+            if new is not None:
+                size, climate_controlled, price, available = new
+                bucket = buckets.setdefault((size, bool(climate_controlled)), _Bucket())
+                bucket.total += 1
+                if available:
+                    insort(bucket.prices, price)
+            self._bump(facility_id)
+
+    def get(self, facility_id: str, size: str, climate_controlled: Optional[bool] = None) -> Optional[SizeAvailability]:
+        """
+        Get availability for one size
+
+        Args:
+            facility_id: Facility ID
+            size: Unit size (e.g., "10x10")
+            climate_controlled: Climate class, or None to combine both
+
+        Returns:
+            SizeAvailability or None if the facility has no units of that size
+        """
+        buckets = self._facilities.get(facility_id, {})
+        classes = (climate_controlled,) if climate_controlled is not None else (False, True)
+        matched = [
+            buckets[(size, climate)] for climate in classes if (size, climate) in buckets
+        ]
+        if not matched:
+            return None
+        prices = [bucket.prices for bucket in matched if bucket.prices]
+        return SizeAvailability(
+            size=size,
+            total_units=sum(bucket.total for bucket in matched),
+            available_units=sum(len(bucket.prices) for bucket in matched),
+            min_price=min(p[0] for p in prices) if prices else None,
+            max_price=max(p[-1] for p in prices) if prices else None,
+            climate_controlled=climate_controlled
+        )
+
+    def summary(self, facility_id: str) -> List[SizeAvailability]:
+        """Get availability for every size at a facility, smallest first"""
+        sizes = {size for size, _ in self._facilities.get(facility_id, {})}
+        return sorted(
+            (self.get(facility_id, size) for size in sizes),
+            key=lambda item: (item.square_feet, item.size)
+        )
+
+
+def _same_buckets(current: Dict[BucketKey, _Bucket], rebuilt: Dict[BucketKey, _Bucket]) -> bool:
+    return current.keys() == rebuilt.keys() and all(
+        bucket.total == rebuilt[key].total and bucket.prices == rebuilt[key].prices
+        for key, bucket in current.items()
+    )
+
+
+def _pending_changes(session: Session) -> list:
+    return session.info.setdefault('availability_changes', [])
+
+
+# Indexes kept in step by the ORM listeners, which are attached once per process
+_indexes: List[AvailabilityIndex] = []
+_listening = False
+
+
+def attach_unit_listeners(index: AvailabilityIndex) -> None:
+    """
+    Keep the index in step with Unit.available changes made through the ORM
+
+    Reservation.confirm/cancel/complete flip Unit.available; those changes
+    are queued on the session and applied once the transaction commits, so
+    a rolled-back reservation never leaks into the summary. Changes made
+    by other workers or in raw SQL are not seen here; the periodic
+    load_from_database reconcile picks those up.
+    """
+    global _listening
+    if index not in _indexes:
+        _indexes.append(index)
+    if not _listening:
+        from src.models.unit import Unit
+
+        event.listen(Unit.available, 'set', _on_available_set, active_history=True)
+        event.listen(Session, 'after_commit', _on_commit)
+        event.listen(Session, 'after_soft_rollback', _on_rollback)
+        _listening = True
+
+
+def _on_available_set(unit, value, oldvalue, initiator):
+    if oldvalue is NO_VALUE or oldvalue is None or bool(oldvalue) == bool(value):
+        return
+    change = (
+        str(unit.facility_id), unit.size, bool(unit.climate_controlled), unit.price, bool(value)
+    )
+    session = object_session(unit)
+    if session is None:
+        _apply([change])
+    else:
+        _pending_changes(session).append(change)
+
+
+def _on_commit(session):
+    if changes := session.info.pop('availability_changes', None):
+        _apply(changes)
+
+
+def _on_rollback(session, previous_transaction):
+    session.info.pop('availability_changes', None)
+
+
+def _apply(changes: list) -> None:
+    for index in _indexes:
+        for facility_id, size, climate_controlled, price, available in changes:
+            if available:
+                index.mark_available(facility_id, size, climate_controlled, price)
+            else:
+                index.mark_unavailable(facility_id, size, climate_controlled, price)
+
+
+@lru_cache()
+def get_availability_index() -> AvailabilityIndex:
+    """Get the process-wide availability index, wired to ORM unit changes"""
+    index = AvailabilityIndex()
+    attach_unit_listeners(index)
+    return index
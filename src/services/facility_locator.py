@@ -0,0 +1,195 @@
+from collections import defaultdict
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import csv
+
+from src.services.facility_registry import FacilityRecord
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+Coordinates = Tuple[float, float]
+AvailabilityCheck = Callable[[FacilityRecord, Optional[str]], bool]
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in miles"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(a))
+
+
+def load_zip_centroids(path: str) -> Dict[str, Coordinates]:
+    """
+    Load ZIP code centroids from a CSV file with zip,latitude,longitude columns
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        Mapping of 5-digit ZIP code to (latitude, longitude)
+    """
+    centroids = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                centroids[row['zip'].strip()[:5]] = (float(row['latitude']), float(row['longitude']))
+            except (KeyError, ValueError):
+                continue
+    logger.info(f"Loaded {len(centroids)} ZIP code centroids from {path}")
+    return centroids
+
+
+class FacilityLocator:
+    """
+    Nearest-facility search over a uniform latitude/longitude grid
+
+    Facilities are bucketed into fixed-size grid cells once. A query scans
+    rings of cells outward from the caller's cell and stops as soon as no
+    unvisited ring can hold anything closer than the results already found,
+    so only facilities near the caller are ever measured.
+    """
+
+    def __init__(
+        self,
+        facilities: Iterable[FacilityRecord],
+        cell_degrees: float = 0.5,
+        zip_centroids: Optional[Dict[str, Coordinates]] = None,
+        has_availability: Optional[AvailabilityCheck] = None
+    ):
+        """
+        Build the spatial index
+
+        Args:
+            facilities: Facilities to index; ones without coordinates are skipped
+            cell_degrees: Grid cell size in degrees
+            zip_centroids: Optional ZIP code to coordinates table
+            has_availability: Optional check used to filter results by unit size
+        """
+        self.cell_degrees = cell_degrees
+        self.has_availability = has_availability
+        self._cells: Dict[Tuple[int, int], List[Tuple[FacilityRecord, float, float]]] = defaultdict(list)
+
+        zip_points: Dict[str, List[Coordinates]] = defaultdict(list)
+        for facility in facilities:
+            if facility.latitude is None or facility.longitude is None:
+                continue
+            self._cells[self._cell(facility.latitude, facility.longitude)].append(
+                (facility, facility.latitude, facility.longitude)
+            )
+            zip_points[facility.zip_code[:5]].append((facility.latitude, facility.longitude))
+
+        # Facility ZIP codes fill in for centroids we were not given
+        self._zip_centroids: Dict[str, Coordinates] = {
+            zip_code: (
+                sum(lat for lat, _ in points) / len(points),
+                sum(lon for _, lon in points) / len(points)
+            )
+            for zip_code, points in zip_points.items()
+        }
+        self._zip_centroids.update(zip_centroids or {})
+
+        if self._cells:
+            rows = [row for row, _ in self._cells]
+            cols = [col for _, col in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = None
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._cells.values())
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (floor(latitude / self.cell_degrees), floor(longitude / self.cell_degrees))
+
+    def locate_zip(self, zip_code: str) -> Optional[Coordinates]:
+        """Get coordinates for a ZIP code, or None if unknown"""
+        return self._zip_centroids.get(zip_code.strip()[:5])
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int = 3,
+        size: Optional[str] = None,
+        max_miles: Optional[float] = None
+    ) -> List[Tuple[FacilityRecord, float]]:
+        """
+        Find the facilities closest to a point
+
+        Args:
+            latitude: Caller latitude
+            longitude: Caller longitude
+            limit: Maximum number of facilities to return
+            size: Optional unit size the facility must have available
+            max_miles: Optional search radius
+
+        Returns:
+            List of (facility, distance in miles), closest first
+        """
+        if limit <= 0 or self._bounds is None:
+            return []
+
+        row, col = self._cell(latitude, longitude)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+
+        results: List[Tuple[float, FacilityRecord]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(row, col, ring):
+                for facility, lat, lon in self._cells.get(cell, ()):
+                    distance = haversine_miles(latitude, longitude, lat, lon)
+                    if max_miles is not None and distance > max_miles:
+                        continue
+                    if size and self.has_availability and not self.has_availability(facility, size):
+                        continue
+                    results.append((distance, facility))
+
+            # Anything in ring + 1 or beyond is at least ``ring`` whole cells away
+            bound = ring * self._cell_miles(latitude, ring + 1)
+            if max_miles is not None and bound > max_miles:
+                break
+            if len(results) >= limit:
+                results.sort(key=lambda result: result[0])
+                if results[limit - 1][0] <= bound:
+                    break
+
+        results.sort(key=lambda result: result[0])
+        return [(facility, distance) for distance, facility in results[:limit]]
+
+    def nearest_to_zip(
+        self,
+        zip_code: str,
+        limit: int = 3,
+        size: Optional[str] = None,
+        max_miles: Optional[float] = None
+    ) -> List[Tuple[FacilityRecord, float]]:
+        """Find the facilities closest to a ZIP code's centroid"""
+        if not (coordinates := self.locate_zip(zip_code)):
+            logger.info(f"No coordinates known for ZIP code {zip_code}")
+            return []
+        return self.nearest(coordinates[0], coordinates[1], limit, size, max_miles)
+
+    def _cell_miles(self, latitude: float, rings: int) -> float:
+        """Smallest cell side in miles anywhere within ``rings`` cells of a latitude"""
+        worst_latitude = min(89.0, abs(latitude) + rings * self.cell_degrees)
+        height = self.cell_degrees * MILES_PER_DEGREE_LATITUDE
+        width = height * cos(radians(worst_latitude))
+        return min(height, width)
+
+    @staticmethod
+    def _ring_cells(row: int, col: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """Cells at exactly Chebyshev distance ``ring`` from (row, col)"""
+        if ring == 0:
+            yield (row, col)
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield (row - ring, c)
+            yield (row + ring, c)
+        for r in range(row - ring + 1, row + ring):
+            yield (r, col - ring)
+            yield (r, col + ring)
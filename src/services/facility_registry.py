@@ -0,0 +1,289 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+import os
+import re
+
+from src.core.schedule import WeeklySchedule
+from src.services.storage_service import StorageService
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from src.models.routing import RoutingSessionManager
+    from src.services.availability import AvailabilityIndex
+    from src.services.facility_locator import FacilityLocator
+
+logger = get_logger(__name__)
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone_number(number: Optional[str]) -> Optional[str]:
+    """
+    Normalize a phone number to E.164 so "(555) 010-0123" and "+15550100123" match
+
+    Args:
+        number: Phone number in any common format
+
+    Returns:
+        E.164 formatted number, or None if no digits were given
+    """
+    if not number:
+        return None
+    digits = _NON_DIGITS.sub('', number)
+    if not digits:
+        return None
+    if len(digits) == 10:
+        # Bare North American number
+        digits = f"1{digits}"
+    return f"+{digits}"
+
+
+@dataclass(frozen=True)
+class FacilityRecord:
+    """Immutable snapshot of the facility data the voice path needs"""
+    facility_id: str
+    name: str
+    address: str
+    city: str
+    state: str
+    zip_code: str
+    phone: str
+    twilio_number: Optional[str] = None
+    hours: Dict = field(default_factory=dict)
+    amenities: List[str] = field(default_factory=list)
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    api_key: Optional[str] = None
+    schedule: WeeklySchedule = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.schedule is None:
+            object.__setattr__(self, 'schedule', WeeklySchedule.compile(self.hours))
+
+    @classmethod
+    def from_model(cls, facility) -> "FacilityRecord":
+        """Build a record from a Facility model instance"""
+        return cls(
+            facility_id=str(facility.id),
+            name=facility.name,
+            address=facility.address,
+            city=facility.city,
+            state=facility.state,
+            zip_code=facility.zip_code,
+            phone=facility.phone,
+            twilio_number=facility.twilio_number,
+            hours=facility.hours or {},
+            amenities=list(facility.amenities or []),
+            latitude=facility.latitude,
+            longitude=facility.longitude,
+            api_key=facility.api_key
+        )
+
+    @property
+    def dialed_numbers(self) -> List[str]:
+        """Numbers that route calls to this facility"""
+        return [
+            number for number in (
+                normalize_phone_number(self.twilio_number),
+                normalize_phone_number(self.phone)
+            ) if number
+        ]
+
+
+class FacilityRegistry:
+    """
+    In-memory registry mapping dialed numbers to facilities
+
+    Lookups are a single dict access on an immutable snapshot. Reloading
+    builds new maps off to the side and swaps them in, so requests in flight
+    never see a half-built registry.
+    """
+
+    def __init__(
+        self,
+        default_facility_id: str = "default",
+        default_api_key: str = "default",
+        zip_centroids: Optional[Dict[str, Tuple[float, float]]] = None,
+        availability: Optional["AvailabilityIndex"] = None
+    ):
+        """
+        Initialize an empty registry
+
+        Args:
+            default_facility_id: Facility ID used when a dialed number is unknown
+            default_api_key: API key for the default facility's storage service
+            zip_centroids: Optional ZIP code coordinates for nearest-facility search
+            availability: Optional availability summary; its changes invalidate
+                the storage services' inventory indexes
+        """
+        self.default_facility_id = default_facility_id
+        self.default_api_key = default_api_key
+        self.zip_centroids = zip_centroids or {}
+        self.version = 0
+        self.locator: Optional["FacilityLocator"] = None
+        self._facilities: Dict[str, FacilityRecord] = {}
+        self._by_number: Dict[str, FacilityRecord] = {}
+        self._storage_services: Dict[str, StorageService] = {}
+        self._lock = Lock()
+        self.availability = availability
+        if availability is not None:
+            availability.add_listener(self.invalidate_inventory)
+        self.db: Optional["RoutingSessionManager"] = None
+
+    def attach_database(self, db: "RoutingSessionManager") -> None:
+        """
+        Serve registered facilities' inventory from the database
+
+        Storage services created before this are dropped, so every facility
+        gets one backed by the units table. The default facility has no
+        row and keeps its development data.
+
+        Args:
+            db: Session manager routing reads to replicas
+        """
+        with self._lock:
+            self.db = db
+            self._storage_services = {}
+
+    def __len__(self) -> int:
+        return len(self._facilities)
+
+    def load(self, records: Iterable[FacilityRecord]) -> int:
+        """
+        Replace the registry contents with the given facilities
+
+        Args:
+            records: Facility snapshots to serve
+
+        Returns:
+            Number of facilities loaded
+        """
+        facilities: Dict[str, FacilityRecord] = {}
+        by_number: Dict[str, FacilityRecord] = {}
+        for record in records:
+            facilities[record.facility_id] = record
+            for number in record.dialed_numbers:
+                if number in by_number and by_number[number].facility_id != record.facility_id:
+                    logger.warning(
+                        f"Number {number} is shared by facilities "
+                        f"{by_number[number].facility_id} and {record.facility_id}"
+                    )
+                    continue
+                by_number[number] = record
+
+        from src.services.facility_locator import FacilityLocator
+
+        locator = FacilityLocator(
+            facilities.values(),
+            zip_centroids=self.zip_centroids,
+            has_availability=self._has_availability
+        )
+
+        with self._lock:
+            # Keep storage services for facilities whose data did not change
+            previous = self._facilities
+            self._storage_services = {
+                facility_id: service
+                for facility_id, service in self._storage_services.items()
+                if facility_id in facilities and previous.get(facility_id) == facilities[facility_id]
+            }
+            self._facilities = facilities
+            self._by_number = by_number
+            self.locator = locator
+            self.version += 1
+
+        logger.info(f"Loaded {len(facilities)} facilities into registry (version {self.version})")
+        return len(facilities)
+
+    def load_from_database(self, session) -> int:
+        """
+        Load all facilities from the database
+
+        Args:
+            session: SQLAlchemy session
+
+        Returns:
+            Number of facilities loaded
+        """
+        from src.models.facility import Facility
+
+        facilities = session.query(Facility).all()
+        return self.load(FacilityRecord.from_model(facility) for facility in facilities)
+
+    def lookup(self, dialed_number: Optional[str]) -> Optional[FacilityRecord]:
+        """
+        Find the facility for the number a caller dialed
+
+        Args:
+            dialed_number: The webhook's "To" number
+
+        Returns:
+            FacilityRecord or None if the number is not registered
+        """
+        number = normalize_phone_number(dialed_number)
+        return self._by_number.get(number) if number else None
+
+    def get(self, facility_id: str) -> Optional[FacilityRecord]:
+        """Get a facility by ID"""
+        return self._facilities.get(facility_id)
+
+    def facilities(self) -> List[FacilityRecord]:
+        """Get all registered facilities"""
+        return list(self._facilities.values())
+
+    def _has_availability(self, facility: FacilityRecord, size: Optional[str]) -> bool:
+        """Check whether a facility has an available unit of the given size"""
+        if self.availability is not None and facility.facility_id in self.availability:
+            match = self.availability.get(facility.facility_id, size)
+            return bool(match and match.available_units)
+        # Not summarized yet, so ask the facility's inventory directly
+        return bool(self.storage_service_for(facility).get_available_units(size))
+
+    def invalidate_inventory(self, facility_id: str) -> None:
+        """Drop a facility's derived inventory indexes, if its storage service exists"""
+        if (service := self._storage_services.get(facility_id)) is not None:
+            service.invalidate_inventory()
+
+    def storage_service_for(self, facility: Optional[FacilityRecord]) -> StorageService:
+        """
+        Get the storage service for a facility, creating it on first use
+
+        Args:
+            facility: Facility record, or None for the default facility
+
+        Returns:
+            StorageService scoped to the facility
+        """
+        if facility is None:
+            facility_id, api_key, db = self.default_facility_id, self.default_api_key, None
+        else:
+            facility_id, api_key, db = facility.facility_id, facility.api_key or self.default_api_key, self.db
+
+        service = self._storage_services.get(facility_id)
+        if service is None:
+            with self._lock:
+                service = self._storage_services.get(facility_id)
+                if service is None:
+                    service = StorageService(facility_id, api_key, db=db)
+                    self._storage_services[facility_id] = service
+        return service
+
+
+@lru_cache()
+def get_facility_registry() -> FacilityRegistry:
+    """Get the process-wide facility registry"""
+    from src.services.availability import get_availability_index
+
+    zip_centroids = None
+    if zip_centroids_path := os.getenv('ZIP_CENTROIDS_PATH'):
+        from src.services.facility_locator import load_zip_centroids
+        zip_centroids = load_zip_centroids(zip_centroids_path)
+    
+    return FacilityRegistry(
+        default_facility_id=os.getenv('FACILITY_ID', 'default'),
+        default_api_key=os.getenv('FACILITY_API_KEY', 'default'),
+        zip_centroids=zip_centroids,
+        availability=get_availability_index()
+    )
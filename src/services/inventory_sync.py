@@ -0,0 +1,285 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from src.services.availability import AvailabilityIndex
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+# Columns the management system owns; everything else on Unit is local
+SYNCED_COLUMNS = (
+    'size', 'width_ft', 'length_ft', 'square_feet', 'floor', 'price',
+    'climate_controlled', 'available', 'features',
+)
+
+
+@dataclass
+class ChangePage:
+    """One page of the management system's unit change feed"""
+    units: List[Dict]
+    cursor: Optional[str]
+    etag: Optional[str]
+    has_more: bool = False
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one facility"""
+    facility_id: int
+    units_changed: int = 0
+    pages: int = 0
+    not_modified: bool = False
+
+
+def unit_row(facility_id: int, unit: Dict) -> Dict:
+    """
+    Map a change-feed unit onto a units table row
+
+    Args:
+        facility_id: Local facility ID
+        unit: Unit as returned by the management system
+
+    Returns:
+        Column values for the upsert
+
+    Raises:
+        ValueError: If the unit is missing a required field or has a malformed one
+    """
+    from src.models.unit import Unit
+
+    try:
+        if not unit['unit_id'] or not isinstance(unit['size'], str):
+            raise ValueError("unit_id and size are required")
+        width, length = Unit.parse_size(unit['size'])
+        square_feet = unit.get('square_feet') or ((width or 0) * (length or 0))
+        return {
+            'unit_id': str(unit['unit_id']),
+            'facility_id': facility_id,
+            'size': unit['size'],
+            'width_ft': width,
+            'length_ft': length,
+            'square_feet': int(square_feet),
+            'floor': int(unit.get('floor') or 1),
+            'price': float(unit['price']),
+            'climate_controlled': bool(unit.get('climate_controlled', False)),
+            'available': bool(unit.get('available', True)),
+            'features': list(unit.get('features') or []),
+        }
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"Malformed unit {unit!r}: {e!r}") from e
+
+
+class InventorySync:
+    """
+    Pulls unit and price changes from the facility management system
+
+    Each facility keeps a change-feed cursor and ETag in
+    inventory_sync_state, so a sync asks only for what changed since the
+    last one; an unchanged facility costs one 304 response. Changes are
+    written with one INSERT ... ON CONFLICT DO UPDATE per page and the
+    cursor advances in the same transaction, so an interrupted sync resumes
+    where it stopped.
+
+    Expected API: ``GET /facilities/{id}/units/changes?cursor=&limit=``
+    returning ``{"units": [...], "next_cursor": "...", "has_more": bool}``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        page_size: int = 1000,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        transport: Optional["httpx.BaseTransport"] = None
+    ):
+        """
+        Initialize the sync engine with a pooled HTTP client
+
+        Args:
+            base_url: Management system API root
+            page_size: Units requested per page
+            timeout: Per-request timeout in seconds
+            max_connections: Size of the keep-alive connection pool
+            transport: Optional transport, e.g. httpx.MockTransport in tests
+        """
+        import httpx
+
+        self.page_size = page_size
+        self.client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport
+        )
+
+    def close(self):
+        """Close pooled connections"""
+        self.client.close()
+
+    def fetch_changes(
+        self,
+        facility_id: int,
+        cursor: Optional[str],
+        etag: Optional[str],
+        auth: Optional[Tuple[str, str]] = None
+    ) -> Iterator[ChangePage]:
+        """
+        Page through a facility's changes since ``cursor``
+
+        Args:
+            facility_id: Facility ID in the management system
+            cursor: Position returned by the previous sync, or None for a full sync
+            etag: ETag returned by the previous sync
+            auth: Optional (api_key, api_secret) credentials
+
+        Yields:
+            ChangePage per response; nothing when the feed is not modified
+        """
+        headers = {'If-None-Match': etag} if etag else {}
+        while True:
+            params = {'limit': self.page_size}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(
+                f"/facilities/{facility_id}/units/changes",
+                params=params,
+                headers=headers,
+                auth=auth
+            )
+            if response.status_code == 304:
+                return
+            response.raise_for_status()
+
+            body = response.json()
+            cursor = body.get('next_cursor') or cursor
+            page = ChangePage(
+                units=body.get('units', []),
+                cursor=cursor,
+                etag=response.headers.get('ETag'),
+                has_more=bool(body.get('has_more'))
+            )
+            yield page
+            if not page.has_more:
+                return
+            # Validators only apply to the first request of a sync
+            headers = {}
+
+    def sync_facility(self, session, facility, availability: Optional[AvailabilityIndex] = None) -> SyncResult:
+        """
+        Apply a facility's pending changes to the units table
+
+        Args:
+            session: SQLAlchemy session on PostgreSQL
+            facility: Facility model instance
+            availability: Optional availability summary to update in place
+
+        Returns:
+            SyncResult for the facility
+        """
+        from src.models.sync_state import InventorySyncState
+
+        state = session.get(InventorySyncState, facility.id)
+        if state is None:
+            state = InventorySyncState(facility_id=facility.id, units_synced=0)
+            session.add(state)
+
+        auth = (facility.api_key, facility.api_secret or '') if facility.api_key else None
+        result = SyncResult(facility_id=facility.id, not_modified=True)
+        for page in self.fetch_changes(facility.id, state.cursor, state.etag, auth):
+            result.not_modified = False
+            changes = self._upsert_units(session, facility.id, page.units)
+            state.cursor = page.cursor
+            state.etag = page.etag or state.etag
+            state.last_synced_at = datetime.utcnow()
+            state.units_synced += len(page.units)
+            session.commit()
+
+            result.pages += 1
+            result.units_changed += len(page.units)
+            if availability is not None:
+                for old, new in changes:
+                    availability.replace_unit(str(facility.id), old, new)
+
+        if result.not_modified:
+            state.last_synced_at = datetime.utcnow()
+            session.commit()
+
+        if result.units_changed:
+            logger.info(f"Synced {result.units_changed} changed units for facility {facility.id}")
+        return result
+
+    def _upsert_units(self, session, facility_id: int, units: List[Dict]) -> List[Tuple]:
+        """
+        Upsert one page of units and return (old, new) availability tuples
+
+        Units whose unit_id belongs to another facility are left untouched,
+        and malformed units are logged and skipped so the rest of the page
+        still applies.
+        """
+        rows = {}
+        for unit in units:
+            try:
+                row = unit_row(facility_id, unit)
+            except ValueError as e:
+                logger.warning(f"Skipping unit for facility {facility_id}: {e}")
+                continue
+            rows[row['unit_id']] = row
+        if not rows:
+            return []
+
+        from sqlalchemy.dialects.postgresql import insert
+
+        from src.models.unit import Unit
+
+        previous = {
+            row.unit_id: (row.size, bool(row.climate_controlled), row.price, bool(row.available))
+            for row in session.query(
+                Unit.unit_id, Unit.size, Unit.climate_controlled, Unit.price, Unit.available
+            ).filter(Unit.facility_id == facility_id, Unit.unit_id.in_(list(rows)))
+        }
+
+        statement = insert(Unit.__table__).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[Unit.__table__.c.unit_id],
+            set_={column: statement.excluded[column] for column in SYNCED_COLUMNS},
+            where=Unit.__table__.c.facility_id == statement.excluded.facility_id
+        )
+        statement = statement.returning(Unit.__table__.c.unit_id)
+        applied = session.execute(statement).scalars().all()
+
+        return [
+            (
+                previous.get(unit_id),
+                (rows[unit_id]['size'], rows[unit_id]['climate_controlled'],
+                 rows[unit_id]['price'], rows[unit_id]['available'])
+            )
+            for unit_id in applied
+        ]
+
+    def sync_all(self, session, availability: Optional[AvailabilityIndex] = None) -> int:
+        """
+        Sync every facility that has management system credentials
+
+        Args:
+            session: SQLAlchemy session on PostgreSQL
+            availability: Optional availability summary to update in place
+
+        Returns:
+            Total number of changed units applied
+        """
+        import httpx
+
+        from src.models.facility import Facility
+
+        total = 0
+        for facility in session.query(Facility).filter(Facility.api_key.isnot(None)).all():
+            try:
+                total += self.sync_facility(session, facility, availability).units_changed
+            except (httpx.HTTPError, ValueError) as e:
+                session.rollback()
+                logger.error(f"Error syncing inventory for facility {facility.id}: {e}")
+        return total
@@ -0,0 +1,286 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+# Responses worth retrying; other 4xx errors (bad number, opted out) are final
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by all senders on one account
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    ``acquire`` waits until a token is free instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst, defaults to one second's worth
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Wait for and take one token"""
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class OutboundMessage:
+    """An SMS waiting to be sent"""
+    to: str
+    body: str
+    kind: str = "general"
+    from_number: Optional[str] = None
+    attempts: int = 0
+
+
+class OutboundMessenger:
+    """
+    Queue of outbound SMS sent by a pool of workers through the Twilio REST API
+
+    Webhooks only enqueue, so sending never adds latency to a call. Workers
+    share one keep-alive HTTP client and one token bucket sized to the
+    account's rate limit, and retry throttling or server errors with
+    jittered exponential backoff, honoring Retry-After when Twilio sends it.
+    """
+
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        base_url: str = "https://api.twilio.com",
+        workers: int = 4,
+        rate_per_second: float = 1.0,
+        burst: Optional[float] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_pending: int = 1000,
+        transport: Optional["httpx.AsyncBaseTransport"] = None
+    ):
+        """
+        Initialize a stopped messenger
+
+        Args:
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            from_number: Number messages are sent from
+            base_url: Twilio API root, overridable for a local fake
+            workers: Concurrent senders
+            rate_per_second: Account message rate limit
+            burst: Messages allowed back to back, defaults to one second's worth
+            max_retries: Retries after the first attempt
+            backoff_base: First retry delay in seconds before jitter
+            backoff_max: Ceiling on any single retry delay
+            max_pending: Messages queued before new ones are rejected
+            transport: Optional transport, e.g. httpx.MockTransport in tests
+        """
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.base_url = base_url
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pending = max_pending
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self._transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def stats(self) -> Dict[str, int]:
+        """Delivery counters"""
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+        }
+
+    def start(self) -> None:
+        """Open the HTTP client and start workers on the running event loop"""
+        if self._workers:
+            return
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            auth=(self.account_sid, self.auth_token),
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers),
+            transport=self._transport
+        )
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Give queued messages up to ``timeout`` seconds to go out, then stop
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping messenger with {self._queue.qsize()} messages unsent")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self._client.aclose()
+        logger.info(f"Messenger stopped: {self.stats()}")
+
+    def enqueue(self, to: str, body: str, kind: str = "general", from_number: Optional[str] = None) -> bool:
+        """
+        Queue a message without blocking; must be called on the event loop thread
+
+        Args:
+            to: Recipient number
+            body: Message text
+            kind: Label for logging, e.g. "directions"
+            from_number: Number to send from, e.g. the facility's; defaults to the account's
+
+        Returns:
+            True if queued, False if the messenger is stopped or backlogged
+        """
+        if not self._workers:
+            return False
+        try:
+            self._queue.put_nowait(OutboundMessage(to=to, body=body, kind=kind, from_number=from_number))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"SMS queue full, dropped {kind} message to {to}")
+            return False
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._deliver(message)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error sending {message.kind} message to {message.to}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number ``attempt``: full jitter around an exponential step"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        step = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return random.uniform(step / 2, step)
+
+    async def _deliver(self, message: OutboundMessage) -> None:
+        import httpx
+
+        url = f"/2010-04-01/Accounts/{self.account_sid}/Messages.json"
+        data = {"To": message.to, "From": message.from_number or self.from_number, "Body": message.body}
+        while True:
+            await self.bucket.acquire()
+            message.attempts += 1
+            retry_after = None
+            try:
+                response = await self._client.post(url, data=data)
+                if response.status_code < 400:
+                    self.sent += 1
+                    logger.info(f"Sent {message.kind} message to {message.to}")
+                    return
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.failed += 1
+                    logger.error(
+                        f"Twilio rejected {message.kind} message to {message.to}: "
+                        f"{response.status_code} {response.text[:200]}"
+                    )
+                    return
+                retry_after = response.headers.get("Retry-After")
+                reason = f"HTTP {response.status_code}"
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # The request never reached Twilio, so sending again is safe
+                reason = str(e) or type(e).__name__
+            except httpx.TransportError as e:
+                # After a read timeout or a dropped response Twilio may already
+                # have accepted the message, and resending would text twice
+                self.failed += 1
+                logger.error(
+                    f"Not retrying {message.kind} message to {message.to}, which may have been sent: "
+                    f"{str(e) or type(e).__name__}"
+                )
+                return
+
+            if message.attempts > self.max_retries:
+                self.failed += 1
+                logger.error(f"Giving up on {message.kind} message to {message.to} after {reason}")
+                return
+            self.retried += 1
+            await asyncio.sleep(self._backoff(message.attempts - 1, retry_after))
+
+
+@lru_cache()
+def get_messenger() -> OutboundMessenger:
+    """Get the process-wide outbound messenger"""
+    from src.core.config import get_settings
+
+    settings = get_settings()
+    return OutboundMessenger(
+        account_sid=settings.TWILIO_ACCOUNT_SID,
+        auth_token=settings.TWILIO_AUTH_TOKEN,
+        from_number=settings.TWILIO_PHONE_NUMBER,
+        base_url=settings.TWILIO_API_BASE_URL,
+        workers=settings.SMS_WORKERS,
+        rate_per_second=settings.SMS_RATE_PER_SECOND,
+        max_retries=settings.SMS_MAX_RETRIES
+    )
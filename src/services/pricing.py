@@ -0,0 +1,264 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
+
+# Typical self-storage demand curve: summer moves peak, winter is slow
+DEFAULT_SEASONALITY = (0.96, 0.96, 0.98, 1.0, 1.03, 1.06, 1.07, 1.06, 1.02, 0.99, 0.97, 0.96)
+
+RateKey = Tuple[str, str, bool]  # (facility_id, size, climate_controlled)
+
+
+@dataclass(frozen=True)
+class PricingPolicy:
+    """Knobs for turning occupancy, demand and season into a rate"""
+    target_occupancy: float = 0.85
+    occupancy_sensitivity: float = 0.5  # Rate change per unit of occupancy above/below target
+    demand_sensitivity: float = 0.2  # Rate change per recent move-in per unit
+    seasonality: Sequence[float] = DEFAULT_SEASONALITY
+    min_multiplier: float = 0.8
+    max_multiplier: float = 1.3
+
+
+@dataclass(frozen=True)
+class RateQuote:
+    """Recommended rate for one unit type at one facility"""
+    rate: float
+    base_price: float
+    occupancy: float
+    total_units: int
+    available_units: int
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """Immutable, versioned set of recommended rates"""
+    version: int
+    generated_at: datetime
+    rates: Dict[RateKey, RateQuote]
+    # Cheapest rate per size across climate classes, sorted by square footage
+    by_facility: Dict[str, List[Tuple[str, float]]] = field(default_factory=dict)
+    # The same cheapest rates keyed by (facility_id, size) for direct lookup
+    cheapest: Dict[Tuple[str, str], float] = field(default_factory=dict)
+
+    def get(self, facility_id: str, size: str, climate_controlled: Optional[bool] = None) -> Optional[float]:
+        """
+        Look up a recommended rate
+
+        Args:
+            facility_id: Facility ID
+            size: Unit size (e.g., "10x10")
+            climate_controlled: Climate class, or None for the cheapest of either
+
+        Returns:
+            Monthly rate or None if the facility has no such units
+        """
+        if climate_controlled is not None:
+            quote = self.rates.get((facility_id, size, climate_controlled))
+            return quote.rate if quote else None
+        return self.cheapest.get((facility_id, size))
+
+    def sizes_for(self, facility_id: str) -> List[Tuple[str, float]]:
+        """Get (size, cheapest rate) pairs for a facility, smallest first"""
+        return self.by_facility.get(facility_id, [])
+
+
+def compute_rates(
+    facility_ids: "np.ndarray",
+    sizes: "np.ndarray",
+    climate_controlled: "np.ndarray",
+    prices: "np.ndarray",
+    available: "np.ndarray",
+    recent_move_ins: Optional["np.ndarray"] = None,
+    policy: PricingPolicy = PricingPolicy(),
+    at: Optional[datetime] = None
+) -> Dict[RateKey, RateQuote]:
+    """
+    Compute recommended rates for every unit type across the whole inventory
+
+    Each argument is one array entry per unit. Units are grouped by
+    (facility, size, climate class) with array operations only, so cost
+    grows with the inventory size but never loops per unit in Python.
+
+    Args:
+        facility_ids: Facility ID per unit
+        sizes: Size string per unit
+        climate_controlled: Climate class per unit
+        prices: Current list price per unit
+        available: Availability per unit
+        recent_move_ins: Optional recent reservation count per unit
+        policy: Pricing policy
+        at: Time the rates are for, used for seasonality
+
+    Returns:
+        Mapping of (facility_id, size, climate_controlled) to RateQuote
+    """
+    import numpy as np
+
+    if len(facility_ids) == 0:
+        return {}
+    at = at or datetime.now()
+
+    facility_values, facility_codes = np.unique(facility_ids.astype(str), return_inverse=True)
+    size_values, size_codes = np.unique(sizes.astype(str), return_inverse=True)
+    climate_codes = climate_controlled.astype(np.int64)
+
+    composite = (facility_codes.astype(np.int64) * len(size_values) + size_codes) * 2 + climate_codes
+    group_keys, groups = np.unique(composite, return_inverse=True)
+
+    totals = np.bincount(groups)
+    free = np.bincount(groups, weights=available.astype(np.float64))
+    base_prices = np.bincount(groups, weights=prices.astype(np.float64)) / totals
+    occupancy = 1.0 - free / totals
+
+    multiplier = 1.0 + policy.occupancy_sensitivity * (occupancy - policy.target_occupancy)
+    if recent_move_ins is not None:
+        demand = np.bincount(groups, weights=recent_move_ins.astype(np.float64)) / totals
+        multiplier += policy.demand_sensitivity * (demand - demand.mean())
+    multiplier = np.clip(multiplier, policy.min_multiplier, policy.max_multiplier)
+
+    rates = base_prices * multiplier * policy.seasonality[at.month - 1]
+    # Price points end in .99
+    rates = np.maximum(np.floor(rates), 1.0) + 0.99
+
+    group_climate = (group_keys % 2).astype(bool)
+    group_size = (group_keys // 2) % len(size_values)
+    group_facility = (group_keys // 2) // len(size_values)
+
+    return {
+        (str(facility_values[f]), str(size_values[s]), bool(c)): RateQuote(
+            rate=float(rate),
+            base_price=round(float(base), 2),
+            occupancy=float(occ),
+            total_units=int(total),
+            available_units=int(available_count)
+        )
+        for f, s, c, rate, base, occ, total, available_count in zip(
+            group_facility, group_size, group_climate, rates, base_prices, occupancy, totals, free
+        )
+    }
+
+
+class PriceBook:
+    """Holds the current price table and swaps in new versions atomically"""
+
+    def __init__(self):
+        self._table = PriceTable(version=0, generated_at=datetime.now(), rates={})
+        self._lock = Lock()
+
+    @property
+    def table(self) -> PriceTable:
+        """Current price table"""
+        return self._table
+
+    @property
+    def version(self) -> int:
+        return self._table.version
+
+    def publish(self, rates: Dict[RateKey, RateQuote]) -> PriceTable:
+        """
+        Publish a new set of rates as the next table version
+
+        Args:
+            rates: Rates from compute_rates
+
+        Returns:
+            The published table
+        """
+        from src.models.unit import Unit
+
+        cheapest: Dict[Tuple[str, str], float] = {}
+        for (facility_id, size, _), quote in rates.items():
+            cheapest[(facility_id, size)] = min(quote.rate, cheapest.get((facility_id, size), quote.rate))
+        by_facility: Dict[str, List[Tuple[str, float]]] = {}
+        for (facility_id, size), rate in cheapest.items():
+            by_facility.setdefault(facility_id, []).append((size, rate))
+        for sizes in by_facility.values():
+            sizes.sort(key=lambda item: Unit.square_feet_for(item[0]))
+
+        with self._lock:
+            table = PriceTable(
+                version=self._table.version + 1,
+                generated_at=datetime.now(),
+                rates=rates,
+                by_facility=by_facility,
+                cheapest=cheapest
+            )
+            self._table = table
+
+        logger.info(f"Published price table version {table.version} with {len(rates)} rates")
+        return table
+
+
+def reprice_from_database(
+    session,
+    price_book: "PriceBook",
+    policy: PricingPolicy = PricingPolicy(),
+    demand_window_days: int = 30
+) -> PriceTable:
+    """
+    Recompute and publish rates for every facility from the units table
+
+    Args:
+        session: SQLAlchemy session
+        price_book: Price book to publish into
+        policy: Pricing policy
+        demand_window_days: How far back reservations count as demand
+
+    Returns:
+        The published table
+    """
+    import numpy as np
+    from sqlalchemy import func
+
+    from src.models.reservation import Reservation
+    from src.models.unit import Unit
+
+    since = datetime.utcnow() - timedelta(days=demand_window_days)
+    recent = (
+        session.query(Reservation.unit_id, func.count().label('move_ins'))
+        .filter(Reservation.created_at >= since)
+        .group_by(Reservation.unit_id)
+        .subquery()
+    )
+    rows = (
+        session.query(
+            Unit.facility_id,
+            Unit.size,
+            Unit.climate_controlled,
+            Unit.price,
+            Unit.available,
+            func.coalesce(recent.c.move_ins, 0)
+        )
+        .outerjoin(recent, recent.c.unit_id == Unit.id)
+        .all()
+    )
+
+    if rows:
+        facility_ids, sizes, climate, prices, available, move_ins = zip(*rows)
+        rates = compute_rates(
+            np.array(facility_ids),
+            np.array(sizes, dtype=object),
+            np.array([bool(value) for value in climate]),
+            np.array(prices, dtype=np.float64),
+            np.array([bool(value) for value in available]),
+            np.array(move_ins, dtype=np.float64),
+            policy
+        )
+    else:
+        rates = {}
+    return price_book.publish(rates)
+
+
+@lru_cache()
+def get_price_book() -> PriceBook:
+    """Get the process-wide price book"""
+    return PriceBook()
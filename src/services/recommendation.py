@@ -0,0 +1,98 @@
+import heapq
+from bisect import bisect_left
+from itertools import count
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from src.models.unit import Unit
+
+if TYPE_CHECKING:
+    from src.services.storage_service import StorageUnit
+
+# (width, length) -> units of that shape, cheapest first
+Shapes = Dict[Tuple[int, int], List[Tuple[float, "StorageUnit"]]]
+
+
+class UnitRecommender:
+    """
+    Nearest-fit search over a fixed set of storage units
+
+    Units are grouped by square footage, and within an area by dimensions
+    with the cheapest first, so the closest candidates to a requested area
+    are found with one bisect over the distinct areas and an outward
+    two-pointer walk. Candidates are then ranked by area difference, how
+    well the dimensions match (in either orientation), and price.
+    """
+
+    def __init__(self, units: Sequence["StorageUnit"]):
+        """
+        Build the index
+
+        Args:
+            units: Units to recommend from, typically the available inventory
+        """
+        by_area: Dict[int, Shapes] = {}
+        for unit in units:
+            width, length = Unit.parse_size(unit.size)
+            shape = (width or 0, length or 0)
+            by_area.setdefault(unit.square_feet, {}).setdefault(shape, []).append((unit.price, unit))
+        for shapes in by_area.values():
+            for priced in shapes.values():
+                priced.sort(key=lambda entry: entry[0])
+
+        self._areas = sorted(by_area)
+        self._by_area = by_area
+        self._count = len(units)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def recommend(self, width: int, length: int, limit: int = 3) -> List["StorageUnit"]:
+        """
+        Find the units closest to the requested dimensions
+
+        Args:
+            width: Requested width in feet
+            length: Requested length in feet
+            limit: Maximum number of units to return
+
+        Returns:
+            Up to ``limit`` units, best fit first
+        """
+        if limit <= 0 or not self._areas:
+            return []
+
+        target = width * length
+        areas = self._areas
+        right = bisect_left(areas, target)
+        left = right - 1
+
+        # Walk outward over distinct areas until we have ``limit`` units, then
+        # finish any area tied with the worst one taken so dimension fit and
+        # price can break the tie. Only the ``limit`` cheapest units of each
+        # shape can make the cut, so ties cost O(limit) per shape, not O(n).
+        candidates = []
+        tiebreak = count()
+        cutoff = None
+        while left >= 0 or right < len(areas):
+            left_diff = target - areas[left] if left >= 0 else None
+            right_diff = areas[right] - target if right < len(areas) else None
+            if right_diff is None or (left_diff is not None and left_diff <= right_diff):
+                diff, area = left_diff, areas[left]
+                left -= 1
+            else:
+                diff, area = right_diff, areas[right]
+                right += 1
+
+            if cutoff is not None and diff > cutoff:
+                break
+            for (unit_width, unit_length), priced in self._by_area[area].items():
+                fit = min(
+                    abs(unit_width - width) + abs(unit_length - length),
+                    abs(unit_width - length) + abs(unit_length - width)
+                )
+                for price, unit in priced[:limit]:
+                    candidates.append(((diff, fit, price, next(tiebreak)), unit))
+            if cutoff is None and len(candidates) >= limit:
+                cutoff = diff
+
+        return [unit for _, unit in heapq.nsmallest(limit, candidates, key=lambda candidate: candidate[0])]
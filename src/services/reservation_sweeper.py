@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from src.models.reservation import ReservationStatus
+from src.services.availability import AvailabilityIndex
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# One statement per batch: claim the oldest expired PENDING reservations,
+# skipping rows another worker holds, cancel them, and free their units
+# unless a confirmed reservation still holds the unit. The claim walks
+# ix_reservations_status_created_at and locks at most :batch_size rows.
+# The cancellations are counted into today's occupancy rollups in the same
+# statement, since this bulk UPDATE bypasses the ORM rollup listener.
+EXPIRE_BATCH_SQL = text("""
+    WITH expired AS (
+        SELECT id
+        FROM reservations
+        WHERE status = :pending AND created_at < :cutoff
+        ORDER BY created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    cancelled AS (
+        UPDATE reservations AS r
+        SET status = :cancelled, updated_at = :now
+        FROM expired
+        WHERE r.id = expired.id
+        RETURNING r.id, r.unit_id, r.facility_id
+    ),
+    rolled_up AS (
+        INSERT INTO occupancy_daily_rollups AS rollup (
+            facility_id, size, day, new_reservations, move_ins, move_outs,
+            cancellations, mrr_delta, booked_revenue
+        )
+        SELECT cancelled.facility_id, u.size, CAST(:now AS DATE), 0, 0, 0, count(*), 0.0, 0.0
+        FROM cancelled JOIN units AS u ON u.id = cancelled.unit_id
+        GROUP BY cancelled.facility_id, u.size
+        ON CONFLICT (facility_id, size, day)
+        DO UPDATE SET cancellations = rollup.cancellations + excluded.cancellations
+    ),
+    released AS (
+        UPDATE units AS u
+        SET available = true
+        WHERE u.id IN (SELECT unit_id FROM cancelled)
+          AND u.available = false
+          AND NOT EXISTS (
+              SELECT 1 FROM reservations AS held
+              WHERE held.unit_id = u.id AND held.status = :confirmed
+          )
+        RETURNING u.id, u.facility_id, u.size, u.climate_controlled, u.price
+    )
+    SELECT
+        (SELECT count(*) FROM cancelled) AS cancelled_count,
+        released.facility_id,
+        released.size,
+        released.climate_controlled,
+        released.price
+    FROM (SELECT 1) AS one
+    LEFT JOIN released ON true
+""")
+
+
+@dataclass(frozen=True)
+class ReleasedUnit:
+    """A unit freed by cancelling an expired reservation"""
+    facility_id: str
+    size: str
+    climate_controlled: bool
+    price: float
+
+
+def expire_batch(session, cutoff: datetime, batch_size: int) -> tuple:
+    """
+    Cancel one batch of expired pending reservations and commit
+
+    Args:
+        session: SQLAlchemy session on PostgreSQL
+        cutoff: Reservations created before this are expired
+        batch_size: Maximum reservations claimed by this batch
+
+    Returns:
+        Tuple of (reservations cancelled, units released)
+    """
+    rows = session.execute(EXPIRE_BATCH_SQL, {
+        "pending": ReservationStatus.PENDING.name,
+        "cancelled": ReservationStatus.CANCELLED.name,
+        "confirmed": ReservationStatus.CONFIRMED.name,
+        "cutoff": cutoff,
+        "now": datetime.utcnow(),
+        "batch_size": batch_size,
+    }).all()
+    session.commit()
+
+    cancelled = rows[0].cancelled_count if rows else 0
+    released = [
+        ReleasedUnit(str(row.facility_id), row.size, bool(row.climate_controlled), row.price)
+        for row in rows if row.facility_id is not None
+    ]
+    return cancelled, released
+
+
+def expire_pending_reservations(
+    session,
+    hold_minutes: int,
+    batch_size: int = 500,
+    max_batches: int = 20,
+    availability: Optional[AvailabilityIndex] = None
+) -> int:
+    """
+    Cancel PENDING reservations older than the hold period, batch by batch
+
+    Each batch is its own short transaction so locks are held only for one
+    statement; concurrent sweepers skip each other's claimed rows.
+
+    Args:
+        session: SQLAlchemy session on PostgreSQL
+        hold_minutes: How long a pending reservation may hold a unit
+        batch_size: Reservations per batch
+        max_batches: Upper bound on batches per sweep
+        availability: Optional availability summary to update with released units
+
+    Returns:
+        Number of reservations cancelled
+    """
+    cutoff = datetime.utcnow() - timedelta(minutes=hold_minutes)
+    total = 0
+    released_units: List[ReleasedUnit] = []
+    for _ in range(max_batches):
+        cancelled, released = expire_batch(session, cutoff, batch_size)
+        total += cancelled
+        released_units.extend(released)
+        if cancelled < batch_size:
+            break
+
+    if availability is not None:
+        for unit in released_units:
+            availability.mark_available(unit.facility_id, unit.size, unit.climate_controlled, unit.price)
+
+    if total:
+        logger.info(f"Expired {total} pending reservations, released {len(released_units)} units")
+    return total
@@ -0,0 +1,367 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.rollup import OccupancyDailyRollup
+from src.models.unit import Unit
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROLLUP_COUNTERS = ("new_reservations", "move_ins", "move_outs", "cancellations", "mrr_delta", "booked_revenue")
+
+RollupKey = Tuple[int, str, date]
+
+# Rebuilds every rollup row from reservations; the incremental listener
+# produces the same totals. Used after bulk loads that bypass the ORM.
+REBUILD_ROLLUPS_SQL = """
+    DELETE FROM occupancy_daily_rollups;
+    INSERT INTO occupancy_daily_rollups (
+        facility_id, size, day, new_reservations, move_ins, move_outs,
+        cancellations, mrr_delta, booked_revenue
+    )
+    SELECT facility_id, size, day, SUM(new_reservations), SUM(move_ins), SUM(move_outs),
+           SUM(cancellations), SUM(mrr_delta), SUM(booked_revenue)
+    FROM (
+        SELECT r.facility_id, u.size, DATE(COALESCE(r.created_at, r.start_date)) AS day,
+               1 AS new_reservations, 0 AS move_ins, 0 AS move_outs, 0 AS cancellations,
+               0.0 AS mrr_delta, 0.0 AS booked_revenue
+        FROM reservations r JOIN units u ON u.id = r.unit_id
+        UNION ALL
+        SELECT r.facility_id, u.size, DATE(r.start_date), 0, 1, 0, 0, COALESCE(r.monthly_price, 0.0), COALESCE(r.total_price, 0.0)
+        FROM reservations r JOIN units u ON u.id = r.unit_id
+        WHERE r.status IN ('CONFIRMED', 'COMPLETED')
+        UNION ALL
+        SELECT r.facility_id, u.size, DATE(COALESCE(r.end_date, r.updated_at, r.start_date)), 0, 0, 1, 0, -COALESCE(r.monthly_price, 0.0), 0.0
+        FROM reservations r JOIN units u ON u.id = r.unit_id
+        WHERE r.status = 'COMPLETED'
+        UNION ALL
+        SELECT r.facility_id, u.size, DATE(COALESCE(r.updated_at, r.start_date)), 0, 0, 0, 1, 0.0, 0.0
+        FROM reservations r JOIN units u ON u.id = r.unit_id
+        WHERE r.status = 'CANCELLED'
+    ) AS events
+    GROUP BY facility_id, size, day
+"""
+
+
+def _day(value, default: date) -> date:
+    if value is None:
+        return default
+    return value.date() if isinstance(value, datetime) else value
+
+
+class ReservationState(NamedTuple):
+    """The reservation fields its rollup contribution is computed from"""
+    facility_id: Optional[int]
+    unit_id: Optional[int]
+    status: Optional[ReservationStatus]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    monthly_price: Optional[float]
+    total_price: Optional[float]
+
+    @classmethod
+    def current(cls, reservation: Reservation) -> "ReservationState":
+        """The reservation's values as they are now"""
+        return cls(*(getattr(reservation, name) for name in cls._fields))
+
+    @classmethod
+    def committed(cls, reservation: Reservation) -> "ReservationState":
+        """The reservation's values as last loaded or flushed, before pending changes"""
+        attrs = inspect(reservation).attrs
+        values = []
+        for name in cls._fields:
+            history = attrs[name].history
+            if history.deleted:
+                values.append(history.deleted[0])
+            elif history.added:
+                # Set from nothing; nothing was stored before
+                values.append(None)
+            else:
+                values.append(getattr(reservation, name))
+        return cls(*values)
+
+
+def reservation_contribution(state: Optional[ReservationState], today: date) -> List[Tuple[date, Dict[str, float]]]:
+    """
+    What a reservation in a given state adds to the rollups
+
+    A change contributes the difference between its new and old state, so
+    cancelling a confirmed rental takes back its move-in and moving its
+    start date moves the move-in. Events are dated exactly as in
+    REBUILD_ROLLUPS_SQL; cancellations fall on updated_at, the day the
+    row was last written.
+
+    Args:
+        state: Reservation fields, or None for a reservation that does not exist
+        today: Day used for events without a date of their own
+
+    Returns:
+        List of (day, counter deltas)
+    """
+    if state is None:
+        return []
+    events = [(_day(state.created_at or state.start_date, today), {"new_reservations": 1})]
+    if state.status in (ReservationStatus.CONFIRMED, ReservationStatus.COMPLETED):
+        monthly = state.monthly_price or 0.0
+        events.append((_day(state.start_date, today), {
+            "move_ins": 1,
+            "mrr_delta": monthly,
+            "booked_revenue": state.total_price or 0.0,
+        }))
+        if state.status == ReservationStatus.COMPLETED:
+            moved_out = state.end_date or state.updated_at or state.start_date
+            events.append((_day(moved_out, today), {"move_outs": 1, "mrr_delta": -monthly}))
+    elif state.status == ReservationStatus.CANCELLED:
+        events.append((_day(state.updated_at or state.start_date, today), {"cancellations": 1}))
+    return events
+
+
+def collect_deltas(
+    changes: Iterable[Tuple[Optional[ReservationState], Optional[ReservationState]]],
+    unit_sizes: Dict[int, str],
+    today: date
+) -> Dict[RollupKey, Dict[str, float]]:
+    """
+    Net rollup deltas for a set of reservation changes
+
+    Args:
+        changes: (old state, new state); None means inserted or deleted
+        unit_sizes: Size of each reservation's unit by unit primary key
+        today: Day used for events without a date of their own
+
+    Returns:
+        Counter deltas keyed by (facility_id, size, day), without all-zero rows
+    """
+    deltas: Dict[RollupKey, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+    for old, new in changes:
+        for sign, state in ((1, new), (-1, old)):
+            if state is None or (size := unit_sizes.get(state.unit_id)) is None:
+                continue
+            for day, counters in reservation_contribution(state, today):
+                row = deltas[(state.facility_id, size, day)]
+                for name, value in counters.items():
+                    row[name] += sign * value
+    return {key: row for key, row in deltas.items() if any(row.values())}
+
+
+def upsert_rollups(connection, deltas: Dict[RollupKey, Dict[str, float]]) -> None:
+    """
+    Add deltas to the rollup rows in one INSERT ... ON CONFLICT DO UPDATE
+
+    Args:
+        connection: SQLAlchemy connection on PostgreSQL or SQLite
+        deltas: Counter deltas keyed by (facility_id, size, day)
+    """
+    if not deltas:
+        return
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = OccupancyDailyRollup.__table__
+    statement = insert(table).values([
+        {"facility_id": facility_id, "size": size, "day": day, **counters}
+        for (facility_id, size, day), counters in deltas.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.facility_id, table.c.size, table.c.day],
+        set_={name: table.c[name] + statement.excluded[name] for name in ROLLUP_COUNTERS}
+    )
+    connection.execute(statement)
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Old values are captured here; after the flush the attribute history is
+    # reset and updated_at has been restamped by the UPDATE
+    session.info['rollup_old_states'] = {
+        reservation: ReservationState.committed(reservation)
+        for reservation in (*session.dirty, *session.deleted)
+        if isinstance(reservation, Reservation)
+    }
+
+
+def _reservation_changes(session: Session) -> list:
+    old_states = session.info.pop('rollup_old_states', {})
+    changes = []
+    for reservation in session.new:
+        if isinstance(reservation, Reservation):
+            changes.append((None, ReservationState.current(reservation)))
+    for reservation in session.dirty:
+        if isinstance(reservation, Reservation) and reservation in old_states:
+            old, new = old_states[reservation], ReservationState.current(reservation)
+            if old != new:
+                changes.append((old, new))
+    for reservation in session.deleted:
+        if isinstance(reservation, Reservation) and reservation in old_states:
+            changes.append((old_states[reservation], None))
+    return changes
+
+
+def _on_flush(session: Session, flush_context) -> None:
+    changes = _reservation_changes(session)
+    if not changes:
+        return
+    connection = session.connection()
+    unit_sizes = {}
+    for reservation in (*session.new, *session.dirty):
+        unit = reservation.__dict__.get('unit') if isinstance(reservation, Reservation) else None
+        if unit is not None and unit.size and unit.id == reservation.unit_id:
+            unit_sizes[unit.id] = unit.size
+    # Old states may point at a unit the reservation has since moved away from
+    missing = {state.unit_id for change in changes for state in change if state is not None} - unit_sizes.keys()
+    if missing:
+        unit_sizes.update(connection.execute(select(Unit.id, Unit.size).where(Unit.id.in_(missing))).all())
+    # Written inside the flush's transaction, so the rollups commit or roll
+    # back together with the reservation change
+    upsert_rollups(connection, collect_deltas(changes, unit_sizes, datetime.utcnow().date()))
+
+
+_listening = False
+
+
+def attach_rollup_listeners() -> None:
+    """Maintain the rollups from reservation changes flushed through the ORM"""
+    global _listening
+    if not _listening:
+        for name in ReservationState._fields:
+            # active_history loads the old value when a new one is set, so the
+            # flush sees the change even if the field had expired after a commit
+            event.listen(
+                getattr(Reservation, name), 'set',
+                lambda target, value, oldvalue, initiator: None, active_history=True
+            )
+        event.listen(Session, 'before_flush', _before_flush)
+        event.listen(Session, 'after_flush', _on_flush)
+        _listening = True
+
+
+def rebuild_rollups(session: Session) -> None:
+    """Recompute every rollup row from the reservations table"""
+    for statement in REBUILD_ROLLUPS_SQL.split(";"):
+        session.execute(text(statement))
+    session.commit()
+
+
+def _range_filters(facility_id: int, size: Optional[str]) -> list:
+    filters = [OccupancyDailyRollup.facility_id == facility_id]
+    if size:
+        filters.append(OccupancyDailyRollup.size == size)
+    return filters
+
+
+def occupancy_series(
+    session: Session,
+    facility_id: int,
+    start: date,
+    end: date,
+    size: Optional[str] = None
+) -> Dict:
+    """
+    Daily occupancy and revenue for one facility, read from the rollups
+
+    Args:
+        session: SQLAlchemy session
+        facility_id: Facility primary key
+        start: First day, inclusive
+        end: Last day, inclusive
+        size: Optional unit size filter (e.g., "10x10")
+
+    Returns:
+        Dict with the facility's unit count and one entry per day
+    """
+    R = OccupancyDailyRollup
+    filters = _range_filters(facility_id, size)
+    occupied, mrr = session.query(
+        func.coalesce(func.sum(R.move_ins - R.move_outs), 0),
+        func.coalesce(func.sum(R.mrr_delta), 0.0)
+    ).filter(*filters, R.day < start).one()
+    rows = {
+        row.day: row for row in session.query(
+            R.day,
+            func.sum(R.new_reservations).label('new_reservations'),
+            func.sum(R.move_ins).label('move_ins'),
+            func.sum(R.move_outs).label('move_outs'),
+            func.sum(R.cancellations).label('cancellations'),
+            func.sum(R.mrr_delta).label('mrr_delta'),
+            func.sum(R.booked_revenue).label('booked_revenue')
+        ).filter(*filters, R.day >= start, R.day <= end).group_by(R.day)
+    }
+    units = session.query(func.count(Unit.id)).filter(Unit.facility_id == facility_id)
+    if size:
+        units = units.filter(Unit.size == size)
+    total_units = units.scalar() or 0
+
+    days = []
+    day = start
+    while day <= end:
+        row = rows.get(day)
+        if row is not None:
+            occupied += row.move_ins - row.move_outs
+            mrr += row.mrr_delta
+        days.append({
+            "day": day.isoformat(),
+            "occupied_units": occupied,
+            "occupancy_rate": round(occupied / total_units, 4) if total_units else None,
+            "monthly_recurring_revenue": round(mrr, 2),
+            "move_ins": row.move_ins if row else 0,
+            "move_outs": row.move_outs if row else 0,
+            "new_reservations": row.new_reservations if row else 0,
+            "cancellations": row.cancellations if row else 0,
+            "booked_revenue": round(row.booked_revenue, 2) if row else 0.0,
+        })
+        day += timedelta(days=1)
+    return {"facility_id": facility_id, "size": size, "total_units": total_units, "days": days}
+
+
+def revenue_summary(session: Session, facility_id: int, start: date, end: date) -> Dict:
+    """
+    Revenue and activity per unit size over a period, read from the rollups
+
+    Args:
+        session: SQLAlchemy session
+        facility_id: Facility primary key
+        start: First day, inclusive
+        end: Last day, inclusive
+
+    Returns:
+        Dict with per-size rows and facility totals
+    """
+    R = OccupancyDailyRollup
+    in_period = R.day >= start
+
+    def period_sum(column):
+        return func.coalesce(func.sum(case((in_period, column), else_=0)), 0)
+
+    rows = session.query(
+        R.size,
+        func.coalesce(func.sum(R.mrr_delta), 0.0).label('mrr'),
+        period_sum(R.booked_revenue).label('booked_revenue'),
+        period_sum(R.move_ins).label('move_ins'),
+        period_sum(R.move_outs).label('move_outs'),
+        period_sum(R.cancellations).label('cancellations'),
+    ).filter(R.facility_id == facility_id, R.day <= end).group_by(R.size).order_by(R.size).all()
+
+    sizes = [
+        {
+            "size": row.size,
+            "monthly_recurring_revenue": round(row.mrr, 2),
+            "booked_revenue": round(row.booked_revenue, 2),
+            "move_ins": row.move_ins,
+            "move_outs": row.move_outs,
+            "cancellations": row.cancellations,
+        }
+        for row in rows
+    ]
+    totals = {
+        name: round(sum(item[name] for item in sizes), 2)
+        for name in ("monthly_recurring_revenue", "booked_revenue", "move_ins", "move_outs", "cancellations")
+    }
+    return {"facility_id": facility_id, "start": start.isoformat(), "end": end.isoformat(), "sizes": sizes, "totals": totals}
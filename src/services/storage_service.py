@@ -1,10 +1,16 @@
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime
 import logging
+import secrets
 from dataclasses import dataclass
 
+from src.models.routing import ReadYourWrites
+from src.services.recommendation import UnitRecommender
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from src.models.routing import RoutingSessionManager
+
 logger = get_logger(__name__)
 
 @dataclass
@@ -19,6 +25,20 @@ class StorageUnit:
     available: bool
     features: List[str]
 
+    @classmethod
+    def from_model(cls, unit) -> "StorageUnit":
+        """Build a storage unit from a Unit model instance"""
+        return cls(
+            unit_id=unit.unit_id,
+            size=unit.size,
+            square_feet=unit.square_feet,
+            price=unit.price,
+            floor=unit.floor,
+            climate_controlled=bool(unit.climate_controlled),
+            available=bool(unit.available),
+            features=list(unit.features or [])
+        )
+
 @dataclass
 class Reservation:
     """Represents a unit reservation"""
@@ -33,20 +53,25 @@ class Reservation:
 class StorageService:
     """Interface for storage facility management system"""
     
-    def __init__(self, facility_id: str, api_key: str):
+    def __init__(self, facility_id: str, api_key: str, db: Optional["RoutingSessionManager"] = None):
         """
         Initialize storage service
         
         Args:
             facility_id: ID of the storage facility
             api_key: API key for facility management system
+            db: Optional session manager; the facility's units are read from
+                the units table through it instead of the development data
         """
         self.facility_id = facility_id
         self.api_key = api_key
+        self.db = db
+        # This facility's bookings, so reads right after one come from the primary
+        self.writes = ReadYourWrites()
         logger.info(f"Initialized storage service for facility {facility_id}")
         
-        # TODO: Replace with actual API integration
-        # This is temporary mock data for development
+        # Development data for facilities without a database, such as the
+        # default facility
         self._mock_units = {
             "A101": StorageUnit(
                 unit_id="A101",
@@ -79,6 +104,7 @@ class StorageService:
                 features=["Climate Control", "Indoor Access", "Large Door"]
             )
         }
+        self._recommender: Optional[UnitRecommender] = None
 
     def get_available_units(self, size: Optional[str] = None) -> List[StorageUnit]:
         """
@@ -91,11 +117,19 @@ class StorageService:
             List of available StorageUnit objects
         """
         try:
-            # TODO: Replace with actual API call
-            units = [
-                unit for unit in self._mock_units.values()
-                if unit.available and (not size or unit.size == size)
-            ]
+            if self.db is not None:
+                from src.models.unit import Unit
+
+                with self.db.reader(after=self.writes) as session:
+                    query = self._units_query(session).filter(Unit.available.is_(True))
+                    if size:
+                        query = query.filter(Unit.size == size)
+                    units = [StorageUnit.from_model(unit) for unit in query]
+            else:
+                units = [
+                    unit for unit in self._mock_units.values()
+                    if unit.available and (not size or unit.size == size)
+                ]
             
             logger.info(f"Found {len(units)} available units" + 
                        (f" of size {size}" if size else ""))
@@ -105,6 +139,68 @@ class StorageService:
             logger.error(f"Error getting available units: {e}")
             return []
 
+    def get_all_units(self) -> List[StorageUnit]:
+        """
+        Get every unit at the facility, available or not
+        
+        Returns:
+            List of StorageUnit objects
+        """
+        try:
+            if self.db is not None:
+                with self.db.reader(after=self.writes) as session:
+                    return [StorageUnit.from_model(unit) for unit in self._units_query(session)]
+            return list(self._mock_units.values())
+            
+        except Exception as e:
+            logger.error(f"Error getting units: {e}")
+            return []
+
+    def recommend_units(self, width: int, length: int, limit: int = 3) -> List[StorageUnit]:
+        """
+        Recommend the available units that best fit the requested dimensions
+        
+        Args:
+            width: Requested width in feet
+            length: Requested length in feet
+            limit: Maximum number of units to return
+            
+        Returns:
+            Closest available units by square footage and dimension fit,
+            cheapest first among equal fits
+        """
+        try:
+            if self._recommender is None:
+                self._recommender = UnitRecommender(self.get_available_units())
+            
+            units = self._recommender.recommend(width, length, limit)
+            logger.info(f"Recommended {len(units)} units for {width}x{length}")
+            return units
+            
+        except Exception as e:
+            logger.error(f"Error recommending units: {e}")
+            return []
+
+    def _units_query(self, session):
+        """Query over the facility's units"""
+        from src.models.unit import Unit
+
+        return session.query(Unit).filter(Unit.facility_id == int(self.facility_id))
+
+    def _find_unit(self, unit_id: str) -> Optional[StorageUnit]:
+        """Look up one of the facility's units by its unit ID"""
+        if self.db is None:
+            return self._mock_units.get(unit_id)
+        from src.models.unit import Unit
+
+        with self.db.reader(after=self.writes) as session:
+            unit = self._units_query(session).filter(Unit.unit_id == unit_id).one_or_none()
+            return StorageUnit.from_model(unit) if unit is not None else None
+
+    def invalidate_inventory(self):
+        """Drop derived inventory indexes after availability or prices change"""
+        self._recommender = None
+
     def get_unit_price(self, unit_id: str) -> Optional[float]:
         """
         Get current price for a specific unit
@@ -116,8 +212,7 @@ class StorageService:
             Current price or None if unit not found
         """
         try:
-            # TODO: Replace with actual API call
-            if unit := self._mock_units.get(unit_id):
+            if unit := self._find_unit(unit_id):
                 logger.info(f"Retrieved price for unit {unit_id}: ${unit.price}")
                 return unit.price
             return None
@@ -146,7 +241,9 @@ class StorageService:
             New Reservation object or None if creation failed
         """
         try:
-            # TODO: Replace with actual API call
+            if self.db is not None:
+                return self._book(unit_id, customer_phone, start_date, duration_months)
+            
             if unit := self._mock_units.get(unit_id):
                 if not unit.available:
                     logger.warning(f"Unit {unit_id} is not available")
@@ -173,6 +270,65 @@ class StorageService:
             logger.error(f"Error creating reservation: {e}")
             return None
 
+    def _book(
+        self,
+        unit_id: str,
+        customer_phone: str,
+        start_date: datetime,
+        duration_months: int
+    ) -> Optional[Reservation]:
+        """
+        Hold a unit with a PENDING reservation row
+
+        The unit is marked unavailable in the same transaction, so the
+        availability summary drops it on commit; the reservation sweeper
+        releases it again if the hold expires unconfirmed.
+        """
+        from src.models.reservation import Reservation as ReservationRecord, ReservationStatus
+        from src.models.unit import Unit
+
+        with self.db.writer(self.writes) as session:
+            unit = (
+                self._units_query(session)
+                .filter(Unit.unit_id == unit_id)
+                .with_for_update()
+                .one_or_none()
+            )
+            if unit is None:
+                logger.warning(f"Unit {unit_id} not found")
+                return None
+            if not unit.available:
+                logger.warning(f"Unit {unit_id} is not available")
+                return None
+            
+            record = ReservationRecord(
+                reservation_id=f"R{datetime.now():%Y%m%d%H%M%S}{secrets.randbelow(10000):04d}",
+                customer_phone=customer_phone,
+                start_date=start_date,
+                duration_months=duration_months,
+                monthly_price=unit.price,
+                total_price=unit.price * duration_months,
+                status=ReservationStatus.PENDING,
+                unit=unit,
+                facility_id=unit.facility_id
+            )
+            unit.available = False
+            session.add(record)
+            session.flush()
+            reservation = Reservation(
+                reservation_id=record.reservation_id,
+                unit_id=unit.unit_id,
+                customer_phone=customer_phone,
+                start_date=start_date,
+                duration_months=duration_months,
+                status=record.status.value,
+                total_price=record.total_price
+            )
+        
+        self.invalidate_inventory()
+        logger.info(f"Created reservation {reservation.reservation_id} for unit {unit_id}")
+        return reservation
+
     def get_unit_features(self, unit_id: str) -> List[str]:
         """
         Get features of a specific unit
@@ -184,8 +340,7 @@ class StorageService:
             List of feature strings
         """
         try:
-            # TODO: Replace with actual API call
-            if unit := self._mock_units.get(unit_id):
+            if unit := self._find_unit(unit_id):
                 logger.info(f"Retrieved features for unit {unit_id}")
                 return unit.features
             return []
@@ -205,8 +360,7 @@ class StorageService:
             True if unit is available, False otherwise
         """
         try:
-            # TODO: Replace with actual API call
-            if unit := self._mock_units.get(unit_id):
+            if unit := self._find_unit(unit_id):
                 logger.info(f"Checked availability for unit {unit_id}: {unit.available}")
                 return unit.available
             return False
@@ -0,0 +1,194 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TranscriptSink = Callable[[List["TranscriptTurn"]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptTurn:
+    """One caller utterance, how it was understood, and what the agent said"""
+    call_sid: str
+    facility_id: str
+    turn: int
+    utterance: str
+    intent: str
+    entities: Dict[str, str]
+    response: str
+    extract_ms: float
+    intent_ms: float
+    respond_ms: float
+    render_ms: float
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class TranscriptWriter:
+    """
+    Buffers conversation turns in memory and writes them in batches
+
+    ``record`` only appends to a bounded queue, so the voice path never
+    waits on the database. A background task drains the queue and hands
+    batches to a blocking sink in a worker thread once ``batch_size`` turns
+    are waiting or ``flush_interval`` seconds have passed. When the queue
+    is full the newest turn is dropped and counted rather than blocking.
+    """
+
+    def __init__(self, max_pending: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        """
+        Initialize a stopped writer
+
+        Args:
+            max_pending: Turns buffered before new ones are dropped
+            batch_size: Maximum turns per write
+            flush_interval: Seconds a turn may wait before a partial batch is written
+        """
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sink: Optional[TranscriptSink] = None
+        self._batch: List[TranscriptTurn] = []
+        self._inflight: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring how far behind the writer is"""
+        return {
+            "pending": self.pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def start(self, sink: TranscriptSink) -> None:
+        """
+        Start flushing to ``sink`` from the running event loop
+
+        Args:
+            sink: Blocking callable that persists a batch of turns
+        """
+        if self._task is not None:
+            return
+        self._sink = sink
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write whatever is still buffered, then stop"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._inflight is not None:
+            await self._inflight
+        
+        remaining, self._batch = self._batch, []
+        while remaining or not self._queue.empty():
+            remaining.extend(self._take(self.batch_size - len(remaining)))
+            await self._flush(remaining)
+            remaining = []
+        logger.info(f"Transcript writer stopped: {self.stats()}")
+
+    def record(self, turn: TranscriptTurn) -> None:
+        """
+        Buffer a turn without blocking; must be called on the event loop thread
+
+        Turns recorded while the writer is stopped are ignored.
+        """
+        if self._task is None:
+            return
+        try:
+            self._queue.put_nowait(turn)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Transcript buffer full, {self.dropped} turns dropped so far")
+
+    def _take(self, limit: int) -> List[TranscriptTurn]:
+        taken = []
+        while len(taken) < limit and not self._queue.empty():
+            taken.append(self._queue.get_nowait())
+        return taken
+
+    async def _collect(self) -> None:
+        """Fill ``self._batch`` until it is full or the flush interval passes"""
+        loop = asyncio.get_running_loop()
+        self._batch.append(await self._queue.get())
+        deadline = loop.time() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            self._batch.extend(self._take(self.batch_size - len(self._batch)))
+            remaining = deadline - loop.time()
+            if len(self._batch) >= self.batch_size or remaining <= 0:
+                return
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            await self._collect()
+            batch, self._batch = self._batch, []
+            # Shielded so stopping waits for an in-progress write instead of losing it
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _flush(self, batch: List[TranscriptTurn]) -> None:
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._sink, batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Error writing {len(batch)} transcript turns: {e}")
+
+
+def write_transcripts(session, batch: List[TranscriptTurn]) -> None:
+    """
+    Insert a batch of turns with one multi-row INSERT; the caller commits
+
+    Args:
+        session: SQLAlchemy session, e.g. from RoutingSessionManager.writer
+        batch: Turns to insert
+    """
+    from sqlalchemy import insert
+
+    from src.models.transcript import CallTranscript
+
+    session.execute(insert(CallTranscript), [asdict(turn) for turn in batch])
+
+
+@lru_cache()
+def get_transcript_writer() -> TranscriptWriter:
+    """Get the process-wide transcript writer"""
+    from src.core.config import get_settings
+
+    settings = get_settings()
+    return TranscriptWriter(
+        max_pending=settings.TRANSCRIPT_MAX_PENDING,
+        batch_size=settings.TRANSCRIPT_BATCH_SIZE,
+        flush_interval=settings.TRANSCRIPT_FLUSH_SECONDS
+    )
@@ -1,16 +1,53 @@
+from datetime import datetime
 from typing import Dict, Optional
+from urllib.parse import quote_plus
 import logging
-from twilio.twiml.voice_response import VoiceResponse, Gather
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+import math
+import re
+import time
 
 from src.core.entities import EntityExtractor
 from src.core.conversation import ConversationEngine, Intent, Entity
-from src.services.storage_service import StorageService
+from src.core.intent_classifier import IntentClassifier, resolve_intent
+from src.core.response_cache import ResponseCache
+from src.services.availability import AvailabilityIndex
+from src.services.facility_locator import FacilityLocator
+from src.services.facility_registry import FacilityRecord
+from src.services.messaging import OutboundMessenger
+from src.services.pricing import PriceBook
+from src.services.storage_service import Reservation, StorageService
+from src.services.transcripts import TranscriptTurn, TranscriptWriter
+from src.services.twiml import error_response, gather_response, incoming_call_response
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Caller asking for the offered text after a location answer
+TEXT_REQUEST = re.compile(r'\b(text|texted|send|sms|message)\b', re.IGNORECASE)
+
+# Caller accepting "Would you like to reserve one?" after an availability answer
+RESERVE_REQUEST = re.compile(r'\b(yes|yeah|yep|reserve|book)\b', re.IGNORECASE)
+
+# Keypad options offered in the greeting
+DTMF_INTENTS = {1: Intent.AVAILABILITY, 2: Intent.PRICING, 3: Intent.INFORMATION}
+
+def dtmf_intent(speech_result: str) -> Optional[Intent]:
+    """Intent for keypad input relayed as "Option <digit>", or None for speech"""
+    if not speech_result.startswith("Option "):
+        return None
+    try:
+        return DTMF_INTENTS.get(int(speech_result.split(" ")[1]), Intent.UNKNOWN)
+    except (ValueError, IndexError):
+        return Intent.UNKNOWN
+
+def directions_message(facility: FacilityRecord) -> str:
+    """Build the SMS body with a facility's address and a maps link"""
+    address = f"{facility.address}, {facility.city}, {facility.state} {facility.zip_code}"
+    return (
+        f"{facility.name}: {address}. "
+        f"Directions: https://maps.google.com/?q={quote_plus(address)}"
+    )
+
 class TwilioService:
     """Handle Twilio voice interactions and call processing"""
     
@@ -20,7 +57,17 @@ class TwilioService:
         auth_token: str,
         phone_number: str,
         facility_id: str = "default",
-        facility_api_key: str = "default"
+        facility_api_key: str = "default",
+        facility: Optional[FacilityRecord] = None,
+        storage_service: Optional[StorageService] = None,
+        locator: Optional[FacilityLocator] = None,
+        price_book: Optional[PriceBook] = None,
+        availability: Optional[AvailabilityIndex] = None,
+        response_cache: Optional[ResponseCache] = None,
+        transcripts: Optional[TranscriptWriter] = None,
+        messenger: Optional[OutboundMessenger] = None,
+        intent_classifier: Optional[IntentClassifier] = None,
+        intent_threshold: float = 0.5
     ):
         """
         Initialize Twilio service with credentials
@@ -31,17 +78,72 @@ class TwilioService:
             phone_number: Twilio phone number to use for calls
             facility_id: ID of the storage facility
             facility_api_key: API key for facility management system
+            facility: Optional facility snapshot this service answers for
+            storage_service: Optional shared storage service for the facility
+            locator: Optional nearest-facility index shared across facilities
+            price_book: Optional published rates shared across facilities
+            availability: Optional availability summary shared across facilities
+            response_cache: Optional response cache shared across facilities
+            transcripts: Optional writer that persists each conversation turn
+            messenger: Optional outbound SMS queue for directions and confirmations
+            intent_classifier: Optional classifier; intents come from entities alone without it
+            intent_threshold: Minimum classifier confidence before falling back to entities
         """
-        self.client = Client(account_sid, auth_token)
+        self.messenger = messenger
         self.phone_number = phone_number
         self.auth_token = auth_token
         self.entity_extractor = EntityExtractor()
-        self.storage_service = StorageService(facility_id, facility_api_key)
-        self.conversation_engine = ConversationEngine()
+        self.storage_service = storage_service or StorageService(facility_id, facility_api_key)
+        self.facility = facility
+        self.transcripts = transcripts
+        self.intent_classifier = intent_classifier
+        self.intent_threshold = intent_threshold
+        self.conversation_engine = ConversationEngine(
+            schedule=facility.schedule if facility else None,
+            facility=facility,
+            locator=locator,
+            facility_id=self.storage_service.facility_id,
+            price_book=price_book,
+            availability=availability,
+            response_cache=response_cache,
+            storage_service=self.storage_service
+        )
+        self._seed_availability()
         self.Intent = Intent  # Make Intent enum available for use
+        self.registry_version = 0  # Facility registry version last synced from
         
         logger.info("Initialized Twilio service with conversation engine")
 
+    def update_facility(
+        self,
+        facility: Optional[FacilityRecord],
+        storage_service: StorageService,
+        locator: Optional[FacilityLocator] = None
+    ):
+        """
+        Swap in reloaded facility data without dropping active conversations
+        
+        Args:
+            facility: Updated facility snapshot
+            storage_service: Storage service for the facility
+            locator: Updated nearest-facility index
+        """
+        self.facility = facility
+        self.storage_service = storage_service
+        self.conversation_engine.facility = facility
+        self.conversation_engine.schedule = facility.schedule if facility else None
+        self.conversation_engine.locator = locator
+        self.conversation_engine.facility_id = storage_service.facility_id
+        self.conversation_engine.storage_service = storage_service
+        self.conversation_engine.data_version += 1
+        self._seed_availability()
+
+    def _seed_availability(self):
+        """Load the facility into the availability summary if nothing has yet"""
+        availability = self.conversation_engine.availability
+        if availability is not None and self.storage_service.facility_id not in availability:
+            availability.load(self.storage_service.facility_id, self.storage_service.get_all_units())
+
     def handle_incoming_call(self) -> str:
         """
         Handle initial incoming call and gather user input
@@ -49,109 +151,177 @@ class TwilioService:
         Returns:
             TwiML response as string
         """
-        response = VoiceResponse()
-        
-        # Gather speech input
-        gather = Gather(
-            input='speech dtmf',
-            action='https://happy-waves-lie.loca.lt/voice/process',
-            language='en-US',
-            enhanced='true',
-            speech_timeout='auto',
-            timeout=3
-        )
-        
-        # Initial greeting with DTMF instructions
-        gather.say(
-            'Welcome to Storage Agent. How can I help you find the perfect storage unit today? ' +
-            'You can speak your request, or press 1 for unit availability, 2 for pricing, or 3 for general information.',
-            voice='Polly.Amy'
-        )
-        gather.pause(length=1)  # Add a 1-second pause after instructions
-        
-        response.append(gather)
-        
-        # If no input received
-        response.say(
-            'I didn\'t catch that. Please call back when you\'re ready.',
-            voice='Polly.Amy'
-        )
+        response = incoming_call_response()
         
         logger.info("Generated initial call response")
-        return str(response)
+        return response
 
-    def process_speech(self, speech_result: str, call_sid: str = None) -> str:
+    def process_speech(self, speech_result: str, call_sid: str = None, caller: Optional[str] = None) -> str:
         """
         Process speech input and generate appropriate response
         
         Args:
             speech_result: Transcribed speech from Twilio
             call_sid: Unique identifier for the call session
+            caller: Caller's number, used to text directions on request
             
         Returns:
             TwiML response as string
         """
         logger.info(f"Processing speech input: {speech_result}")
+        started = time.perf_counter()
         
         # Get or create conversation context
         context = self.conversation_engine.get_or_create_context(call_sid or "default")
+        # A reservation offer can only be accepted on the turn right after it
+        offered_size, context.offered_size = context.offered_size, None
         
         # Extract entities from speech
         entities = self.entity_extractor.extract_all(speech_result)
         logger.debug(f"Extracted entities: {entities}")
+        extracted = time.perf_counter()
         
         # Determine intent based on input
-        intent = self.Intent.UNKNOWN
-        
-        # Check if this is a DTMF input (starts with "Option")
-        if speech_result.startswith("Option "):
-            try:
-                dtmf = int(speech_result.split(" ")[1])
-                if dtmf == 1:
-                    intent = self.Intent.AVAILABILITY
-                elif dtmf == 2:
-                    intent = self.Intent.PRICING
-                elif dtmf == 3:
-                    intent = self.Intent.INFORMATION
-            except (ValueError, IndexError):
-                pass
+        if (keyed := dtmf_intent(speech_result)) is not None:
+            intent, confidence = keyed, 1.0
         else:
             # Process speech input
-            if 'unit_size' in entities:
-                intent = self.Intent.AVAILABILITY
-            elif 'duration' in entities:
-                intent = self.Intent.PRICING
+            intent, confidence = resolve_intent(
+                speech_result, entities, self.intent_classifier, self.intent_threshold
+            )
+        classified = time.perf_counter()
             
-        # Get response from conversation engine
-        response_text = self.conversation_engine.process_intent(
-            context.session_id,
-            intent,
-            confidence=1.0,
-            entities=[Entity(type='unit_size', value=entities['unit_size'].value, confidence=1.0)] if 'unit_size' in entities else []
-        )
-        
-        response = VoiceResponse()
-        gather = Gather(
-            input='speech dtmf',
-            action='https://happy-waves-lie.loca.lt/voice/process',
-            language='en-US',
-            enhanced='true',
-            speech_timeout='auto',
-            timeout=3
-        )
+        if (
+            intent in (self.Intent.UNKNOWN, self.Intent.GENERAL, self.Intent.LOCATION)
+            and 'zip_code' not in entities
+            and context.current_intent == self.Intent.LOCATION
+            and caller
+            and TEXT_REQUEST.search(speech_result)
+        ):
+            # Follow-up to "would you prefer me to text them to you?"
+            context.update_intent(self.Intent.LOCATION)
+            response_text = self._text_directions(caller)
+        elif (
+            intent in (self.Intent.UNKNOWN, self.Intent.GENERAL, self.Intent.AVAILABILITY)
+            and offered_size is not None
+            and self.storage_service.db is not None
+            and caller
+            and RESERVE_REQUEST.search(speech_result)
+        ):
+            # Follow-up to "Would you like to reserve one?"
+            context.update_intent(self.Intent.AVAILABILITY)
+            response_text = self._reserve_unit(caller, offered_size, entities.get('duration'))
+        else:
+            # Get response from conversation engine
+            response_text = self.conversation_engine.process_intent(
+                context.session_id,
+                intent,
+                confidence=confidence,
+                entities=[
+                    Entity(type=entity_type, value=entities[entity_type].value, confidence=1.0)
+                    for entity_type in ('unit_size', 'zip_code')
+                    if entity_type in entities
+                ]
+            )
+        responded = time.perf_counter()
         
         # Use conversation engine's response
-        gather.say(response_text, voice='Polly.Amy')
+        twiml = gather_response(response_text)
         
-        response.append(gather)
+        if self.transcripts is not None:
+            self.transcripts.record(TranscriptTurn(
+                call_sid=context.session_id,
+                facility_id=self.storage_service.facility_id,
+                turn=context.turn_count,
+                utterance=speech_result,
+                intent=intent.value,
+                entities={entity_type: entity.value for entity_type, entity in entities.items()},
+                response=response_text,
+                extract_ms=(extracted - started) * 1000,
+                intent_ms=(classified - extracted) * 1000,
+                respond_ms=(responded - classified) * 1000,
+                render_ms=(time.perf_counter() - responded) * 1000
+            ))
+        
+        return twiml
+
+    def _text_directions(self, caller: str) -> str:
+        """Queue directions to the caller and say whether it worked"""
+        if self.facility is None:
+            # No address on file to text, so read out the general directions
+            return (
+                "I don't have a map link I can text for this location, but we're at "
+                "123 Storage Lane. Is there anything else I can help you with?"
+            )
+        if self.messenger is not None and self.messenger.enqueue(
+            caller, directions_message(self.facility),
+            kind="directions", from_number=self.facility.twilio_number
+        ):
+            return "I've texted the directions to you. Is there anything else I can help you with?"
+        return (
+            "I'm sorry, I can't send a text right now. "
+            "Would you like me to read the directions instead?"
+        )
+
+    def _reserve_unit(self, caller: str, size: str, duration=None) -> str:
+        """Hold the cheapest available unit of the offered size and text the confirmation"""
+        months = 1
+        if duration is not None:
+            if duration.unit == 'year':
+                months = duration.amount * 12
+            elif duration.unit == 'month':
+                months = duration.amount
+            else:
+                months = math.ceil(duration.amount / 4)
+        
+        units = self.storage_service.get_available_units(size)
+        if not units:
+            return (
+                f"I'm sorry, we don't have a {size} unit I can reserve right now. "
+                "Would you like to hear about other sizes?"
+            )
+        unit = min(units, key=lambda unit: unit.price)
+        reservation = self.storage_service.create_reservation(unit.unit_id, caller, datetime.now(), max(months, 1))
+        if reservation is None:
+            return (
+                "I'm sorry, I wasn't able to reserve that unit. "
+                "Would you like me to try another size?"
+            )
         
-        # Fallback if no input received
-        response.say(
-            'I didn\'t catch that. Please call back when you\'re ready.',
-            voice='Polly.Amy'
+        if self.send_reservation_confirmation(caller, reservation):
+            return (
+                f"You're all set. I've reserved unit {unit.unit_id} for you "
+                "and texted you the confirmation. Is there anything else I can help you with?"
+            )
+        return (
+            f"You're all set. I've reserved unit {unit.unit_id} for you, "
+            f"and your reservation number is {reservation.reservation_id}. "
+            "Is there anything else I can help you with?"
         )
+
+    def send_reservation_confirmation(self, to: str, reservation: Reservation) -> bool:
+        """
+        Queue an SMS confirming a reservation
         
-        return str(response)
+        Args:
+            to: Customer's phone number
+            reservation: The reservation to confirm
+            
+        Returns:
+            True if the message was queued
+        """
+        if self.messenger is None:
+            return False
+        name = self.facility.name if self.facility else "Storage Agent"
+        body = (
+            f"{name}: reservation {reservation.reservation_id} for unit {reservation.unit_id} "
+            f"starting {reservation.start_date:%b %d, %Y} is {reservation.status}. "
+            f"Total ${reservation.total_price:.2f} for {reservation.duration_months} "
+            f"month{'s' if reservation.duration_months != 1 else ''}."
+        )
+        # Sent from the number the caller dialed, so replies reach the same facility
+        from_number = self.facility.twilio_number if self.facility else None
+        return self.messenger.enqueue(to, body, kind="confirmation", from_number=from_number)
 
     def handle_error(self, error: Exception) -> str:
         """
@@ -165,14 +335,7 @@ class TwilioService:
         """
         logger.error(f"Error in call processing: {str(error)}", exc_info=True)
         
-        response = VoiceResponse()
-        response.say(
-            'I apologize, but I\'m having trouble processing your request. '
-            'Please try again in a moment.',
-            voice='Polly.Amy'
-        )
-        
-        return str(response)
+        return error_response()
 
     def validate_request(self, request_data: Dict, request_url: str, signature: str) -> bool:
         """
@@ -0,0 +1,114 @@
+from functools import lru_cache
+from typing import Tuple
+from xml.sax.saxutils import escape
+
+PROCESS_ACTION_URL = 'https://happy-waves-lie.loca.lt/voice/process'
+VOICE = 'Polly.Amy'
+
+GREETING = (
+    'Welcome to Storage Agent. How can I help you find the perfect storage unit today? '
+    'You can speak your request, or press 1 for unit availability, 2 for pricing, or 3 for general information.'
+)
+NO_INPUT_MESSAGE = 'I didn\'t catch that. Please call back when you\'re ready.'
+HOLD_MESSAGE = (
+    'Thanks for calling. We\'re helping a lot of callers right now. '
+    'Please hold for a moment, then tell me again how I can help.'
+)
+ERROR_MESSAGE = (
+    'I apologize, but I\'m having trouble processing your request. '
+    'Please try again in a moment.'
+)
+
+_PLACEHOLDER = '__STORAGE_AGENT_SAY__'
+
+
+def _gather():
+    from twilio.twiml.voice_response import Gather
+
+    return Gather(
+        input='speech dtmf',
+        action=PROCESS_ACTION_URL,
+        language='en-US',
+        enhanced='true',
+        speech_timeout='auto',
+        timeout=3
+    )
+
+
+@lru_cache()
+def incoming_call_response() -> str:
+    """TwiML greeting for a new call; identical for every call so rendered once"""
+    from twilio.twiml.voice_response import VoiceResponse
+
+    response = VoiceResponse()
+    gather = _gather()
+    gather.say(GREETING, voice=VOICE)
+    gather.pause(length=1)  # Add a 1-second pause after instructions
+    response.append(gather)
+    response.say(NO_INPUT_MESSAGE, voice=VOICE)
+    return str(response)
+
+
+@lru_cache()
+def _gather_template() -> Tuple[str, str]:
+    """The reply TwiML rendered once around a placeholder, split into (head, tail)"""
+    from twilio.twiml.voice_response import VoiceResponse
+
+    response = VoiceResponse()
+    gather = _gather()
+    gather.say(_PLACEHOLDER, voice=VOICE)
+    response.append(gather)
+    response.say(NO_INPUT_MESSAGE, voice=VOICE)
+    head, tail = str(response).split(_PLACEHOLDER)
+    return head, tail
+
+
+def gather_response(text: str) -> str:
+    """
+    TwiML that says ``text`` and listens for the caller's next input
+
+    Args:
+        text: What the agent says
+
+    Returns:
+        TwiML document, byte-for-byte what VoiceResponse would build
+    """
+    head, tail = _gather_template()
+    return f"{head}{escape(text)}{tail}"
+
+
+@lru_cache()
+def hold_response() -> str:
+    """
+    TwiML sent instead of processing a request when the voice routes are saturated
+
+    Asks the caller to hold and listens again, so their next input is a
+    fresh request once load has eased.
+    """
+    from twilio.twiml.voice_response import VoiceResponse
+
+    response = VoiceResponse()
+    gather = _gather()
+    gather.say(HOLD_MESSAGE, voice=VOICE)
+    gather.pause(length=2)
+    response.append(gather)
+    response.say(NO_INPUT_MESSAGE, voice=VOICE)
+    return str(response)
+
+
+@lru_cache()
+def error_response() -> str:
+    """TwiML apology used when a turn fails"""
+    from twilio.twiml.voice_response import VoiceResponse
+
+    response = VoiceResponse()
+    response.say(ERROR_MESSAGE, voice=VOICE)
+    return str(response)
+
+
+def warm_templates() -> None:
+    """Import the TwiML builder and render every template ahead of the first call"""
+    incoming_call_response()
+    _gather_template()
+    hold_response()
+    error_response()
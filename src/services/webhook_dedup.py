@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import inspect
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, Union
+
+# Twilio sends the same token on every retry of one webhook request
+IDEMPOTENCY_HEADER = "I-Twilio-Idempotency-Token"
+
+Render = Callable[[], Union[str, Awaitable[str]]]
+
+
+def webhook_key(call_sid: str, form: Mapping[str, str], idempotency_token: Optional[str] = None) -> Hashable:
+    """
+    Identify one webhook request across Twilio's retries of it
+
+    Args:
+        call_sid: Call the webhook belongs to
+        form: Posted form fields
+        idempotency_token: Twilio's idempotency header, when sent
+
+    Returns:
+        (call_sid, token), or (call_sid, digest of the form) without a token
+    """
+    if idempotency_token:
+        return (call_sid, idempotency_token)
+    digest = hashlib.blake2b(digest_size=16)
+    for name, value in sorted(form.items()):
+        digest.update(f"{name}\0{value}\0".encode())
+    return (call_sid, digest.hexdigest())
+
+
+class WebhookDedupCache:
+    """
+    Remembers the TwiML rendered for each webhook request for a while
+
+    Twilio retries a webhook that times out or fails to connect. Replaying
+    the first response for a retry keeps the turn from being processed
+    twice, which would advance the conversation and record a duplicate
+    turn. A duplicate that arrives while the first request is still being
+    processed waits for its result instead of starting another run.
+
+    Only used from the event loop, so no lock is needed. Failed renders
+    are not cached; the next retry runs again.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10000):
+        """
+        Initialize cache
+
+        Args:
+            ttl_seconds: How long a response is replayed for retries
+            max_entries: Responses kept; the oldest are dropped first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Insertion order is expiry order since every entry gets the same TTL
+        self._entries: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring retry traffic"""
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+
+    async def respond(self, key: Hashable, render: Render) -> Tuple[str, bool]:
+        """
+        Render a response once per request key
+
+        Args:
+            key: From webhook_key
+            render: Produces the response; sync or async
+
+        Returns:
+            Tuple of (response, whether it was a duplicate)
+        """
+        now = monotonic()
+        self._expire(now)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1], True
+
+        if (future := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+            # shield so a cancelled duplicate does not cancel the original
+            return await asyncio.shield(future), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = render()
+            if inspect.isawaitable(response):
+                response = await response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here so an unawaited failure is not logged
+            raise
+        finally:
+            del self._inflight[key]
+
+        self._entries[key] = (monotonic() + self.ttl_seconds, response)
+        self._expire(now)
+        future.set_result(response)
+        return response, False
+
+    def clear(self) -> None:
+        """Drop all remembered responses"""
+        self._entries.clear()
+
+
+@lru_cache()
+def get_webhook_dedup_cache() -> WebhookDedupCache:
+    """Get the process-wide webhook dedup cache"""
+    from src.core.config import get_settings
+
+    settings = get_settings()
+    return WebhookDedupCache(settings.WEBHOOK_DEDUP_TTL_SECONDS, settings.WEBHOOK_DEDUP_MAX_ENTRIES)
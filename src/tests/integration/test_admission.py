@@ -0,0 +1,83 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.admission import AdaptiveLimit, AdmissionController, AdmissionMiddleware
+from services.twiml import hold_response
+
+def test_limit_grows_when_fast_and_backs_off_when_slow(monkeypatch):
+    """Test additive increase under load and one multiplicative decrease per slow period"""
+    now = [0.0]
+    monkeypatch.setattr("services.admission.monotonic", lambda: now[0])
+    limit = AdaptiveLimit(initial=10, min_limit=2, max_limit=12, target_latency=1.0, backoff=0.5)
+    
+    for _ in range(11):
+        limit.on_sample(0.1, in_flight=10)
+    assert limit.current == 11
+    # An idle server does not grow its limit
+    limit.on_sample(0.1, in_flight=1)
+    assert limit.current == 11
+    
+    limit.on_sample(3.0, in_flight=11)
+    limit.on_sample(3.0, in_flight=11)
+    assert limit.current == 5
+    now[0] += 1.0
+    for _ in range(5):
+        limit.on_sample(3.0, in_flight=5)
+        now[0] += 1.0
+    assert limit.current == 2
+
+def test_requests_queue_then_shed():
+    """Test requests over the limit wait, the queue is bounded, and waits time out"""
+    controller = AdmissionController(AdaptiveLimit(initial=1, min_limit=1, max_limit=1), max_queue=1, queue_timeout=0.05)
+    
+    async def run():
+        assert await controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        # Queue full: shed immediately
+        assert not await controller.acquire()
+        controller.release(0.01)
+        assert await waiter
+        # Slot never frees: the wait times out
+        assert not await controller.acquire()
+        controller.release(0.01)
+    
+    asyncio.run(run())
+    assert controller.stats() == {
+        "limit": 1, "in_flight": 0, "waiting": 0, "admitted": 2, "queued": 2, "shed": 2,
+    }
+
+def test_hold_response_listens_again():
+    """Test the hold TwiML asks the caller to wait and gathers their next input"""
+    twiml = hold_response()
+    assert "Please hold" in twiml
+    assert "<Gather" in twiml and "/voice/process" in twiml
+
+def test_middleware_sheds_with_hold_twiml():
+    """Test saturated voice routes answer with the hold TwiML while others are unaffected"""
+    controller = AdmissionController(AdaptiveLimit(initial=1, min_limit=1, max_limit=1), max_queue=0)
+    app = FastAPI()
+    app.add_middleware(
+        AdmissionMiddleware, controller=controller, paths=("/voice/process",), shed_response=lambda: "<Response>hold</Response>"
+    )
+    
+    @app.post("/voice/process")
+    async def process():
+        return "processed"
+    
+    @app.get("/health")
+    async def health():
+        return "ok"
+    
+    client = TestClient(app)
+    assert client.post("/voice/process").json() == "processed"
+    
+    controller.in_flight = 1  # Saturated by another request
+    response = client.post("/voice/process")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/xml"
+    assert response.text == "<Response>hold</Response>"
+    assert client.get("/health").json() == "ok"
+    assert controller.stats()["shed"] == 1
@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def test_importing_the_app_has_no_filesystem_side_effects(tmp_path):
+    """Test building the app neither creates logs/ nor opens the log file"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "src")]))
+    result = subprocess.run(
+        [sys.executable, "-c", "import logging, src.main; print(logging.getLogger('storage_agent').handlers)"],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,141 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from services.availability import AvailabilityIndex, attach_unit_listeners
+from services.storage_service import StorageService, StorageUnit
+from src.models.facility import Facility  # noqa: F401 - registers the mapper
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.unit import Unit
+
+def make_unit(unit_id, size, price, available=True, climate_controlled=False):
+    return StorageUnit(
+        unit_id=unit_id,
+        size=size,
+        square_feet=0,
+        price=price,
+        floor=1,
+        climate_controlled=climate_controlled,
+        available=available,
+        features=[]
+    )
+
+def test_summary_counts_and_price_range():
+    """Test per-size counts and min/max price of available units"""
+    index = AvailabilityIndex()
+    index.load("1", [
+        make_unit("A", "10x10", 150.0),
+        make_unit("B", "10x10", 130.0, climate_controlled=True),
+        make_unit("C", "10x10", 120.0, available=False),
+        make_unit("D", "5x5", 50.0),
+    ])
+    ten = index.get("1", "10x10")
+    assert (ten.total_units, ten.available_units) == (3, 2)
+    assert (ten.min_price, ten.max_price) == (130.0, 150.0)
+    assert index.get("1", "10x10", climate_controlled=True).available_units == 1
+    assert [item.size for item in index.summary("1")] == ["5x5", "10x10"]
+    assert index.get("1", "10x15") is None
+
+def test_incremental_updates_bump_version():
+    """Test taking and releasing units updates the summary in place"""
+    index = AvailabilityIndex()
+    index.load("1", [make_unit("A", "10x10", 150.0), make_unit("B", "10x10", 130.0)])
+    version = index.version("1")
+    
+    index.mark_unavailable("1", "10x10", False, 130.0)
+    assert index.get("1", "10x10").min_price == 150.0
+    index.mark_available("1", "10x10", False, 130.0)
+    index.mark_available("1", "10x10", False, 130.0)  # Cannot exceed unit count
+    assert index.get("1", "10x10").available_units == 2
+    assert index.version("1") == version + 2
+
+def test_reservation_transitions_update_summary():
+    """Test Reservation.confirm/cancel flow through to the summary"""
+    index = AvailabilityIndex()
+    attach_unit_listeners(index)
+    unit = Unit(unit_id="A101", size="10x10", square_feet=100, floor=1, price=149.99,
+                climate_controlled=False, available=True, facility_id=7)
+    index.load("7", [unit])
+    reservation = Reservation(status=ReservationStatus.PENDING, unit=unit)
+    
+    reservation.confirm()
+    assert index.get("7", "10x10").available_units == 0
+    reservation.cancel()
+    assert index.get("7", "10x10").available_units == 1
+
+def test_storage_service_seeding():
+    """Test the mock inventory loads into the summary"""
+    service = StorageService(facility_id="test_facility", api_key="test_api_key")
+    index = AvailabilityIndex()
+    index.load(service.facility_id, service.get_all_units())
+    assert index.get("test_facility", "10x15").available_units == 0
+    assert index.get("test_facility", "5x5").min_price == 49.99
+
+def test_identical_reload_keeps_version():
+    """Test reloading unchanged units does not invalidate cached answers"""
+    index = AvailabilityIndex()
+    units = [make_unit("A", "10x10", 150.0), make_unit("B", "5x5", 50.0, available=False)]
+    assert index.load("1", units)
+    version = index.version("1")
+    assert not index.load("1", list(units))
+    assert index.version("1") == version
+    assert index.load("1", [make_unit("A", "10x10", 150.0, available=False), units[1]])
+    assert index.version("1") == version + 1
+
+def test_reconcile_picks_up_changes_made_elsewhere():
+    """Test load_from_database corrects drift from writes the listeners never saw"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE units (id INTEGER PRIMARY KEY, facility_id INTEGER, size TEXT, "
+            "climate_controlled BOOLEAN, price FLOAT, available BOOLEAN)"
+        ))
+        connection.execute(text(
+            "INSERT INTO units (facility_id, size, climate_controlled, price, available) VALUES "
+            "(1, '10x10', 0, 150.0, 1), (1, '10x10', 0, 130.0, 1), (2, '5x5', 0, 50.0, 1)"
+        ))
+    session = sessionmaker(bind=engine)()
+    index = AvailabilityIndex()
+    assert index.load_from_database(session) == 2
+    versions = (index.version("1"), index.version("2"))
+
+    # Another worker takes a unit with a raw UPDATE
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE units SET available = 0 WHERE price = 130.0"))
+    index.load_from_database(session)
+    assert index.get("1", "10x10").available_units == 1
+    assert index.version("1") == versions[0] + 1
+    assert index.version("2") == versions[1]
+
+def test_reconcile_counts_units_sharing_a_price():
+    """Test units grouped in SQL still count one by one"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE units (id INTEGER PRIMARY KEY, facility_id INTEGER, size TEXT, "
+            "climate_controlled BOOLEAN, price FLOAT, available BOOLEAN)"
+        ))
+        connection.execute(text(
+            "INSERT INTO units (facility_id, size, climate_controlled, price, available) VALUES "
+            "(1, '10x10', 0, 150.0, 1), (1, '10x10', 0, 150.0, 1), (1, '10x10', 0, 150.0, 0), "
+            "(1, '10x10', 1, 180.0, 1)"
+        ))
+    index = AvailabilityIndex()
+    index.load_from_database(sessionmaker(bind=engine)())
+    match = index.get("1", "10x10")
+    assert (match.total_units, match.available_units) == (4, 3)
+    assert (match.min_price, match.max_price) == (150.0, 180.0)
+    index.mark_unavailable("1", "10x10", False, 150.0)
+    assert index.get("1", "10x10", climate_controlled=False).available_units == 1
+
+def test_listeners_attach_once():
+    """Test attaching the same index twice applies each change once"""
+    index = AvailabilityIndex()
+    attach_unit_listeners(index)
+    attach_unit_listeners(index)
+    unit = Unit(unit_id="A102", size="10x10", square_feet=100, floor=1, price=99.0,
+                climate_controlled=False, available=True, facility_id=8)
+    index.load("8", [unit])
+    version = index.version("8")
+    Reservation(status=ReservationStatus.PENDING, unit=unit).confirm()
+    assert index.get("8", "10x10").available_units == 0
+    assert index.version("8") == version + 1
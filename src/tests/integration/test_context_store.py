@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.context_store import (
+    claim_snapshots,
+    read_snapshot,
+    restore_contexts,
+    snapshot_contexts,
+    worker_snapshot_path,
+)
+from src.core.conversation import ConversationEngine, Entity, Intent
+
+def make_engine(sessions):
+    engine = ConversationEngine()
+    for i in range(sessions):
+        context = engine.get_or_create_context(f"call-{i}")
+        context.update_intent(Intent.AVAILABILITY)
+        context.update_intent(Intent.PRICING)
+        context.add_entity(Entity(type='unit_size', value='10x10', confidence=0.9))
+    return engine
+
+def test_snapshot_round_trip(tmp_path):
+    """Test contexts come back with history, entities and preferences intact"""
+    path = str(tmp_path / "sessions.bin")
+    engine = make_engine(2500)
+    engine.active_contexts["call-0"].set_preference("contact", "text")
+    
+    written = asyncio.run(snapshot_contexts({"f1": engine}, path, chunk_size=1000))
+    assert written == 2500
+    
+    restored = ConversationEngine()
+    assert restore_contexts(path, 3600, lambda key: restored) == 2500
+    
+    original = engine.active_contexts["call-0"]
+    context = restored.active_contexts["call-0"]
+    assert context.current_intent == Intent.PRICING
+    assert context.previous_intents == [Intent.AVAILABILITY]
+    assert context.turn_count == original.turn_count
+    assert context.updated_at == original.updated_at
+    assert context.entities["unit_size"].value == "10x10"
+    assert context.user_preferences == {"contact": "text"}
+    assert restored.active_contexts["call-1"].user_preferences is None
+
+def test_restore_skips_expired_sessions(tmp_path):
+    """Test sessions idle past the TTL are not restored"""
+    path = str(tmp_path / "sessions.bin")
+    engine = make_engine(3)
+    engine.active_contexts["call-1"].updated_at = time.time() - 7200
+    asyncio.run(snapshot_contexts({"f1": engine}, path))
+    
+    session_ids = [context.session_id for _, context in read_snapshot(path, 1800)]
+    assert session_ids == ["call-0", "call-2"]
+
+def test_contexts_restore_into_their_facility(tmp_path):
+    """Test each facility's sessions go back to that facility's engine"""
+    path = str(tmp_path / "sessions.bin")
+    asyncio.run(snapshot_contexts({"f1": make_engine(2), "f2": make_engine(1)}, path))
+    
+    engines = {"f1": ConversationEngine(), "f2": ConversationEngine()}
+    restore_contexts(path, 3600, engines.__getitem__)
+    assert len(engines["f1"].active_contexts) == 2
+    assert len(engines["f2"].active_contexts) == 1
+
+def test_concurrent_snapshots_to_one_path(tmp_path):
+    """Test two workers snapshotting to the same path never share a temp file"""
+    path = str(tmp_path / "sessions.bin")
+
+    async def both():
+        return await asyncio.gather(
+            snapshot_contexts({"f1": make_engine(1500)}, path, chunk_size=100),
+            snapshot_contexts({"f2": make_engine(1000)}, path, chunk_size=100),
+        )
+
+    assert asyncio.run(both()) == [1500, 1000]
+    # One complete snapshot wins; no temp files are left behind
+    assert sorted(os.listdir(tmp_path)) == ["sessions.bin"]
+    assert len(list(read_snapshot(path, 3600))) in (1500, 1000)
+
+def test_concurrent_restores_claim_each_snapshot_once(tmp_path):
+    """Test workers starting together each restore a snapshot at most once"""
+    path = str(tmp_path / "sessions.bin")
+    asyncio.run(snapshot_contexts({"f1": make_engine(5)}, path))
+    asyncio.run(snapshot_contexts({"f1": make_engine(3)}, f"{path}.4242"))
+    asyncio.run(snapshot_contexts({"f1": make_engine(2)}, worker_snapshot_path(path)))
+    barrier = threading.Barrier(2)
+
+    def restore():
+        barrier.wait()
+        engine = ConversationEngine()
+        restored = 0
+        for claimed in claim_snapshots(path):
+            restored += restore_contexts(claimed, 3600, lambda key: engine)
+            os.remove(claimed)
+        return restored
+
+    with ThreadPoolExecutor(2) as pool:
+        counts = [future.result() for future in [pool.submit(restore), pool.submit(restore)]]
+    assert sum(counts) == 10
+    assert os.listdir(tmp_path) == []
+    assert claim_snapshots(path) == []
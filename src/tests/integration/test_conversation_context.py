@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from src.core.context_store import restore_contexts, snapshot_contexts
+from src.core.conversation import INTENT_HISTORY_SIZE, ConversationContext, ConversationEngine, Intent
+
+CYCLE = [intent for intent in Intent if intent != Intent.UNKNOWN]
+
+def play(context, intents):
+    for intent in intents:
+        context.update_intent(intent)
+
+def test_history_starts_empty_and_skips_unknown():
+    """Test the first intent and UNKNOWN turns are not recorded as history"""
+    context = ConversationContext(session_id="call")
+    assert context.previous_intents == []
+    context.update_intent(Intent.AVAILABILITY)
+    assert context.previous_intents == []
+    context.update_intent(Intent.UNKNOWN)
+    assert context.previous_intents == [Intent.AVAILABILITY]
+    context.update_intent(Intent.PRICING)
+    assert context.previous_intents == [Intent.AVAILABILITY]
+    assert context.current_intent == Intent.PRICING
+    assert context.turn_count == 3
+
+@pytest.mark.parametrize("turns", [
+    INTENT_HISTORY_SIZE,
+    INTENT_HISTORY_SIZE + 1,
+    INTENT_HISTORY_SIZE + 2,
+    2 * INTENT_HISTORY_SIZE + 3,
+    10 * INTENT_HISTORY_SIZE + 5,
+])
+def test_history_keeps_most_recent_oldest_first(turns):
+    """Test wraparound keeps the last INTENT_HISTORY_SIZE prior intents in order"""
+    intents = [CYCLE[i % len(CYCLE)] for i in range(turns + 1)]
+    context = ConversationContext(session_id="call")
+    play(context, intents)
+    assert context.previous_intents == intents[:-1][-INTENT_HISTORY_SIZE:]
+    assert len(context.previous_intents) == min(turns, INTENT_HISTORY_SIZE)
+    assert len(context._intent_ring) == INTENT_HISTORY_SIZE
+    assert context.current_intent == intents[-1]
+
+def test_history_below_capacity():
+    """Test a short history is returned in full without padding"""
+    context = ConversationContext(session_id="call")
+    play(context, [Intent.HOURS, Intent.LOCATION, Intent.PAYMENT])
+    assert context.previous_intents == [Intent.HOURS, Intent.LOCATION]
+
+def test_wrapped_history_survives_snapshot(tmp_path):
+    """Test a wrapped ring restores with the same order and capacity"""
+    path = str(tmp_path / "sessions.bin")
+    engine = ConversationEngine()
+    context = engine.get_or_create_context("call")
+    intents = [CYCLE[i % len(CYCLE)] for i in range(INTENT_HISTORY_SIZE + 4)]
+    play(context, intents)
+
+    assert asyncio.run(snapshot_contexts({"f1": engine}, path)) == 1
+    restored = ConversationEngine()
+    assert restore_contexts(path, 3600, lambda key: restored) == 1
+    copy = restored.active_contexts["call"]
+    assert copy.previous_intents == context.previous_intents
+
+    # The restored ring keeps wrapping from where it left off
+    copy.update_intent(Intent.GENERAL)
+    context.update_intent(Intent.GENERAL)
+    assert copy.previous_intents == context.previous_intents
+    assert len(copy.previous_intents) == INTENT_HISTORY_SIZE
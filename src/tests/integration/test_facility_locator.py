@@ -0,0 +1,50 @@
+from services.facility_locator import FacilityLocator, haversine_miles
+from services.facility_registry import FacilityRecord
+
+def make_facility(facility_id, latitude, longitude, zip_code="00000"):
+    return FacilityRecord(
+        facility_id=facility_id,
+        name=f"Facility {facility_id}",
+        address=f"{facility_id} Main St",
+        city="Springfield",
+        state="IL",
+        zip_code=zip_code,
+        phone="555-0123",
+        latitude=latitude,
+        longitude=longitude
+    )
+
+FACILITIES = [
+    make_facility("springfield", 39.7817, -89.6501, zip_code="62701"),
+    make_facility("chicago", 41.8781, -87.6298, zip_code="60601"),
+    make_facility("st-louis", 38.6270, -90.1994, zip_code="63101"),
+    make_facility("decatur", 39.8403, -88.9548, zip_code="62521"),
+    make_facility("no-coordinates", None, None),
+]
+
+def brute_force(latitude, longitude, facilities, limit):
+    distances = [
+        (haversine_miles(latitude, longitude, f.latitude, f.longitude), f.facility_id)
+        for f in facilities if f.latitude is not None
+    ]
+    return [facility_id for _, facility_id in sorted(distances)[:limit]]
+
+def test_nearest_matches_brute_force():
+    """Test grid search returns the same order as scanning every facility"""
+    locator = FacilityLocator(FACILITIES, cell_degrees=0.25)
+    assert len(locator) == 4
+    for latitude, longitude in [(39.8, -89.6), (41.5, -88.0), (37.0, -95.0)]:
+        nearest = [f.facility_id for f, _ in locator.nearest(latitude, longitude, limit=3)]
+        assert nearest == brute_force(latitude, longitude, FACILITIES, 3)
+
+def test_nearest_to_zip_with_availability_filter():
+    """Test ZIP lookups and filtering by unit availability"""
+    locator = FacilityLocator(
+        FACILITIES,
+        has_availability=lambda facility, size: facility.facility_id != "springfield"
+    )
+    assert locator.nearest_to_zip("62701", limit=1)[0][0].facility_id == "springfield"
+    nearest = locator.nearest_to_zip("62701", limit=1, size="10x10")
+    assert nearest[0][0].facility_id == "decatur"
+    assert locator.nearest_to_zip("99999") == []
+    assert locator.nearest(39.8, -89.6, max_miles=10)[0][0].facility_id == "springfield"
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from services.availability import AvailabilityIndex
+from services.facility_registry import FacilityRecord, FacilityRegistry, normalize_phone_number
+
+def make_record(facility_id, twilio_number, name="Storage Plus"):
+    return FacilityRecord(
+        facility_id=facility_id,
+        name=name,
+        address="123 Storage Lane",
+        city="Springfield",
+        state="IL",
+        zip_code="62701",
+        phone="555-0123",
+        twilio_number=twilio_number,
+        hours={"monday": {"open": "09:00", "close": "18:00"}}
+    )
+
+def test_normalize_phone_number():
+    """Test common phone formats normalize to E.164"""
+    assert normalize_phone_number("(555) 010-0123") == "+15550100123"
+    assert normalize_phone_number("+1 555 010 0123") == "+15550100123"
+    assert normalize_phone_number("") is None
+
+def test_lookup_by_dialed_number():
+    """Test calls are routed by the number the caller dialed"""
+    registry = FacilityRegistry()
+    registry.load([make_record("1", "+15550100001"), make_record("2", "+15550100002")])
+    assert registry.lookup("+15550100002").facility_id == "2"
+    assert registry.lookup("(555) 010-0001").facility_id == "1"
+    assert registry.lookup("+19999999999") is None
+
+def test_reload_keeps_services_for_unchanged_facilities():
+    """Test hot reload swaps facilities without rebuilding unchanged services"""
+    registry = FacilityRegistry()
+    registry.load([make_record("1", "+15550100001"), make_record("2", "+15550100002")])
+    service_1 = registry.storage_service_for(registry.get("1"))
+    service_2 = registry.storage_service_for(registry.get("2"))
+    
+    registry.load([
+        make_record("1", "+15550100001"),
+        make_record("2", "+15550100002", name="Renamed"),
+        make_record("3", "+15550100003"),
+    ])
+    assert registry.version == 2
+    assert registry.lookup("+15550100003").facility_id == "3"
+    assert registry.storage_service_for(registry.get("1")) is service_1
+    assert registry.storage_service_for(registry.get("2")) is not service_2
+    assert registry.storage_service_for(None).facility_id == registry.default_facility_id
+
+def test_availability_filter_reads_the_summary():
+    """Test the locator's size filter answers from the availability summary"""
+    availability = AvailabilityIndex()
+    registry = FacilityRegistry(availability=availability)
+    registry.load([make_record("1", "+15550100001"), make_record("2", "+15550100002")])
+    availability.load("1", [SimpleNamespace(size="10x10", climate_controlled=False, price=99.0, available=False)])
+    availability.load("2", [SimpleNamespace(size="10x10", climate_controlled=True, price=149.0, available=True)])
+    assert not registry._has_availability(registry.get("1"), "10x10")
+    assert registry._has_availability(registry.get("2"), "10x10")
+    assert not registry._has_availability(registry.get("2"), "5x5")
@@ -0,0 +1,140 @@
+import importlib.util
+import os
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import Base
+from src.models.facility import Facility
+from src.models.reservation import Reservation
+from src.models.unit import SIZE_PATTERN, Unit
+
+UNITS = [
+    # unit_id, size, available
+    ("B201", "10x10", True),
+    ("A101", "10x10", True),
+    ("A102", "5x10", True),
+    ("C301", "10x20", False),
+    ("C302", "10x20", True),
+]
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Facility.__table__, Reservation.__table__])
+    with engine.begin() as connection:
+        # units.features is a PostgreSQL ARRAY, so create the table by hand
+        connection.execute(text(
+            "CREATE TABLE units (id INTEGER PRIMARY KEY, unit_id TEXT UNIQUE NOT NULL, size TEXT NOT NULL, "
+            "width_ft INTEGER, length_ft INTEGER, square_feet INTEGER NOT NULL, floor INTEGER NOT NULL, "
+            "price FLOAT NOT NULL, climate_controlled BOOLEAN, available BOOLEAN, features TEXT, "
+            "facility_id INTEGER NOT NULL)"
+        ))
+    session = sessionmaker(bind=engine)()
+    facility = Facility(
+        id=1, name="Downtown", address="1 Main St", city="Springfield", state="IL",
+        zip_code="62701", phone="+15550100000", hours={}
+    )
+    other = Facility(
+        id=2, name="Uptown", address="9 Oak St", city="Springfield", state="IL",
+        zip_code="62702", phone="+15550100001", hours={}
+    )
+    session.add_all([facility, other])
+    for unit_id, size, available in UNITS:
+        width, length = Unit.parse_size(size)
+        session.add(Unit(
+            unit_id=unit_id, size=size, square_feet=width * length, floor=1,
+            price=50.0, available=available, facility_id=1
+        ))
+    session.add(Unit(unit_id="Z901", size="10x10", square_feet=100, floor=1, price=50.0, available=True, facility_id=2))
+    session.commit()
+    yield session
+    session.close()
+
+def unit_ids(units):
+    return sorted(unit.unit_id for unit in units)
+
+def test_units_query_filters_in_sql(session):
+    """Test each filter narrows this facility's units and never reaches other facilities"""
+    facility = session.get(Facility, 1)
+    assert unit_ids(facility.units_query()) == ["A101", "A102", "B201", "C301", "C302"]
+    assert unit_ids(facility.units_query(available=False)) == ["C301"]
+    assert unit_ids(facility.units_query(size="10x10")) == ["A101", "B201"]
+    assert unit_ids(facility.units_query(min_length=20)) == ["C301", "C302"]
+    assert unit_ids(facility.units_query(min_width=10, max_square_feet=100)) == ["A101", "B201"]
+    assert unit_ids(facility.units_query(min_square_feet=50, max_square_feet=50)) == ["A102"]
+
+def test_available_units_and_lookup_by_id(session):
+    """Test available units come back ordered by unit ID and lookups are scoped to the facility"""
+    facility = session.get(Facility, 1)
+    assert [unit.unit_id for unit in facility.get_available_units()] == ["A101", "A102", "B201", "C302"]
+    assert [unit.unit_id for unit in facility.get_available_units("10x20")] == ["C302"]
+    assert facility.get_unit_by_id("A102").size == "5x10"
+    assert facility.get_unit_by_id("Z901") is None
+
+def test_relationships_never_lazy_load(session):
+    """Test units and their reservations raise instead of loading implicitly"""
+    facility = session.get(Facility, 1)
+    with pytest.raises(InvalidRequestError):
+        facility.units
+    with pytest.raises(InvalidRequestError):
+        facility.get_unit_by_id("A101").reservations
+    
+    session.expire_all()
+    facility = session.query(Facility).options(Facility.with_units()).filter(Facility.id == 1).one()
+    assert len(facility.units) == 5
+
+def test_detached_facility_cannot_query(session):
+    """Test a facility outside a session needs one passed in"""
+    facility = session.get(Facility, 1)
+    session.expunge(facility)
+    with pytest.raises(RuntimeError):
+        facility.units_query()
+    assert facility.units_query(session, size="5x10").one().unit_id == "A102"
+
+def test_iter_units_streams_in_batches(session):
+    """Test units are fetched with yield_per and come back in primary key order"""
+    batch_sizes = []
+    event.listen(session, "do_orm_execute", lambda state: batch_sizes.append(state.execution_options.get("yield_per")))
+    
+    facility = session.get(Facility, 1)
+    batch_sizes.clear()
+    units = list(facility.iter_units(available=True, batch_size=2))
+    assert [unit.id for unit in units] == sorted(unit.id for unit in units)
+    assert unit_ids(units) == ["A101", "A102", "B201", "C302"]
+    assert batch_sizes == [2]
+
+@pytest.mark.parametrize("size,expected", [
+    ("10x10", (10, 10)),
+    ("10X20", (10, 20)),
+    ("10 x 15", (10, 15)),
+    (" 5x10 ", (5, 10)),
+    ("10x", (None, None)),
+    ("10x10x10", (None, None)),
+    ("-5x10", (None, None)),
+    ("1_0x10", (None, None)),
+    ("ten by ten", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_size(size, expected):
+    """Test the size grammar, including spacing and case variants"""
+    assert Unit.parse_size(size) == expected
+
+def test_size_assignment_updates_dimensions():
+    """Test the validator keeps width/length in step with size"""
+    unit = Unit(size="10 x 20")
+    assert (unit.width_ft, unit.length_ft) == (10, 20)
+    unit.size = "odd"
+    assert (unit.width_ft, unit.length_ft) == (None, None)
+    assert unit.dimensions == (0, 0)
+
+def test_backfill_migration_uses_the_model_grammar():
+    """Test the SQL backfill parses sizes exactly as Unit.parse_size does"""
+    versions = os.path.join(os.path.dirname(__file__), "..", "..", "..", "migrations", "versions")
+    path = os.path.join(versions, "20261019_0930_8d2e4b6a1c57_add_unit_width_length_columns.py")
+    spec = importlib.util.spec_from_file_location("unit_width_length_migration", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    assert migration.SIZE_PATTERN == SIZE_PATTERN
@@ -0,0 +1,99 @@
+import os
+import random
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from tools.generate_dataset import (
+    CopyStream, DatasetSpec, UnitCatalog, copy_value, generate_facilities,
+    generate_reservations, generate_units, load_dataset, parse_mix
+)
+
+AS_OF = datetime(2026, 10, 1)
+SPEC = DatasetSpec(facilities=3, units_per_facility=(20, 40), years=2, seed=7)
+
+def generate(spec=SPEC):
+    rng = random.Random(spec.seed)
+    catalog = UnitCatalog()
+    facilities = list(generate_facilities(spec, rng, 1))
+    units = list(generate_units(spec, rng, [row[0] for row in facilities], 1, catalog))
+    reservations = list(generate_reservations(spec, rng, catalog, 1, AS_OF))
+    return facilities, units, reservations
+
+def test_same_seed_same_rows():
+    """Test generation is reproducible and the seed changes it"""
+    assert generate() == generate()
+    assert generate() != generate(DatasetSpec(facilities=3, units_per_facility=(20, 40), years=2, seed=8))
+
+def test_histories_are_consistent():
+    """Test each unit's rentals never overlap and at most the last one is live"""
+    _, units, reservations = generate()
+    assert 60 <= len(units) <= 120
+    assert len({row[1] for row in units}) == len(units)
+    
+    by_unit = defaultdict(list)
+    for row in reservations:
+        by_unit[row[16]].append(row)
+    for rows in by_unit.values():
+        rentals = [row for row in rows if row[10] in ("COMPLETED", "CONFIRMED")]
+        for before, after in zip(rentals, rentals[1:]):
+            assert before[6] <= after[5]
+        assert all(row[10] == "COMPLETED" for row in rentals[:-1])
+        assert sum(row[10] in ("CONFIRMED", "PENDING") for row in rows) <= 1
+    statuses = {row[10] for row in reservations}
+    assert {"COMPLETED", "CONFIRMED", "CANCELLED"} <= statuses
+
+def test_facility_numbers_are_unique():
+    """Test no two facilities share a dialed number"""
+    from services.facility_registry import normalize_phone_number
+    
+    facilities, _, _ = generate(DatasetSpec(facilities=500, units_per_facility=(1, 1), years=1))
+    numbers = [normalize_phone_number(number) for row in facilities for number in (row[6], row[7])]
+    assert len(set(numbers)) == len(numbers)
+
+def test_size_mix_is_respected():
+    """Test a custom size distribution only produces the listed sizes"""
+    spec = DatasetSpec(facilities=2, units_per_facility=(50, 50), size_mix=parse_mix("5x5=1,10x30=3"))
+    _, units, _ = generate(spec)
+    sizes = [row[2] for row in units]
+    assert set(sizes) == {"5x5", "10x30"}
+    assert sizes.count("10x30") > sizes.count("5x5")
+
+def test_copy_stream_encodes_text_format():
+    """Test rows are escaped for COPY and served in requested chunk sizes"""
+    assert copy_value(None) == "\\N"
+    assert copy_value(True) == "t"
+    assert copy_value(["Drive Up", 'Big "Door"']) == '{"Drive Up","Big \\\\"Door\\\\""}'
+    assert copy_value("tab\there") == "tab\\there"
+    
+    rows = [(i, "name", {"a": 1}, datetime(2026, 1, 1)) for i in range(100)]
+    stream = CopyStream(rows, json_columns=[2])
+    chunks = iter(lambda: stream.read(64), "")
+    data = "".join(chunks)
+    assert stream.rows == 100
+    assert data.splitlines()[0] == '0\tname\t{"a": 1}\t2026-01-01 00:00:00'
+
+@pytest.mark.skipif(not os.getenv('TEST_DATABASE_URL'), reason="needs TEST_DATABASE_URL (PostgreSQL)")
+def test_load_dataset_into_postgres():
+    """Test a small dataset loads with COPY and occupied units are marked"""
+    from sqlalchemy import create_engine, func, select, text
+    from src.models.base import Base
+    from src.models.facility import Facility
+    
+    engine = create_engine(os.environ['TEST_DATABASE_URL'])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    connection = engine.raw_connection()
+    try:
+        counts = load_dataset(connection, SPEC, AS_OF)
+    finally:
+        connection.close()
+    
+    with engine.connect() as db:
+        assert db.execute(select(func.count()).select_from(Facility)).scalar() == counts["facilities"]
+        assert db.execute(text("SELECT COUNT(*) FROM units")).scalar() == counts["units"]
+        occupied = db.execute(text("SELECT COUNT(*) FROM units WHERE NOT available")).scalar()
+        confirmed = db.execute(text("SELECT COUNT(*) FROM reservations WHERE status = 'CONFIRMED'")).scalar()
+        assert occupied == confirmed > 0
+    Base.metadata.drop_all(engine)
@@ -0,0 +1,64 @@
+import pytest
+
+from src.core.conversation import Intent
+from src.core.intent_classifier import (
+    SEED_CORPUS_PATH, IntentClassifier, hashed_features, load_corpus, resolve_intent
+)
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier.fit(*load_corpus(SEED_CORPUS_PATH))
+
+def test_features_are_stable_and_bounded():
+    """Test hashing is deterministic across calls and stays inside the feature space"""
+    features = hashed_features("What are your HOURS?", 1 << 10)
+    assert features == hashed_features("what are your hours", 1 << 10)
+    assert all(0 <= index < 1 << 10 for index in features)
+    assert hashed_features("", 1 << 10) == []
+
+@pytest.mark.parametrize("text,intent", [
+    ("what are your hours", Intent.HOURS),
+    ("when do you close on sunday", Intent.HOURS),
+    ("where are you located", Intent.LOCATION),
+    ("can I pay with a credit card", Intent.PAYMENT),
+    ("how much is a ten by ten", Intent.PRICING),
+])
+def test_predicts_seed_intents(classifier, text, intent):
+    """Test common questions map to their intent"""
+    assert classifier.predict(text)[0] == intent
+
+def test_probabilities_cover_every_intent(classifier):
+    """Test predict_proba returns a distribution over all intents"""
+    probabilities = classifier.predict_proba("what are your hours")
+    assert set(probabilities) == set(Intent)
+    assert sum(probabilities.values()) == pytest.approx(1.0, abs=1e-5)
+    assert max(probabilities, key=probabilities.get) == Intent.HOURS
+    # Calibrated: not everything is near-certain
+    assert classifier.temperature > 1.0
+    assert classifier.predict("hmm okay")[1] < 0.9
+
+def test_batch_matches_single(classifier):
+    """Test batch inference agrees with one-at-a-time inference, including empty input"""
+    texts = ["what are your hours", "", "do you take visa", "where are you"]
+    batch = classifier.predict_batch(texts)
+    for text, (intent, confidence) in zip(texts, batch):
+        single_intent, single_confidence = classifier.predict(text)
+        assert intent == single_intent
+        assert confidence == pytest.approx(single_confidence, rel=1e-4)
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    """Test a saved model loads with the same labels and predictions"""
+    path = str(tmp_path / "model" / "intent.npz")
+    classifier.save(path)
+    loaded = IntentClassifier.load(path)
+    assert loaded.labels == classifier.labels
+    assert loaded.temperature == pytest.approx(classifier.temperature)
+    assert loaded.predict("are you open saturday") == pytest.approx(classifier.predict("are you open saturday"))
+
+def test_resolve_intent_falls_back_to_entities(classifier):
+    """Test low-confidence predictions defer to entity rules"""
+    assert resolve_intent("banana", {'unit_size': object()}, None) == (Intent.AVAILABILITY, 1.0)
+    assert resolve_intent("banana", {}, None) == (Intent.UNKNOWN, 0.0)
+    assert resolve_intent("what are your hours", {}, classifier)[0] == Intent.HOURS
+    intent, _ = resolve_intent("what are your hours", {'zip_code': object()}, classifier, threshold=1.1)
+    assert intent == Intent.LOCATION
@@ -0,0 +1,128 @@
+import os
+
+import httpx
+import pytest
+
+from services.availability import AvailabilityIndex
+from services.inventory_sync import InventorySync, unit_row
+
+def make_units(start, count, price=100.0):
+    return [
+        {"unit_id": f"U{i}", "size": "10x10", "floor": 1, "price": price,
+         "climate_controlled": False, "available": True, "features": []}
+        for i in range(start, start + count)
+    ]
+
+class StubManagementSystem:
+    """Change feed over a fixed list of units, paged by integer cursor"""
+    
+    def __init__(self, units):
+        self.units = units
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        cursor = int(request.url.params.get("cursor", 0))
+        limit = int(request.url.params["limit"])
+        etag = f'"{len(self.units)}"'
+        if request.headers.get("If-None-Match") == etag and cursor >= len(self.units):
+            return httpx.Response(304)
+        page = self.units[cursor:cursor + limit]
+        next_cursor = cursor + len(page)
+        return httpx.Response(200, headers={"ETag": etag}, json={
+            "units": page,
+            "next_cursor": str(next_cursor),
+            "has_more": next_cursor < len(self.units),
+        })
+
+def make_sync(stub, page_size=2):
+    return InventorySync("http://fms.test", page_size=page_size, transport=httpx.MockTransport(stub))
+
+def test_full_sync_pages_through_feed():
+    """Test a first sync walks every page with the pooled client"""
+    stub = StubManagementSystem(make_units(0, 5))
+    pages = list(make_sync(stub).fetch_changes(1, None, None, auth=("key", "secret")))
+    assert [len(page.units) for page in pages] == [2, 2, 1]
+    assert pages[-1].cursor == "5" and pages[-1].etag == '"5"'
+    assert stub.requests[0].headers["Authorization"].startswith("Basic ")
+
+def test_incremental_sync_fetches_only_changes():
+    """Test a resumed sync asks from its cursor and a quiet feed costs one 304"""
+    stub = StubManagementSystem(make_units(0, 5))
+    sync = make_sync(stub)
+    assert list(sync.fetch_changes(1, "5", '"5"')) == []
+    
+    stub.units.extend(make_units(5, 1, price=120.0))
+    pages = list(sync.fetch_changes(1, "5", '"5"'))
+    assert [unit["unit_id"] for page in pages for unit in page.units] == ["U5"]
+    assert stub.requests[-1].url.params["cursor"] == "5"
+
+def test_unit_row_materializes_dimensions():
+    """Test feed units map onto the units table columns"""
+    row = unit_row(3, {"unit_id": "A1", "size": "10x15", "price": "99.5"})
+    assert (row["width_ft"], row["length_ft"], row["square_feet"]) == (10, 15, 150)
+    assert row["facility_id"] == 3 and row["price"] == 99.5 and row["available"]
+
+def test_unit_row_rejects_malformed_units():
+    """Test missing or malformed fields surface as ValueError, not KeyError/TypeError"""
+    for unit in [{"size": "10x10", "price": 1}, {"unit_id": "A1", "size": "10x10"},
+                 {"unit_id": "A1", "size": None, "price": 1}, {"unit_id": "A1", "size": "10x10", "price": "n/a"}, None]:
+        with pytest.raises(ValueError):
+            unit_row(3, unit)
+
+def test_malformed_units_are_skipped():
+    """Test one bad unit in a page doesn't stop the rest from syncing"""
+    class Session:
+        def query(self, *columns):
+            raise AssertionError("reached the database")
+    
+    units = [{"unit_id": "A1", "size": "10x10"}, {"price": 10.0}]
+    assert make_sync(StubManagementSystem([]))._upsert_units(Session(), 3, units) == []
+
+def test_changes_update_availability_in_place():
+    """Test changed units move between buckets without a reload"""
+    index = AvailabilityIndex()
+    index.load("1", [])
+    index.replace_unit("1", None, ("10x10", False, 100.0, True))
+    index.replace_unit("1", None, ("10x10", False, 110.0, True))
+    index.replace_unit("1", ("10x10", False, 100.0, True), ("10x10", False, 90.0, False))
+    index.replace_unit("1", ("10x10", False, 110.0, True), ("5x5", False, 40.0, True))
+    ten = index.get("1", "10x10")
+    assert (ten.total_units, ten.available_units) == (1, 0)
+    assert index.get("1", "5x5").min_price == 40.0
+
+@pytest.mark.skipif(not os.getenv('TEST_DATABASE_URL'), reason="needs TEST_DATABASE_URL (PostgreSQL)")
+def test_sync_upserts_units_and_advances_cursor():
+    """Test changes land in units via ON CONFLICT and the cursor is saved"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    
+    from src.models.base import Base
+    from src.models.facility import Facility
+    from src.models.sync_state import InventorySyncState
+    from src.models.unit import Unit
+    
+    engine = create_engine(os.environ['TEST_DATABASE_URL'])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        facility = Facility(
+            name="Test", address="1 Main St", city="Austin", state="TX",
+            zip_code="78701", phone="5550100123", hours={}, api_key="key"
+        )
+        session.add(facility)
+        session.commit()
+        
+        stub = StubManagementSystem(make_units(0, 5))
+        sync = make_sync(stub)
+        assert sync.sync_facility(session, facility).units_changed == 5
+        
+        stub.units.append({**stub.units[0], "price": 80.0})
+        assert sync.sync_facility(session, facility).units_changed == 1
+        assert session.query(Unit).count() == 5
+        assert session.query(Unit.price).filter(Unit.unit_id == "U0").scalar() == 80.0
+        assert session.get(InventorySyncState, facility.id).cursor == "6"
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,225 @@
+import asyncio
+from datetime import datetime
+from urllib.parse import parse_qs
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from core.conversation import Intent
+from models.routing import RoutingSessionManager
+from services.availability import AvailabilityIndex, attach_unit_listeners
+from services.facility_registry import FacilityRecord
+from services.messaging import OutboundMessenger, TokenBucket
+from services.storage_service import StorageService
+from services.twilio_service import TwilioService
+from src.models.base import Base
+from src.models.facility import Facility  # noqa: F401 - registers the mapper
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.rollup import OccupancyDailyRollup
+
+class FakeTwilioApi:
+    """Records Messages.json requests and replays scripted status codes"""
+    
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 201
+        if isinstance(status, Exception):
+            raise status
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(status, json={"sid": f"SM{len(self.requests)}"})
+    
+    def bodies(self):
+        return [parse_qs(request.content.decode())["Body"][0] for request in self.requests]
+
+def make_messenger(api, **kwargs):
+    options = dict(workers=2, rate_per_second=1000.0, backoff_base=0.001)
+    options.update(kwargs)
+    return OutboundMessenger(
+        "AC123", "token", "+15550100000",
+        base_url="http://twilio.test",
+        transport=httpx.MockTransport(api),
+        **options
+    )
+
+async def send_all(messenger, count):
+    messenger.start()
+    for i in range(count):
+        assert messenger.enqueue("+15550100123", f"message {i}")
+    await messenger.stop()
+
+def test_messages_are_sent_through_shared_client():
+    """Test queued messages reach the Messages endpoint with account auth"""
+    api = FakeTwilioApi()
+    messenger = make_messenger(api)
+    asyncio.run(send_all(messenger, 3))
+    
+    assert sorted(api.bodies()) == ["message 0", "message 1", "message 2"]
+    request = api.requests[0]
+    assert request.url.path == "/2010-04-01/Accounts/AC123/Messages.json"
+    assert request.headers["Authorization"].startswith("Basic ")
+    assert messenger.stats()["sent"] == 3
+
+def test_throttled_and_server_errors_are_retried():
+    """Test 429 and 5xx responses retry while other 4xx fail immediately"""
+    api = FakeTwilioApi([429, 503, 201, 400])
+    messenger = make_messenger(api, workers=1)
+    asyncio.run(send_all(messenger, 2))
+    
+    stats = messenger.stats()
+    assert (stats["sent"], stats["retried"], stats["failed"]) == (1, 2, 1)
+    assert len(api.requests) == 4
+
+def test_only_unsent_requests_are_retried_after_transport_errors():
+    """Test connect failures retry while a read timeout, which Twilio may have accepted, does not"""
+    api = FakeTwilioApi([httpx.ConnectError("refused"), httpx.ConnectTimeout("slow"), 201, httpx.ReadTimeout("late")])
+    messenger = make_messenger(api, workers=1)
+    asyncio.run(send_all(messenger, 2))
+    
+    stats = messenger.stats()
+    assert (stats["sent"], stats["retried"], stats["failed"]) == (1, 2, 1)
+    assert len(api.requests) == 4
+
+def test_gives_up_after_max_retries():
+    """Test a message is dropped as failed once retries run out"""
+    api = FakeTwilioApi([500] * 10)
+    messenger = make_messenger(api, workers=1, max_retries=2)
+    asyncio.run(send_all(messenger, 1))
+    assert len(api.requests) == 3 and messenger.failed == 1
+
+def test_token_bucket_limits_rate():
+    """Test the bucket allows a burst then refills at the configured rate"""
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0])
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    now[0] += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+def test_enqueue_rejected_when_stopped():
+    """Test callers learn a message was not queued"""
+    assert not make_messenger(FakeTwilioApi()).enqueue("+15550100123", "hello")
+
+FACILITY = FacilityRecord(
+    facility_id="downtown",
+    name="Downtown Storage",
+    address="1 Main St",
+    city="Springfield",
+    state="IL",
+    zip_code="62701",
+    phone="555-0123",
+    twilio_number="+15550100777"
+)
+
+def make_storage_service():
+    """Storage service over a database with two free 10x10 units and a taken 5x5"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Reservation.__table__, OccupancyDailyRollup.__table__])
+    with engine.begin() as connection:
+        # units.features is a PostgreSQL ARRAY, so create the table by hand
+        connection.execute(text(
+            "CREATE TABLE units (id INTEGER PRIMARY KEY, unit_id TEXT UNIQUE NOT NULL, size TEXT NOT NULL, "
+            "width_ft INTEGER, length_ft INTEGER, square_feet INTEGER NOT NULL, floor INTEGER NOT NULL, "
+            "price FLOAT NOT NULL, climate_controlled BOOLEAN, available BOOLEAN, features TEXT, "
+            "facility_id INTEGER NOT NULL)"
+        ))
+        connection.execute(text(
+            "INSERT INTO units (unit_id, size, square_feet, floor, price, climate_controlled, available, facility_id) "
+            "VALUES ('D101', '10x10', 100, 1, 149.99, 0, 1, 7), ('D102', '10x10', 100, 1, 169.99, 0, 1, 7), "
+            "('D103', '5x5', 25, 1, 49.99, 0, 0, 7)"
+        ))
+    return StorageService("7", "test_api_key", db=RoutingSessionManager(engine))
+
+def reservations(storage_service):
+    with storage_service.db.reader() as session:
+        return [(record.unit.unit_id, record.status) for record in session.query(Reservation)]
+
+def run_turns(api, turns, facility=FACILITY, intent=None, storage_service=None):
+    """Play caller turns through a TwilioService, starting from ``intent``"""
+    availability = AvailabilityIndex()
+    attach_unit_listeners(availability)
+    
+    async def run():
+        messenger = make_messenger(api)
+        messenger.start()
+        service = TwilioService(
+            "AC123", "token", "+15550100000",
+            facility_id="test_facility", facility=facility, messenger=messenger,
+            storage_service=storage_service, availability=availability
+        )
+        if intent is not None:
+            service.conversation_engine.get_or_create_context("CA1").update_intent(intent)
+        responses = [service.process_speech(speech, "CA1", caller="+15550100123") for speech in turns]
+        await messenger.stop()
+        return responses
+    
+    return asyncio.run(run())
+
+def test_caller_can_ask_for_directions_by_text():
+    """Test the location follow-up queues an SMS with the address"""
+    api = FakeTwilioApi()
+    responses = run_turns(api, ["please text them to me"], intent=Intent.LOCATION)
+    assert "texted the directions" in responses[-1]
+    assert api.bodies() == [
+        "Downtown Storage: 1 Main St, Springfield, IL 62701. "
+        "Directions: https://maps.google.com/?q=1+Main+St%2C+Springfield%2C+IL+62701"
+    ]
+    assert parse_qs(api.requests[0].content.decode())["From"] == ["+15550100777"]
+
+def test_directions_are_read_without_a_facility():
+    """Test no placeholder address is texted when the facility is unknown"""
+    api = FakeTwilioApi()
+    responses = run_turns(api, ["can you text me"], facility=None, intent=Intent.LOCATION)
+    assert "Storage Lane" in responses[-1] and "texted" not in responses[-1]
+    assert api.requests == []
+
+def test_accepting_a_reservation_texts_the_confirmation():
+    """Test saying yes to an offered unit holds it in the database and texts it"""
+    api = FakeTwilioApi()
+    storage_service = make_storage_service()
+    responses = run_turns(
+        api, ["do you have a 10x10", "yes please", "yes", "do you have a 10x10"], storage_service=storage_service
+    )
+    assert "Yes, we have 2 10x10 units available" in responses[0]
+    assert "reserved unit D101" in responses[1] and "texted you the confirmation" in responses[1]
+    # The offer was used up, so a later "yes" books nothing more
+    assert "reserved" not in responses[2]
+    assert "Yes, we have 1 10x10 unit available, starting at $169.99" in responses[3]
+    assert reservations(storage_service) == [("D101", ReservationStatus.PENDING)]
+    assert storage_service.check_unit_availability("D101") is False
+    [body] = api.bodies()
+    assert body.startswith("Downtown Storage: reservation R")
+    assert "for unit D101" in body and "Total $149.99 for 1 month." in body
+    form = parse_qs(api.requests[0].content.decode())
+    assert (form["To"], form["From"]) == (["+15550100123"], ["+15550100777"])
+
+def test_only_a_direct_yes_to_an_offer_reserves():
+    """Test other replies, and yes to anything but a unit offer, book nothing"""
+    api = FakeTwilioApi()
+    storage_service = make_storage_service()
+    run_turns(api, ["do you have a ten by ten", "hold on a second", "sure"], storage_service=storage_service)
+    # 5x5 units are all taken, so the answer offers other sizes rather than a unit
+    responses = run_turns(api, ["do you have a 5x5", "yes"], storage_service=storage_service)
+    assert "We don't have any 5x5 units available" in responses[0]
+    assert "reserved" not in responses[1]
+    assert reservations(storage_service) == []
+    assert api.requests == []
+
+def test_reservation_confirmation_without_messenger():
+    """Test the confirmation is not claimed as sent when SMS is unavailable"""
+    service = TwilioService("AC123", "token", "+15550100000", facility=FACILITY)
+    reservation = service.storage_service.create_reservation("B202", "+15550100123", datetime(2026, 11, 1), 2)
+    assert not service.send_reservation_confirmation("+15550100123", reservation)
+    
+    service = TwilioService(
+        "AC123", "token", "+15550100000", facility=FACILITY,
+        storage_service=make_storage_service(), availability=AvailabilityIndex()
+    )
+    service.process_speech("is a 10x10 available", "CA1", caller="+15550100123")
+    response = service.process_speech("yes", "CA1", caller="+15550100123")
+    assert "reservation number is R" in response
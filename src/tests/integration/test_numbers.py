@@ -0,0 +1,61 @@
+import pytest
+
+from core.entities import EntityExtractor
+from core.numbers import normalize_numbers
+
+@pytest.mark.parametrize("text,expected", [
+    ("a ten by ten", "a 10 by 10"),
+    ("twenty-five by thirty", "25 by 30"),
+    ("twenty five feet", "25 feet"),
+    ("one hundred and fifty square feet", "150 square feet"),
+    ("a hundred dollars", "100 dollars"),
+    ("two thousand twenty six", "2026"),
+    ("the third of march", "the 3rd of march"),
+    ("move in march third", "move in march 3rd"),
+    ("the twenty first", "the 21st"),
+    ("six two seven oh one", "62701"),
+    ("six and a half months", "6.5 months"),
+    ("6 and a half weeks", "6.5 weeks"),
+    ("a year and a half", "1.5 year"),
+    ("for a month", "for 1 month"),
+    ("one month", "1 month"),
+    ("ten by one", "10 by 1"),
+])
+def test_spoken_numbers_become_digits(text, expected):
+    """Test cardinals, ordinals, digit runs and halves are rewritten"""
+    assert normalize_numbers(text) == expected
+
+@pytest.mark.parametrize("text", [
+    "what are your hours",
+    "oh okay, a unit please",
+    "I need a 10x10 near 62701",
+    "the one near the highway",
+    "wait a second",
+    "the third one on the left",
+])
+def test_text_without_spoken_numbers_is_unchanged(text):
+    """Test other words, a lone "oh", "one" or ordinal and existing digits pass through"""
+    assert normalize_numbers(text) == text.lower()
+
+def test_adjacent_numbers_stay_separate():
+    """Test two numbers in a row are not summed into one"""
+    assert normalize_numbers("five five") == "5 5"
+    assert normalize_numbers("ten twenty") == "10 20"
+
+def test_extraction_reads_spoken_numbers():
+    """Test spoken sizes, durations and ZIP codes reach the extractor as digits"""
+    entities = EntityExtractor().extract_all("I need a ten by fifteen for six months near six two seven oh one")
+    assert (entities["unit_size"].width, entities["unit_size"].length) == (10, 15)
+    assert (entities["duration"].amount, entities["duration"].unit) == (6, "month")
+    assert entities["zip_code"].value == "62701"
+
+def test_fractional_durations_round_up():
+    """Test part of a billing period counts as a whole one"""
+    extractor = EntityExtractor()
+    assert extractor.extract_all("six and a half months")["duration"].value == "7 months"
+    assert extractor.extract_all("a year and a half")["duration"].value == "18 months"
+
+def test_extraction_reads_a_counted_a():
+    """Test "a month" is a one month duration"""
+    duration = EntityExtractor().extract_all("I need it for a month")["duration"]
+    assert (duration.amount, duration.unit) == (1, "month")
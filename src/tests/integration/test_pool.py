@@ -0,0 +1,68 @@
+import logging
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from models.pool import InstrumentedQueuePool, PoolConfig, engine_options
+
+def make_engine(tmp_path, **config):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    return create_engine(url, **engine_options(url, PoolConfig(**config)))
+
+def test_checkout_waits_and_timeouts_are_recorded(tmp_path):
+    """Test an exhausted pool records the wait and the timeout"""
+    engine = make_engine(tmp_path, size=1, max_overflow=0, timeout=0.05)
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    
+    held = engine.connect()
+    held.execute(text("SELECT 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    
+    stats = engine.pool.status_snapshot()
+    assert stats["checked_out"] == 1
+    assert (stats["checkouts"], stats["timeouts"], stats["connects"]) == (1, 1, 1)
+    assert stats["wait_max_ms"] >= 50
+    assert stats["wait_histogram"]["le_50ms"] + stats["wait_histogram"]["le_100ms"] >= 1
+    held.close()
+
+def test_waiter_gets_released_connection(tmp_path):
+    """Test a blocked checkout succeeds once a connection is returned"""
+    engine = make_engine(tmp_path, size=1, max_overflow=0, timeout=5)
+    held = engine.connect()
+    threading.Timer(0.05, held.close).start()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    
+    stats = engine.pool.status_snapshot()
+    assert stats["timeouts"] == 0 and stats["checkouts"] == 2
+    assert stats["wait_max_ms"] >= 25
+
+def test_stats_survive_dispose(tmp_path):
+    """Test recreating the pool keeps counting into the same stats"""
+    engine = make_engine(tmp_path)
+    engine.connect().close()
+    engine.dispose()
+    engine.connect().close()
+    assert engine.pool.stats.checkouts == 2
+
+def test_transaction_pooling_disables_statement_caches():
+    """Test drivers that prepare statements get caching turned off"""
+    config = PoolConfig(transaction_pooling=True)
+    asyncpg = engine_options("postgresql+asyncpg://u:p@pgbouncer/db", config)
+    assert asyncpg["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    psycopg = engine_options("postgresql+psycopg://u:p@pgbouncer/db", config)
+    assert psycopg["connect_args"] == {"prepare_threshold": None}
+    assert "connect_args" not in engine_options("postgresql+asyncpg://u:p@db/db", PoolConfig())
+
+def test_transaction_pooling_reports_drivers_without_options(caplog):
+    """Test psycopg2 needs no options and unknown drivers are warned about"""
+    config = PoolConfig(transaction_pooling=True)
+    with caplog.at_level(logging.INFO, logger="storage_agent"):
+        assert "connect_args" not in engine_options("postgresql+psycopg2://u:p@pgbouncer/db", config)
+        assert "connect_args" not in engine_options("mysql+pymysql://u:p@proxy/db", config)
+    assert [(record.levelno, "psycopg2" in record.message) for record in caplog.records] == [
+        (logging.INFO, True), (logging.WARNING, False)
+    ]
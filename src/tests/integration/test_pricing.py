@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import numpy as np
+
+from services.pricing import PriceBook, PricingPolicy, compute_rates
+
+FLAT_SEASON = PricingPolicy(seasonality=(1.0,) * 12)
+
+def test_compute_rates_groups_and_occupancy():
+    """Test rates rise with occupancy and are grouped per unit type"""
+    rates = compute_rates(
+        facility_ids=np.array([1, 1, 1, 1, 2, 2]),
+        sizes=np.array(["10x10", "10x10", "10x10", "10x10", "10x10", "5x5"], dtype=object),
+        climate_controlled=np.array([False, False, False, False, False, True]),
+        prices=np.array([100.0, 100.0, 100.0, 100.0, 100.0, 50.0]),
+        available=np.array([False, False, False, False, True, True]),
+        policy=FLAT_SEASON,
+        at=datetime(2025, 1, 15)
+    )
+    full = rates[("1", "10x10", False)]
+    empty = rates[("2", "10x10", False)]
+    assert full.total_units == 4 and full.available_units == 0
+    assert full.rate > full.base_price > empty.rate
+    assert round(full.rate % 1, 2) == 0.99
+    assert ("2", "5x5", True) in rates
+
+def test_multipliers_are_clamped():
+    """Test the policy bounds the rate change"""
+    policy = PricingPolicy(occupancy_sensitivity=10.0, max_multiplier=1.1, seasonality=(1.0,) * 12)
+    rates = compute_rates(
+        np.array(["a"]), np.array(["10x10"], dtype=object), np.array([False]),
+        np.array([100.0]), np.array([False]), policy=policy
+    )
+    assert rates[("a", "10x10", False)].rate == 110.99
+
+def test_price_book_versions_and_lookup():
+    """Test published tables are versioned and read per facility"""
+    book = PriceBook()
+    rates = compute_rates(
+        np.array(["1", "1", "1"]),
+        np.array(["10x10", "5x5", "5x5"], dtype=object),
+        np.array([False, False, True]),
+        np.array([150.0, 50.0, 70.0]),
+        np.array([True, True, True]),
+        policy=FLAT_SEASON
+    )
+    table = book.publish(rates)
+    assert table.version == 1 and book.version == 1
+    assert [size for size, _ in table.sizes_for("1")] == ["5x5", "10x10"]
+    assert table.get("1", "5x5") < table.get("1", "5x5", climate_controlled=True)
+    assert table.get("1", "5x5") == table.get("1", "5x5", climate_controlled=False)
+    assert table.get("missing", "5x5") is None
+    assert book.publish({}).version == 2
@@ -0,0 +1,99 @@
+from src.core.conversation import ConversationEngine, Entity, Intent
+from src.services.availability import AvailabilityIndex
+from src.services.facility_registry import FacilityRegistry
+from src.services.recommendation import UnitRecommender
+from src.services.storage_service import StorageService, StorageUnit
+
+def make_unit(unit_id, size, price):
+    width, length = map(int, size.split('x'))
+    return StorageUnit(
+        unit_id=unit_id,
+        size=size,
+        square_feet=width * length,
+        price=price,
+        floor=1,
+        climate_controlled=False,
+        available=True,
+        features=[]
+    )
+
+def test_recommend_closest_square_footage():
+    """Test units are ranked by distance from the requested area"""
+    recommender = UnitRecommender([
+        make_unit("A", "5x5", 49.0),
+        make_unit("B", "10x10", 149.0),
+        make_unit("C", "10x15", 199.0),
+        make_unit("D", "10x20", 249.0),
+    ])
+    units = recommender.recommend(8, 12, limit=2)  # 96 sq ft
+    assert [unit.unit_id for unit in units] == ["B", "C"]
+
+def test_recommend_breaks_ties_on_fit_then_price():
+    """Test equal-area units are ranked by dimension fit and then price"""
+    recommender = UnitRecommender([
+        make_unit("wide", "5x20", 99.0),
+        make_unit("square", "10x10", 149.0),
+        make_unit("cheap", "10x10", 129.0),
+    ])
+    units = recommender.recommend(10, 10, limit=3)
+    assert [unit.unit_id for unit in units] == ["cheap", "square", "wide"]
+    assert recommender.recommend(10, 10, limit=0) == []
+    assert UnitRecommender([]).recommend(10, 10) == []
+
+def test_storage_service_recommendations():
+    """Test recommendations only include available inventory"""
+    service = StorageService(facility_id="test_facility", api_key="test_api_key")
+    units = service.recommend_units(10, 14, limit=3)
+    assert [unit.unit_id for unit in units] == ["B202", "A101"]
+
+def test_recommend_ties_return_cheapest_of_each_shape():
+    """Test a large tie group still yields the best fit and cheapest units"""
+    units = [make_unit(f"S{i}", "10x10", 100.0 + i) for i in range(500)]
+    units += [make_unit(f"W{i}", "5x20", 50.0 + i) for i in range(500)]
+    recommender = UnitRecommender(units)
+    assert len(recommender) == 1000
+    assert [unit.unit_id for unit in recommender.recommend(10, 10, limit=3)] == ["S0", "S1", "S2"]
+    assert [unit.unit_id for unit in recommender.recommend(5, 20, limit=2)] == ["W0", "W1"]
+
+def test_recommend_skips_unparseable_sizes():
+    """Test units with unparseable sizes are ranked with zero dimensions"""
+    recommender = UnitRecommender([
+        StorageUnit("odd", "large", 100, 99.0, 1, False, True, []),
+        make_unit("B", "10x10", 149.0),
+    ])
+    assert [unit.unit_id for unit in recommender.recommend(10, 10, limit=2)] == ["B", "odd"]
+
+def test_engine_recommends_closest_units_for_unavailable_size():
+    """Test the availability answer suggests recommended units that are in stock"""
+    service = StorageService(facility_id="test_facility", api_key="test_api_key")
+    availability = AvailabilityIndex()
+    availability.load(service.facility_id, service.get_all_units())
+    engine = ConversationEngine(
+        facility_id=service.facility_id, availability=availability, storage_service=service
+    )
+    response = engine.process_intent(
+        "call", Intent.AVAILABILITY, 0.9,
+        entities=[Entity(type="unit_size", value="10x15", confidence=1.0)]
+    )
+    assert "10x10 from $149.99 and 5x5 from $49.99" in response
+    assert service._recommender is not None
+
+    # Units the summary says were taken are not offered
+    availability.mark_unavailable(service.facility_id, "10x10", True, 149.99)
+    response = engine.process_intent(
+        "call", Intent.AVAILABILITY, 0.9,
+        entities=[Entity(type="unit_size", value="10x15", confidence=1.0)]
+    )
+    assert "closest sizes we have are 5x5 from $49.99 per month" in response
+
+def test_availability_changes_invalidate_recommender():
+    """Test an availability change drops the facility's cached recommender"""
+    availability = AvailabilityIndex()
+    registry = FacilityRegistry(default_facility_id="test_facility", availability=availability)
+    service = registry.storage_service_for(None)
+    service.recommend_units(10, 10)
+    assert service._recommender is not None
+    availability.load("other_facility", [])
+    assert service._recommender is not None
+    availability.load("test_facility", service.get_all_units())
+    assert service._recommender is None
@@ -0,0 +1,69 @@
+import json
+
+from src.core.conversation import Intent
+from src.services.twilio_service import dtmf_intent
+from tools.replay_transcripts import ReplayStats, chunked, main, read_records, replay
+
+RECORDS = [
+    {"call_sid": "CA1", "utterance": "Do you have a ten by ten available", "intent": "availability",
+     "entities": {"unit_size": "10x10"}},
+    {"call_sid": "CA1", "utterance": "how much for six months", "intent": "pricing",
+     "entities": {"duration": "6 months"}},
+    {"call_sid": "CA2", "utterance": "Option 3", "intent": "information", "entities": {}},
+    {"call_sid": "CA3", "utterance": "what are your hours"},
+]
+
+def test_chunks_keep_calls_together():
+    """Test a chunk runs past its size instead of splitting a call"""
+    records = [{"call_sid": sid} for sid in ["a", "a", "a", "b", "b", "c"]]
+    assert [[r["call_sid"] for r in chunk] for chunk in chunked(records, 2)] == [["a", "a", "a"], ["b", "b"], ["c"]]
+    # A call longer than twice the chunk size is still split
+    assert [len(chunk) for chunk in chunked([{"call_sid": "a"}] * 5, 2)] == [4, 1]
+
+def test_dtmf_intent():
+    """Test keypad options map to intents and speech does not"""
+    assert dtmf_intent("Option 1") == Intent.AVAILABILITY
+    assert dtmf_intent("Option 9") == Intent.UNKNOWN
+    assert dtmf_intent("option one") is None
+
+def test_replay_scores_labels():
+    """Test turns are scored against the labels they carry, without a classifier"""
+    results = []
+    stats = replay(RECORDS, on_results=results.extend)
+    summary = stats.summary()
+    
+    assert summary["turns"] == 4
+    # The entity rules get the first three; the hours question has no intent label
+    assert summary["intent_accuracy"] == 1.0
+    assert summary["intents"]["availability"] == {"support": 1, "precision": 1.0, "recall": 1.0}
+    assert summary["entities"]["unit_size"]["recall"] == 1.0
+    assert summary["entities"]["duration"]["recall"] == 1.0
+    assert [result["intent"] for result in results] == ["availability", "pricing", "information", "unknown"]
+    assert all(result["response"] for result in results)
+
+def test_stats_add_up_across_chunks():
+    """Test stats from separate chunks combine to the same totals"""
+    whole = replay(RECORDS)
+    parts = ReplayStats()
+    for chunk in chunked(RECORDS, 1):
+        parts.add(replay(chunk))
+    assert parts.summary() == whole.summary()
+
+def test_cli_reads_csv_and_uses_worker_processes(tmp_path, capsys):
+    """Test the CLI replays a CSV corpus across processes and writes per-turn results"""
+    corpus = tmp_path / "turns.csv"
+    lines = ["call_sid,utterance,intent,entities"]
+    for record in RECORDS[:3] * 5:
+        lines.append(",".join([
+            record["call_sid"], record["utterance"], record["intent"],
+            '"' + json.dumps(record["entities"]).replace('"', '""') + '"'
+        ]))
+    corpus.write_text("\n".join(lines) + "\n")
+    assert next(read_records(str(corpus)))["entities"] == {"unit_size": "10x10"}
+    
+    output = tmp_path / "results.jsonl"
+    summary = main([str(corpus), "--workers", "2", "--chunk-size", "4", "--no-classifier", "--output", str(output)])
+    assert summary["turns"] == 15
+    assert summary["intent_accuracy"] == 1.0
+    assert len(output.read_text().splitlines()) == 15
+    assert "replayed 15 turns" in capsys.readouterr().out
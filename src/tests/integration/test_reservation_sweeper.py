@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from services.availability import AvailabilityIndex
+from services.reservation_sweeper import expire_pending_reservations
+from src.models.base import Base
+from src.models.facility import Facility
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.rollup import OccupancyDailyRollup
+from src.models.unit import Unit
+
+# The sweeper relies on FOR UPDATE SKIP LOCKED and UPDATE ... RETURNING
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="needs TEST_DATABASE_URL (PostgreSQL)")
+
+@pytest.fixture
+def session():
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+def make_reservation(facility, unit, status, age_minutes, number):
+    return Reservation(
+        reservation_id=f"R{number}",
+        customer_phone="+15550100123",
+        start_date=datetime.utcnow(),
+        duration_months=1,
+        monthly_price=unit.price,
+        total_price=unit.price,
+        status=status,
+        created_at=datetime.utcnow() - timedelta(minutes=age_minutes),
+        unit=unit,
+        facility=facility
+    )
+
+def test_expires_stale_pending_and_releases_units(session):
+    """Test only stale PENDING rows are cancelled and only unheld units freed"""
+    facility = Facility(
+        name="Test", address="1 Main St", city="Austin", state="TX",
+        zip_code="78701", phone="5550100123", hours={}
+    )
+    units = [
+        Unit(unit_id=f"A{i}", size="10x10", square_feet=100, floor=1, price=100.0 + i,
+             available=False, facility=facility)
+        for i in range(3)
+    ]
+    session.add_all([
+        make_reservation(facility, units[0], ReservationStatus.PENDING, 120, 1),
+        make_reservation(facility, units[1], ReservationStatus.PENDING, 5, 2),
+        make_reservation(facility, units[2], ReservationStatus.PENDING, 120, 3),
+        make_reservation(facility, units[2], ReservationStatus.CONFIRMED, 120, 4),
+    ])
+    session.commit()
+    
+    index = AvailabilityIndex()
+    index.load(str(facility.id), units)
+    
+    assert expire_pending_reservations(session, hold_minutes=60, batch_size=1, availability=index) == 2
+    
+    statuses = dict(session.query(Reservation.reservation_id, Reservation.status))
+    assert statuses["R1"] == ReservationStatus.CANCELLED
+    assert statuses["R2"] == ReservationStatus.PENDING
+    assert statuses["R3"] == ReservationStatus.CANCELLED
+    session.expire_all()
+    assert [unit.available for unit in units] == [True, False, False]
+    assert index.get(str(facility.id), "10x10").available_units == 1
+    assert session.query(func.sum(OccupancyDailyRollup.cancellations)).scalar() == 2
@@ -0,0 +1,72 @@
+from core.conversation import ConversationEngine, Entity, Intent
+from core.response_cache import ResponseCache
+from services.availability import AvailabilityIndex
+from services.storage_service import StorageService
+
+def make_engine(cache):
+    service = StorageService(facility_id="test_facility", api_key="test_api_key")
+    availability = AvailabilityIndex()
+    availability.load(service.facility_id, service.get_all_units())
+    return ConversationEngine(
+        facility_id=service.facility_id,
+        availability=availability,
+        response_cache=cache
+    )
+
+def test_lru_eviction():
+    """Test the cache stays within its size bound"""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert len(cache) == 2 and (cache.hits, cache.misses) == (1, 1)
+
+def test_repeated_questions_hit_cache_across_sessions():
+    """Test identical questions from different callers share one response"""
+    cache = ResponseCache()
+    engine = make_engine(cache)
+    size = [Entity(type='unit_size', value='10x10', confidence=1.0)]
+    first = engine.process_intent("call-1", Intent.AVAILABILITY, 1.0, size)
+    second = engine.process_intent("call-2", Intent.AVAILABILITY, 1.0, size)
+    assert first == second
+    assert cache.hits == 1
+    
+    engine.process_intent("call-3", Intent.HOURS, 1.0)
+    assert len(cache) == 1  # Hours answers depend on the clock
+
+def test_inventory_change_invalidates():
+    """Test a unit being taken changes the cache key"""
+    cache = ResponseCache()
+    engine = make_engine(cache)
+    size = [Entity(type='unit_size', value='10x10', confidence=1.0)]
+    before = engine.process_intent("call-1", Intent.AVAILABILITY, 1.0, size)
+    engine.availability.mark_unavailable("test_facility", "10x10", True, 149.99)
+    after = engine.process_intent("call-2", Intent.AVAILABILITY, 1.0, size)
+    assert before != after
+    assert cache.hits == 0
+
+def test_other_facility_change_invalidates_location_answers():
+    """Test location answers are re-keyed when any facility's availability changes"""
+    cache = ResponseCache()
+    engine = make_engine(cache)
+    engine.availability.load("other_facility", [])
+    entities = [
+        Entity(type='zip_code', value='62701', confidence=1.0),
+        Entity(type='unit_size', value='10x10', confidence=1.0),
+    ]
+    engine.process_intent("call-1", Intent.LOCATION, 1.0, entities)
+    engine.process_intent("call-2", Intent.LOCATION, 1.0, entities)
+    assert cache.hits == 1
+
+    engine.availability.replace_unit("other_facility", None, ("10x10", False, 99.0, True))
+    engine.process_intent("call-3", Intent.LOCATION, 1.0, entities)
+    assert cache.hits == 1
+
+    # This facility's own answers are unaffected
+    size = [Entity(type='unit_size', value='10x10', confidence=1.0)]
+    engine.process_intent("call-4", Intent.AVAILABILITY, 1.0, size)
+    engine.availability.replace_unit("other_facility", None, ("5x5", False, 49.0, True))
+    engine.process_intent("call-5", Intent.AVAILABILITY, 1.0, size)
+    assert cache.hits == 2
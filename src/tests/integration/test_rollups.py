@@ -0,0 +1,137 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import Base
+from src.models.facility import Facility
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.rollup import OccupancyDailyRollup
+from src.services.rollups import (
+    ReservationState, attach_rollup_listeners, collect_deltas, occupancy_series, rebuild_rollups, revenue_summary
+)
+
+TODAY = date(2026, 10, 19)
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    tables = [Facility.__table__, Reservation.__table__, OccupancyDailyRollup.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as connection:
+        # units.features is a PostgreSQL ARRAY, so create the columns the rollups read by hand
+        connection.execute(text("CREATE TABLE units (id INTEGER PRIMARY KEY, size TEXT, facility_id INTEGER)"))
+        connection.execute(text("INSERT INTO units VALUES (1, '10x10', 7), (2, '10x10', 7), (3, '5x5', 7)"))
+    attach_rollup_listeners()
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def make_reservation(number, unit_id, status=ReservationStatus.PENDING, start=datetime(2026, 10, 1), months=6):
+    return Reservation(
+        reservation_id=f"R{number}",
+        customer_phone="+15550100123",
+        start_date=start,
+        duration_months=months,
+        monthly_price=100.0,
+        total_price=100.0 * months,
+        status=status,
+        created_at=datetime(2026, 9, 20),
+        unit_id=unit_id,
+        facility_id=7
+    )
+
+def test_cancelling_a_confirmed_rental_takes_back_its_move_in():
+    """Test a status change contributes the difference between old and new states"""
+    confirmed = ReservationState.current(make_reservation(1, 1, status=ReservationStatus.CONFIRMED))
+    cancelled = confirmed._replace(status=ReservationStatus.CANCELLED, updated_at=datetime(2026, 10, 19, 15, 30))
+    deltas = collect_deltas([(confirmed, cancelled)], {1: "10x10"}, TODAY)
+    assert deltas == {
+        (7, "10x10", date(2026, 10, 1)): {
+            "new_reservations": 0, "move_ins": -1, "move_outs": 0,
+            "cancellations": 0, "mrr_delta": -100.0, "booked_revenue": -600.0,
+        },
+        (7, "10x10", TODAY): {
+            "new_reservations": 0, "move_ins": 0, "move_outs": 0,
+            "cancellations": 1, "mrr_delta": 0, "booked_revenue": 0,
+        },
+    }
+
+def test_flushed_status_changes_update_rollups(session):
+    """Test inserts and status changes made through the ORM maintain the rollups"""
+    first = make_reservation(1, 1)
+    second = make_reservation(2, 2, status=ReservationStatus.CONFIRMED, start=datetime(2026, 10, 5))
+    third = make_reservation(3, 3, status=ReservationStatus.CONFIRMED, months=1)
+    session.add_all([first, second, third])
+    session.commit()
+    
+    first.status = ReservationStatus.CONFIRMED
+    third.end_date = datetime(2026, 10, 31)
+    third.status = ReservationStatus.COMPLETED
+    session.commit()
+    
+    series = occupancy_series(session, 7, date(2026, 10, 1), date(2026, 10, 31), size="10x10")
+    assert series["total_units"] == 2
+    days = {day["day"]: day for day in series["days"]}
+    assert len(days) == 31
+    assert days["2026-10-01"]["occupied_units"] == 1
+    assert days["2026-10-05"]["occupied_units"] == 2
+    assert days["2026-10-05"]["occupancy_rate"] == 1.0
+    assert days["2026-10-31"]["monthly_recurring_revenue"] == 200.0
+    
+    summary = revenue_summary(session, 7, date(2026, 10, 1), date(2026, 10, 31))
+    by_size = {row["size"]: row for row in summary["sizes"]}
+    assert by_size["5x5"]["move_ins"] == by_size["5x5"]["move_outs"] == 1
+    assert by_size["5x5"]["monthly_recurring_revenue"] == 0.0
+    assert summary["totals"]["booked_revenue"] == 1300.0
+    assert summary["totals"]["monthly_recurring_revenue"] == 200.0
+
+def test_rolled_back_change_leaves_rollups_alone(session):
+    """Test rollup writes share the reservation change's transaction"""
+    session.add(make_reservation(1, 1))
+    session.flush()
+    session.rollback()
+    assert session.query(OccupancyDailyRollup).count() == 0
+
+def rollup_rows(session):
+    rows = session.execute(text(
+        "SELECT facility_id, size, day, new_reservations, move_ins, move_outs, cancellations, mrr_delta, booked_revenue "
+        "FROM occupancy_daily_rollups"
+    )).all()
+    # The incremental path leaves all-zero rows behind where events moved away
+    return {(facility_id, size, str(day)): counters for facility_id, size, day, *counters in rows if any(counters)}
+
+def test_incremental_rollups_match_a_rebuild(session):
+    """Test edits to every rollup input keep the rollups equal to a rebuild"""
+    first = make_reservation(1, 1)
+    second = make_reservation(2, 2, status=ReservationStatus.CONFIRMED)
+    third = make_reservation(3, 1, status=ReservationStatus.CONFIRMED, start=datetime(2026, 10, 10))
+    fourth = make_reservation(4, 2)
+    session.add_all([first, second, third, fourth])
+    session.commit()
+
+    first.status = ReservationStatus.CONFIRMED
+    second.start_date = datetime(2026, 10, 12)
+    second.monthly_price = 80.0
+    second.total_price = 480.0
+    third.unit_id = 3
+    session.commit()
+
+    first.status = ReservationStatus.CANCELLED
+    second.end_date = datetime(2026, 11, 30)
+    second.status = ReservationStatus.COMPLETED
+    session.commit()
+
+    # Editing a cancelled reservation moves its cancellation to the new updated_at
+    first.updated_at = datetime(2026, 10, 25, 9, 0)
+    first.start_date = datetime(2026, 10, 3)
+    third.end_date = datetime(2026, 10, 20)
+    third.status = ReservationStatus.COMPLETED
+    session.delete(fourth)
+    session.commit()
+
+    incremental = rollup_rows(session)
+    assert incremental
+    rebuild_rollups(session)
+    assert rollup_rows(session) == incremental
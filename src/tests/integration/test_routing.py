@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+
+from models.routing import ReadYourWrites, RoutingSessionManager
+
+def make_router(tmp_path, replicas=2, **kwargs):
+    """Primary and replicas are separate engines on the same database file"""
+    url = f"sqlite:///{tmp_path / 'routing.db'}"
+    primary = create_engine(url)
+    with primary.begin() as connection:
+        connection.execute(text("CREATE TABLE units (id TEXT PRIMARY KEY)"))
+    return RoutingSessionManager.from_urls(primary, [url] * replicas, **kwargs)
+
+def test_reads_round_robin_over_replicas(tmp_path):
+    """Test readers alternate between replicas and see the primary's data"""
+    router = make_router(tmp_path, read_your_writes_seconds=0)
+    with router.writer() as session:
+        session.execute(text("INSERT INTO units VALUES ('A101')"))
+    
+    used = []
+    for _ in range(4):
+        with router.reader() as session:
+            used.append(session.info['replica'])
+            assert session.execute(text("SELECT id FROM units")).scalar() == "A101"
+    assert used == ["replica-1", "replica-2", "replica-1", "replica-2"]
+
+def test_read_your_writes_sticks_to_primary(tmp_path):
+    """Test reads after the same flow's write, or asked to be consistent, use the primary"""
+    router = make_router(tmp_path, read_your_writes_seconds=60)
+    with router.reader() as session:
+        assert 'replica' in session.info
+    with router.reader(consistent=True) as session:
+        assert 'replica' not in session.info
+    
+    writes = ReadYourWrites()
+    with router.writer(writes) as session:
+        session.execute(text("INSERT INTO units VALUES ('B202')"))
+    with router.reader(after=writes) as session:
+        assert 'replica' not in session.info
+    # Other flows keep reading from replicas
+    with router.reader() as session:
+        assert 'replica' in session.info
+    with router.reader(after=ReadYourWrites()) as session:
+        assert 'replica' in session.info
+
+def test_write_in_worker_thread_reaches_later_reads(tmp_path):
+    """Test a commit made via asyncio.to_thread still routes the flow's reads to the primary"""
+    router = make_router(tmp_path, read_your_writes_seconds=60)
+    writes = ReadYourWrites()
+    
+    def write():
+        with router.writer(writes) as session:
+            session.execute(text("INSERT INTO units VALUES ('C303')"))
+    
+    async def write_then_read():
+        await asyncio.to_thread(write)
+        with router.reader(after=writes) as session:
+            return session.info.get('replica')
+    
+    assert asyncio.run(write_then_read()) is None
+
+def test_only_changed_rows_open_the_window(tmp_path):
+    """Test background, failed and no-op writes leave reads on the replicas"""
+    router = make_router(tmp_path, read_your_writes_seconds=60)
+    with router.writer() as session:
+        session.execute(text("INSERT INTO units VALUES ('C303')"))
+    with router.reader() as session:
+        assert 'replica' in session.info
+    
+    writes = ReadYourWrites()
+    with pytest.raises(IntegrityError):
+        with router.writer(writes) as session:
+            session.execute(text("INSERT INTO units VALUES ('C303')"))
+    with router.writer(writes) as session:
+        session.execute(text("UPDATE units SET id = 'D404' WHERE id = 'missing'"))
+    assert not writes.pending
+    with router.reader(after=writes) as session:
+        assert 'replica' in session.info
+
+def test_unreachable_replica_is_skipped(tmp_path):
+    """Test a replica that refuses connections is marked down and reads fail over"""
+    url = f"sqlite:///{tmp_path / 'routing.db'}"
+    dead = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = RoutingSessionManager(
+        create_engine(url), [dead, create_engine(url)], retry_seconds=60, read_your_writes_seconds=0
+    )
+    
+    for _ in range(3):
+        with router.reader() as session:
+            assert session.info['replica'] == "replica-2"
+    assert router.healthy_replicas == ["replica-2"]
+    assert router.check_health() == ["replica-2"]
+    
+    router = RoutingSessionManager(create_engine(url), [dead])
+    with router.reader() as session:
+        assert 'replica' not in session.info
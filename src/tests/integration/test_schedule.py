@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from core.schedule import WeeklySchedule, open_facilities
+
+HOURS = {
+    "monday": {"open": "09:00", "close": "18:00"},
+    "tuesday": {"open": "09:00", "close": "18:00"},
+    "wednesday": {"open": "09:00", "close": "18:00"},
+    "thursday": {"open": "09:00", "close": "18:00"},
+    "friday": {"open": "22:00", "close": "02:00"},
+    "saturday": {"open": "10:00", "close": "16:00"},
+    "holidays": {"2025-02-10": None},
+}
+
+def test_is_open_regular_hours():
+    """Test open/closed checks against regular weekly hours"""
+    schedule = WeeklySchedule.compile(HOURS)
+    assert schedule.is_open(datetime(2025, 2, 4, 9, 0))  # Tuesday
+    assert schedule.is_open(datetime(2025, 2, 4, 18, 0))  # Close minute is inclusive
+    assert not schedule.is_open(datetime(2025, 2, 4, 18, 1))
+    assert not schedule.is_open(datetime(2025, 2, 9, 12, 0))  # Sunday has no hours
+
+def test_overnight_and_holiday_hours():
+    """Test overnight hours spill into the next day and holidays override"""
+    schedule = WeeklySchedule.compile(HOURS)
+    assert schedule.is_open(datetime(2025, 2, 7, 23, 30))  # Friday night
+    assert schedule.is_open(datetime(2025, 2, 8, 1, 30))  # Saturday early morning
+    assert not schedule.is_open(datetime(2025, 2, 8, 3, 0))
+    assert not schedule.is_open(datetime(2025, 2, 10, 10, 0))  # Holiday Monday
+
+def test_holiday_hours_run_past_midnight():
+    """Test a holiday's overnight hours carry into the next morning"""
+    schedule = WeeklySchedule.compile({**HOURS, "holidays": {"2025-02-05": {"open": "20:00", "close": "03:00"}}})
+    assert not schedule.is_open(datetime(2025, 2, 5, 12, 0))  # Holiday Wednesday
+    assert schedule.is_open(datetime(2025, 2, 5, 23, 30))
+    assert schedule.is_open(datetime(2025, 2, 6, 2, 30))  # Thursday early morning
+    assert not schedule.is_open(datetime(2025, 2, 6, 3, 30))
+
+def test_closed_holiday_drops_its_overnight_hours():
+    """Test a closed holiday doesn't open the next morning, but the night before still carries in"""
+    schedule = WeeklySchedule.compile({**HOURS, "holidays": {"2025-02-07": None, "2025-02-15": None}})
+    assert not schedule.is_open(datetime(2025, 2, 7, 23, 30))  # Holiday Friday
+    assert not schedule.is_open(datetime(2025, 2, 8, 1, 30))  # Saturday after it
+    assert schedule.is_open(datetime(2025, 2, 8, 12, 0))
+    assert schedule.is_open(datetime(2025, 2, 15, 1, 30))  # Holiday Saturday, Friday night still open
+    assert not schedule.is_open(datetime(2025, 2, 15, 12, 0))
+    assert schedule.next_open(datetime(2025, 2, 7, 12, 0)) == datetime(2025, 2, 8, 10, 0)
+
+def test_next_open():
+    """Test finding the next opening time"""
+    schedule = WeeklySchedule.compile(HOURS)
+    # Saturday evening -> skips Sunday and the Monday holiday
+    assert schedule.next_open(datetime(2025, 2, 8, 17, 0)) == datetime(2025, 2, 11, 9, 0)
+    # Already open returns the reference time
+    now = datetime(2025, 2, 4, 12, 0)
+    assert schedule.next_open(now) == now
+    assert WeeklySchedule.compile({}).next_open(now) is None
+
+def test_describe_and_bulk_lookup():
+    """Test spoken description and bulk open-now lookup"""
+    schedule = WeeklySchedule.compile(HOURS)
+    assert "Monday through Thursday from 9 AM to 6 PM" in schedule.describe()
+    schedules = {1: schedule, 2: WeeklySchedule.compile({})}
+    assert open_facilities(schedules, datetime(2025, 2, 4, 12, 0)) == [1]
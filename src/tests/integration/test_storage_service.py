@@ -1,7 +1,11 @@
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
 
+from models.routing import RoutingSessionManager
 from services.storage_service import StorageService, StorageUnit, Reservation
+from src.models.facility import Facility  # noqa: F401 - registers the mapper
+from src.models.reservation import Reservation as ReservationModel  # noqa: F401 - registers the mapper
 
 @pytest.fixture
 def storage_service():
@@ -113,3 +117,31 @@ def test_pricing_tiers(storage_service):
     # Verify larger units cost more
     unit_prices = {unit.size: unit.price for unit in units}
     assert unit_prices["5x5"] < unit_prices["10x10"]  # Smaller units should cost less
+
+@pytest.fixture
+def db():
+    """Session manager over a units table with two facilities' units"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # units.features is a PostgreSQL ARRAY, so create the table by hand
+        connection.execute(text(
+            "CREATE TABLE units (id INTEGER PRIMARY KEY, unit_id TEXT UNIQUE NOT NULL, size TEXT NOT NULL, "
+            "width_ft INTEGER, length_ft INTEGER, square_feet INTEGER NOT NULL, floor INTEGER NOT NULL, "
+            "price FLOAT NOT NULL, climate_controlled BOOLEAN, available BOOLEAN, features TEXT, "
+            "facility_id INTEGER NOT NULL)"
+        ))
+        connection.execute(text(
+            "INSERT INTO units (unit_id, size, square_feet, floor, price, climate_controlled, available, facility_id) "
+            "VALUES ('D101', '10x10', 100, 1, 120.0, 0, 1, 7), ('D102', '10x10', 100, 1, 110.0, 0, 0, 7), "
+            "('D103', '5x5', 25, 1, 45.0, 1, 1, 7), ('E101', '10x10', 100, 1, 99.0, 0, 1, 8)"
+        ))
+    return RoutingSessionManager(engine)
+
+def test_units_come_from_the_database(db):
+    """Test a service with a database reads only its facility's units"""
+    service = StorageService(facility_id="7", api_key="test_api_key", db=db)
+    assert sorted(unit.unit_id for unit in service.get_all_units()) == ["D101", "D102", "D103"]
+    assert [unit.unit_id for unit in service.get_available_units("10x10")] == ["D101"]
+    assert service.get_unit_price("D103") == 45.0
+    assert service.check_unit_availability("D102") is False
+    assert service.get_unit_price("E101") is None
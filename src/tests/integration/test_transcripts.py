@@ -0,0 +1,69 @@
+import asyncio
+
+from services.transcripts import TranscriptTurn, TranscriptWriter
+
+def make_turn(i):
+    return TranscriptTurn(
+        call_sid=f"CA{i}", facility_id="f1", turn=1, utterance="10x10 please",
+        intent="availability", entities={"unit_size": "10x10"}, response="We have...",
+        extract_ms=0.1, intent_ms=0.01, respond_ms=0.5, render_ms=0.2
+    )
+
+def test_batches_on_size_and_drains_on_stop():
+    """Test full batches are written as one call and leftovers flush on stop"""
+    batches = []
+    
+    async def run():
+        writer = TranscriptWriter(batch_size=10, flush_interval=60)
+        writer.start(lambda batch: batches.append(len(batch)))
+        for i in range(25):
+            writer.record(make_turn(i))
+        await asyncio.sleep(0.1)
+        await writer.stop()
+        return writer
+    
+    writer = asyncio.run(run())
+    assert batches == [10, 10, 5]
+    assert writer.stats() == {"pending": 0, "written": 25, "dropped": 0, "failed": 0}
+
+def test_partial_batch_flushes_after_interval():
+    """Test a quiet period still gets turns written"""
+    batches = []
+    
+    async def run():
+        writer = TranscriptWriter(batch_size=100, flush_interval=0.05)
+        writer.start(lambda batch: batches.append(len(batch)))
+        writer.record(make_turn(1))
+        await asyncio.sleep(0.2)
+        assert batches == [1]
+        await writer.stop()
+    
+    asyncio.run(run())
+
+def test_drops_instead_of_blocking_when_backlogged():
+    """Test a full buffer drops new turns and counts them"""
+    async def run():
+        writer = TranscriptWriter(max_pending=5, batch_size=5)
+        writer.start(lambda batch: None)
+        for i in range(8):
+            writer.record(make_turn(i))
+        assert writer.dropped == 3
+        await writer.stop()
+        return writer
+    
+    assert asyncio.run(run()).written == 5
+
+def test_failed_writes_are_counted():
+    """Test a failing sink is recorded rather than crashing the writer"""
+    def sink(batch):
+        raise RuntimeError("database down")
+    
+    async def run():
+        writer = TranscriptWriter(batch_size=2)
+        writer.start(sink)
+        for i in range(4):
+            writer.record(make_turn(i))
+        await writer.stop()
+        return writer
+    
+    assert asyncio.run(run()).failed == 4
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.routes.voice import get_twilio_service
+from src.services.webhook_dedup import WebhookDedupCache, get_webhook_dedup_cache, webhook_key
+
+FORM = {"CallSid": "CA1", "SpeechResult": "a ten by ten", "Confidence": "0.91"}
+
+def test_key_prefers_idempotency_token():
+    """Test retries share a key and different turns do not"""
+    assert webhook_key("CA1", FORM) == webhook_key("CA1", dict(reversed(list(FORM.items()))))
+    assert webhook_key("CA1", FORM) != webhook_key("CA1", {**FORM, "SpeechResult": "pricing"})
+    assert webhook_key("CA1", FORM, "token-1") == ("CA1", "token-1")
+    assert webhook_key("CA1", FORM, "token-1") != webhook_key("CA1", FORM, "token-2")
+
+def test_duplicates_replay_the_first_response():
+    """Test a retry returns the cached response without rendering again"""
+    cache = WebhookDedupCache()
+    calls = []
+    
+    def render():
+        calls.append(1)
+        return f"<Response>{len(calls)}</Response>"
+    
+    async def run():
+        first = await cache.respond("k", render)
+        second = await cache.respond("k", render)
+        return first, second
+    
+    assert asyncio.run(run()) == (("<Response>1</Response>", False), ("<Response>1</Response>", True))
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+def test_concurrent_duplicates_coalesce():
+    """Test duplicates arriving mid-render wait for the original instead of rendering"""
+    cache = WebhookDedupCache()
+    calls = []
+    
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "<Response/>"
+    
+    async def run():
+        return await asyncio.gather(*(cache.respond("k", render) for _ in range(5)))
+    
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sorted(duplicate for _, duplicate in results) == [False, True, True, True, True]
+    assert cache.stats()["coalesced"] == 4
+
+def test_failures_are_not_cached():
+    """Test a failed render reaches waiting duplicates and the next retry runs again"""
+    cache = WebhookDedupCache()
+    attempts = []
+    
+    async def render():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("database down")
+        return "<Response/>"
+    
+    async def run():
+        first = await asyncio.gather(cache.respond("k", render), cache.respond("k", render), return_exceptions=True)
+        return first, await cache.respond("k", render)
+    
+    first, retry = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert retry == ("<Response/>", False)
+    assert len(attempts) == 2
+
+def test_entries_expire_and_stay_bounded(monkeypatch):
+    """Test responses are forgotten after the TTL and the oldest go first when full"""
+    now = [100.0]
+    monkeypatch.setattr("src.services.webhook_dedup.monotonic", lambda: now[0])
+    cache = WebhookDedupCache(ttl_seconds=10, max_entries=2)
+    
+    async def run():
+        for key in ("a", "b", "c"):
+            await cache.respond(key, lambda: key)
+        assert len(cache) == 2
+        assert (await cache.respond("a", lambda: "a2")) == ("a2", False)
+        now[0] += 11
+        return await cache.respond("c", lambda: "c2")
+    
+    assert asyncio.run(run()) == ("c2", False)
+
+class CountingService:
+    def __init__(self):
+        self.turns = 0
+    
+    def process_speech(self, speech_result, call_sid=None, caller=None):
+        self.turns += 1
+        return f"<Response><Say>turn {self.turns}</Say></Response>"
+    
+    def handle_error(self, error):
+        return "<Response/>"
+
+@pytest.fixture
+def counting_client():
+    service = CountingService()
+    app.dependency_overrides[get_twilio_service] = lambda: service
+    get_webhook_dedup_cache().clear()
+    yield TestClient(app), service
+    app.dependency_overrides.pop(get_twilio_service)
+
+def test_retried_webhook_is_processed_once(counting_client):
+    """Test Twilio retrying /voice/process does not advance the conversation"""
+    client, service = counting_client
+    headers = {"I-Twilio-Idempotency-Token": "retry-test-1"}
+    first = client.post("/voice/process", data=FORM, headers=headers)
+    retry = client.post("/voice/process", data=FORM, headers=headers)
+    assert first.text == retry.text == "<Response><Say>turn 1</Say></Response>"
+    assert service.turns == 1
+    
+    # The caller's next turn is a new request
+    client.post("/voice/process", data=FORM, headers={"I-Twilio-Idempotency-Token": "retry-test-2"})
+    assert service.turns == 2
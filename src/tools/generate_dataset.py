@@ -0,0 +1,461 @@
+"""Stream a synthetic, production-scale dataset into PostgreSQL.
+
+Generates facilities, their units and several years of reservation history
+and loads each table with ``COPY ... FROM STDIN`` fed straight from Python
+generators, so millions of rows go in without building them in memory or
+issuing per-row INSERTs. Occupancy rollups are rebuilt afterwards, since
+COPY bypasses the ORM hook that maintains them. The same seed, sizes and
+``--as-of`` date always produce the same rows; ids continue after whatever
+is already in the tables.
+
+Usage:
+    python -m src.tools.generate_dataset [--facilities 1000] [--units 100:700]
+        [--years 3] [--size-mix 5x5=15,10x10=30,...] [--seed 0] [--database-url URL]
+"""
+import argparse
+import json
+import random
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.services.rollups import REBUILD_ROLLUPS_SQL
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FACILITY_COLUMNS = (
+    "id", "name", "address", "city", "state", "zip_code", "phone", "twilio_number",
+    "email", "hours", "amenities", "latitude", "longitude",
+)
+UNIT_COLUMNS = (
+    "id", "unit_id", "size", "width_ft", "length_ft", "square_feet", "floor", "price",
+    "climate_controlled", "available", "features", "facility_id",
+)
+RESERVATION_COLUMNS = (
+    "id", "reservation_id", "customer_name", "customer_phone", "customer_email",
+    "start_date", "end_date", "duration_months", "monthly_price", "total_price", "status",
+    "payment_method", "payment_status", "deposit_amount", "created_at", "updated_at",
+    "unit_id", "facility_id",
+)
+
+# (city, state, base ZIP, latitude, longitude) that facilities cluster around
+CITIES = (
+    ("Springfield", "IL", 62701, 39.7817, -89.6501),
+    ("Chicago", "IL", 60601, 41.8781, -87.6298),
+    ("Indianapolis", "IN", 46201, 39.7684, -86.1581),
+    ("Columbus", "OH", 43201, 39.9612, -82.9988),
+    ("St. Louis", "MO", 63101, 38.6270, -90.1994),
+    ("Milwaukee", "WI", 53201, 43.0389, -87.9065),
+    ("Dallas", "TX", 75201, 32.7767, -96.7970),
+    ("Phoenix", "AZ", 85001, 33.4484, -112.0740),
+    ("Atlanta", "GA", 30301, 33.7490, -84.3880),
+    ("Denver", "CO", 80201, 39.7392, -104.9903),
+)
+BRANDS = ("Storage Plus", "SecureSpace", "Keep Safe", "Box Depot", "StowAway")
+STREETS = ("Main", "Oak", "Maple", "Industrial", "Commerce", "Park", "Lake", "Mill")
+AMENITIES = ("24/7 Access", "Security Cameras", "Climate Control", "Gated Entry", "Truck Rental", "Moving Supplies")
+HOURS = {
+    day: {"open": "09:00", "close": "18:00"}
+    for day in ("monday", "tuesday", "wednesday", "thursday", "friday")
+}
+HOURS.update({day: {"open": "10:00", "close": "16:00"} for day in ("saturday", "sunday")})
+FIRST_NAMES = ("James", "Maria", "Robert", "Linda", "Michael", "Aisha", "David", "Wei", "Sofia", "Daniel")
+LAST_NAMES = ("Smith", "Garcia", "Johnson", "Nguyen", "Brown", "Patel", "Miller", "Kim", "Lopez", "Davis")
+PAYMENT_METHODS = ("card", "card", "card", "ach", "cash")
+
+
+def parse_mix(text: str, value: Callable = str) -> Tuple[Tuple, ...]:
+    """
+    Parse a weighted mix like "5x5=15,10x10=30" into ((key, weight), ...)
+
+    Args:
+        text: Comma-separated key=weight pairs; weights are relative
+        value: Converts each key, e.g. int for month durations
+
+    Returns:
+        Tuple of (key, weight) pairs
+    """
+    pairs = []
+    for item in text.split(","):
+        key, _, weight = item.partition("=")
+        pairs.append((value(key.strip()), float(weight)))
+    return tuple(pairs)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Shape of the generated dataset"""
+    facilities: int = 1000
+    units_per_facility: Tuple[int, int] = (100, 700)
+    size_mix: Tuple[Tuple[str, float], ...] = (
+        ("5x5", 15), ("5x10", 20), ("10x10", 30), ("10x15", 15), ("10x20", 12), ("10x30", 8),
+    )
+    duration_mix: Tuple[Tuple[int, float], ...] = ((1, 15), (3, 20), (6, 25), (12, 25), (24, 15))
+    climate_share: float = 0.4
+    years: float = 3.0
+    # Mean days a unit sits empty between rentals
+    vacancy_days: float = 45.0
+    cancel_rate: float = 0.08
+    # Share of currently empty units with a fresh PENDING hold
+    pending_share: float = 0.02
+    base_price: float = 20.0
+    price_per_square_foot: float = 1.25
+    seed: int = 0
+
+
+class UnitCatalog:
+    """Compact (id, facility, price) columns for units generated so far"""
+
+    def __init__(self):
+        self.ids = array("i")
+        self.facility_ids = array("i")
+        self.prices = array("d")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, unit_pk: int, facility_id: int, price: float) -> None:
+        self.ids.append(unit_pk)
+        self.facility_ids.append(facility_id)
+        self.prices.append(price)
+
+
+def generate_facilities(spec: DatasetSpec, rng: random.Random, first_id: int) -> Iterator[Tuple]:
+    """Facility rows with ids starting at ``first_id``"""
+    for facility_id in range(first_id, first_id + spec.facilities):
+        city, state, base_zip, latitude, longitude = rng.choice(CITIES)
+        yield (
+            facility_id,
+            f"{rng.choice(BRANDS)} {city} #{facility_id}",
+            f"{rng.randint(100, 9999)} {rng.choice(STREETS)} St",
+            city,
+            state,
+            f"{base_zip + rng.randint(0, 98):05d}",
+            # Derived from the id so no two facilities share a dialed number
+            f"(554) {facility_id // 10000:03d}-{facility_id % 10000:04d}",
+            f"+1555{facility_id:07d}",
+            f"facility{facility_id}@example.com",
+            HOURS,
+            rng.sample(AMENITIES, rng.randint(2, len(AMENITIES))),
+            round(latitude + rng.uniform(-0.3, 0.3), 6),
+            round(longitude + rng.uniform(-0.3, 0.3), 6),
+        )
+
+
+def generate_units(
+    spec: DatasetSpec,
+    rng: random.Random,
+    facility_ids: Iterable[int],
+    first_id: int,
+    catalog: UnitCatalog
+) -> Iterator[Tuple]:
+    """
+    Unit rows for each facility, recorded in ``catalog`` as they are produced
+
+    Every unit starts available; the loader marks the ones held by a
+    confirmed reservation once reservations are in.
+    """
+    sizes = [size for size, _ in spec.size_mix]
+    weights = [weight for _, weight in spec.size_mix]
+    unit_pk = first_id
+    for facility_id in facility_ids:
+        # Local market: some facilities are pricier across the board
+        market = rng.lognormvariate(0, 0.2)
+        count = rng.randint(*spec.units_per_facility)
+        floors = rng.randint(1, 4)
+        for number, size in enumerate(rng.choices(sizes, weights, k=count), start=1):
+            width, length = (int(part) for part in size.split("x"))
+            square_feet = width * length
+            floor = rng.randint(1, floors)
+            climate = floor > 1 or rng.random() < spec.climate_share
+            price = (spec.base_price + spec.price_per_square_foot * square_feet) * market
+            if climate:
+                price *= 1.25
+            price = round(round(price) - 0.01, 2)
+            features = ["Climate Control", "Indoor Access"] if climate else ["Drive Up"]
+            if floor == 1:
+                features.insert(0, "Ground Floor")
+            yield (
+                unit_pk,
+                f"{facility_id}-{chr(64 + floor)}{floor}{number:03d}",
+                size,
+                width,
+                length,
+                square_feet,
+                floor,
+                price,
+                climate,
+                True,
+                features,
+                facility_id,
+            )
+            catalog.add(unit_pk, facility_id, price)
+            unit_pk += 1
+
+
+def generate_reservations(
+    spec: DatasetSpec,
+    rng: random.Random,
+    catalog: UnitCatalog,
+    first_id: int,
+    as_of: datetime
+) -> Iterator[Tuple]:
+    """
+    Reservation history for every unit in ``catalog`` up to ``as_of``
+
+    Each unit alternates between vacancy and rentals of a drawn duration.
+    Past rentals are COMPLETED, one still running is CONFIRMED and ends the
+    unit's history, and a few are CANCELLED before move-in. Some empty units
+    get a PENDING hold placed in the last hour.
+    """
+    durations = [months for months, _ in spec.duration_mix]
+    weights = [weight for _, weight in spec.duration_mix]
+    history_start = as_of - timedelta(days=365 * spec.years)
+    reservation_pk = first_id
+
+    def row(unit_pk, facility_id, price, start, months, status, created):
+        nonlocal reservation_pk
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        # Rents were lower in the past; roughly 4% a year
+        monthly = round(price * (1 - 0.04 * max((as_of - start).days, 0) / 365), 2)
+        settled = status in ("COMPLETED", "CONFIRMED")
+        values = (
+            reservation_pk,
+            f"R{reservation_pk:010d}",
+            f"{first} {last}",
+            f"+1555{rng.randint(0, 9999999):07d}",
+            f"{first.lower()}.{last.lower()}{reservation_pk}@example.com",
+            start,
+            start + timedelta(days=30 * months),
+            months,
+            monthly,
+            round(monthly * months, 2),
+            status,
+            rng.choice(PAYMENT_METHODS),
+            "paid" if settled else ("refunded" if status == "CANCELLED" else "pending"),
+            monthly if settled else 0.0,
+            created,
+            created if status == "PENDING" else start,
+            unit_pk,
+            facility_id,
+        )
+        reservation_pk += 1
+        return values
+
+    for unit_pk, facility_id, price in zip(catalog.ids, catalog.facility_ids, catalog.prices):
+        moment = history_start
+        occupied = False
+        while True:
+            moment += timedelta(days=rng.expovariate(1 / spec.vacancy_days))
+            if moment >= as_of:
+                break
+            months = rng.choices(durations, weights)[0]
+            created = moment - timedelta(days=rng.uniform(0, 14))
+            if rng.random() < spec.cancel_rate:
+                yield row(unit_pk, facility_id, price, moment, months, "CANCELLED", created)
+                continue
+            end = moment + timedelta(days=30 * months)
+            if end > as_of:
+                yield row(unit_pk, facility_id, price, moment, months, "CONFIRMED", created)
+                occupied = True
+                break
+            yield row(unit_pk, facility_id, price, moment, months, "COMPLETED", created)
+            moment = end
+        if not occupied and rng.random() < spec.pending_share:
+            created = as_of - timedelta(minutes=rng.uniform(0, 60))
+            start = as_of + timedelta(days=rng.randint(1, 14))
+            yield row(unit_pk, facility_id, price, start, rng.choices(durations, weights)[0], "PENDING", created)
+
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _text_array(items: list) -> str:
+    quoted = ('"' + item.replace("\\", "\\\\").replace('"', '\\"') + '"' for item in items)
+    return ("{" + ",".join(quoted) + "}").translate(_ESCAPES)
+
+
+# Encoders by exact type; a dict lookup per value beats an isinstance chain
+# when encoding millions of rows
+_ENCODERS = {
+    type(None): lambda value: "\\N",
+    bool: lambda value: "t" if value else "f",
+    int: repr,
+    float: repr,
+    str: lambda value: value.translate(_ESCAPES),
+    datetime: lambda value: value.isoformat(sep=" "),
+    # ARRAY(String) literal; JSON columns are encoded by CopyStream instead
+    list: _text_array,
+}
+
+
+def _other(value) -> str:
+    return str(value).translate(_ESCAPES)
+
+
+def copy_value(value) -> str:
+    """Render one value in PostgreSQL COPY text format"""
+    return _ENCODERS.get(type(value), _other)(value)
+
+
+class CopyStream:
+    """
+    Read-only file object over rows, encoded to COPY text format on demand
+
+    ``cursor.copy_expert`` pulls fixed-size chunks through ``read``, so only
+    one chunk of rows is ever materialized.
+    """
+
+    def __init__(self, rows: Iterable[Sequence], json_columns: Sequence[int] = ()):
+        self._rows = iter(rows)
+        self._json_columns = frozenset(json_columns)
+        self._buffer = ""
+        self.rows = 0
+
+    def _encode(self, row: Sequence) -> str:
+        if self._json_columns:
+            row = [
+                json.dumps(value) if index in self._json_columns else value
+                for index, value in enumerate(row)
+            ]
+        encoders = _ENCODERS
+        return "\t".join([encoders.get(type(value), _other)(value) for value in row]) + "\n"
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        for row in self._rows:
+            line = self._encode(row)
+            parts.append(line)
+            length += len(line)
+            self.rows += 1
+            if 0 <= size <= length:
+                break
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _copy(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence], json_columns: Sequence[str] = ()) -> int:
+    """COPY rows into ``table`` and log the rate"""
+    stream = CopyStream(rows, [columns.index(column) for column in json_columns])
+    started = time.perf_counter()
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)", stream, size=1 << 18)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Copied {stream.rows:,} rows into {table} in {elapsed:.1f}s ({stream.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    return stream.rows
+
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def load_dataset(connection, spec: DatasetSpec, as_of: datetime) -> Dict[str, int]:
+    """
+    Generate and load a dataset in one transaction
+
+    Args:
+        connection: psycopg2 connection
+        spec: Dataset shape
+        as_of: The generated history runs up to this moment
+
+    Returns:
+        Rows loaded per table
+    """
+    rng = random.Random(spec.seed)
+    cursor = connection.cursor()
+    first_facility = _next_id(cursor, "facilities")
+    first_unit = _next_id(cursor, "units")
+    first_reservation = _next_id(cursor, "reservations")
+    catalog = UnitCatalog()
+
+    counts = {
+        "facilities": _copy(
+            cursor, "facilities", FACILITY_COLUMNS,
+            generate_facilities(spec, rng, first_facility), json_columns=("hours", "amenities")
+        ),
+    }
+    facility_ids = range(first_facility, first_facility + counts["facilities"])
+    counts["units"] = _copy(cursor, "units", UNIT_COLUMNS, generate_units(spec, rng, facility_ids, first_unit, catalog))
+    counts["reservations"] = _copy(
+        cursor, "reservations", RESERVATION_COLUMNS,
+        generate_reservations(spec, rng, catalog, first_reservation, as_of)
+    )
+
+    # One set-based pass instead of tracking occupancy while units stream out
+    cursor.execute(
+        "UPDATE units SET available = false FROM reservations r "
+        "WHERE r.unit_id = units.id AND r.status = 'CONFIRMED' AND r.id >= %s",
+        (first_reservation,)
+    )
+    for table in ("facilities", "units", "reservations"):
+        cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))")
+    # COPY bypasses the ORM listener that maintains the occupancy rollups
+    cursor.execute(REBUILD_ROLLUPS_SQL)
+    connection.commit()
+
+    # Fresh statistics so the planner sees the new row counts right away
+    for table in ("facilities", "units", "reservations", "occupancy_daily_rollups"):
+        cursor.execute(f"ANALYZE {table}")
+    connection.commit()
+    return counts
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--facilities", type=int, default=DatasetSpec.facilities)
+    parser.add_argument("--units", default="100:700", help="units per facility as min:max")
+    parser.add_argument("--years", type=float, default=DatasetSpec.years)
+    parser.add_argument("--size-mix", help="relative weights, e.g. 5x5=15,10x10=30,10x20=10")
+    parser.add_argument("--duration-mix", help="months=weight, e.g. 1=15,6=25,12=25")
+    parser.add_argument("--vacancy-days", type=float, default=DatasetSpec.vacancy_days)
+    parser.add_argument("--cancel-rate", type=float, default=DatasetSpec.cancel_rate)
+    parser.add_argument("--as-of", help="YYYY-MM-DD the history ends at, defaults to today")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    low, _, high = args.units.partition(":")
+    options = {}
+    if args.size_mix:
+        options["size_mix"] = parse_mix(args.size_mix)
+    if args.duration_mix:
+        options["duration_mix"] = parse_mix(args.duration_mix, int)
+    spec = DatasetSpec(
+        facilities=args.facilities,
+        units_per_facility=(int(low), int(high or low)),
+        years=args.years,
+        vacancy_days=args.vacancy_days,
+        cancel_rate=args.cancel_rate,
+        seed=args.seed,
+        **options
+    )
+    as_of = (
+        datetime.strptime(args.as_of, "%Y-%m-%d") if args.as_of
+        else datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+
+    from sqlalchemy import create_engine
+
+    from src.models.base import get_database_url
+
+    engine = create_engine(args.database_url or get_database_url())
+    connection = engine.raw_connection()
+    started = time.perf_counter()
+    try:
+        counts = load_dataset(connection, spec, as_of)
+    finally:
+        connection.close()
+        engine.dispose()
+    print(", ".join(f"{rows:,} {table}" for table, rows in counts.items()) + f" in {time.perf_counter() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Replay labeled call transcripts through entity extraction, intent detection and the conversation engine.
+
+Reads a JSONL or CSV corpus with one utterance per record, runs each turn
+through the same steps as a live call, and reports per-intent and
+per-entity precision and recall against the record's labels, plus
+throughput. Records are fields of a call_transcripts export:
+
+    {"call_sid": "CA1", "utterance": "a ten by ten please",
+     "intent": "availability", "entities": {"unit_size": "10x10"}}
+
+``intent`` and ``entities`` are the labels; a record without one is not
+scored on it. In CSV, ``entities`` is a JSON object. Turns of the same
+call should be consecutive so each call keeps its conversation context.
+
+Chunks of records are replayed across a process pool with a bounded
+number in flight, so memory stays flat however large the corpus is.
+
+Usage:
+    python -m src.tools.replay_transcripts transcripts.jsonl [--workers 8]
+        [--chunk-size 2000] [--model data/intent_classifier.npz] [--output results.jsonl]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.core.conversation import ConversationEngine, Entity
+from src.core.entities import EntityExtractor
+from src.core.intent_classifier import SEED_CORPUS_PATH, IntentClassifier, load_corpus, resolve_intent
+
+# Entities passed on to the conversation engine, as on a live call
+CONTEXT_ENTITIES = ('unit_size', 'zip_code')
+
+
+def read_records(path: str, format: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream records from a JSONL or CSV file
+
+    Args:
+        path: Corpus file
+        format: "jsonl" or "csv"; inferred from the extension when omitted
+
+    Yields:
+        One dict per record, with ``line`` set to its 1-based position
+    """
+    format = format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding='utf-8', newline='') as corpus:
+        if format == "csv":
+            for line, row in enumerate(csv.DictReader(corpus), start=1):
+                if row.get('entities') is not None:
+                    row['entities'] = json.loads(row['entities']) if row['entities'].strip() else {}
+                row['line'] = line
+                yield row
+        else:
+            for line, text in enumerate(corpus, start=1):
+                if text.strip():
+                    record = json.loads(text)
+                    record['line'] = line
+                    yield record
+
+
+def chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """
+    Group records into chunks of about ``size``
+
+    A chunk runs past ``size`` (up to twice it) rather than split a call's
+    consecutive turns, so each call is replayed in a single worker.
+    """
+    chunk: List[Dict] = []
+    for record in records:
+        if len(chunk) >= size and (
+            len(chunk) >= 2 * size or record.get('call_sid') != chunk[-1].get('call_sid')
+        ):
+            yield chunk
+            chunk = []
+        chunk.append(record)
+    if chunk:
+        yield chunk
+
+
+def _normalized(value) -> str:
+    return str(value).strip().lower()
+
+
+@dataclass
+class ReplayStats:
+    """Counts from replaying some turns; stats from separate chunks add up"""
+    turns: int = 0
+    # (expected, predicted) intent values for turns labeled with an intent
+    intents: Counter = field(default_factory=Counter)
+    # Per entity type: labeled, predicted and matching values on labeled turns
+    entities_expected: Counter = field(default_factory=Counter)
+    entities_predicted: Counter = field(default_factory=Counter)
+    entities_matched: Counter = field(default_factory=Counter)
+
+    def add(self, other: "ReplayStats") -> None:
+        self.turns += other.turns
+        self.intents.update(other.intents)
+        self.entities_expected.update(other.entities_expected)
+        self.entities_predicted.update(other.entities_predicted)
+        self.entities_matched.update(other.entities_matched)
+
+    def score(self, record: Dict, intent: str, entities: Dict[str, str]) -> None:
+        """Count one replayed turn against its record's labels"""
+        self.turns += 1
+        if record.get('intent'):
+            self.intents[(record['intent'], intent)] += 1
+        expected = record.get('entities')
+        if isinstance(expected, dict):
+            for entity_type, value in expected.items():
+                self.entities_expected[entity_type] += 1
+                if entity_type in entities and _normalized(entities[entity_type]) == _normalized(value):
+                    self.entities_matched[entity_type] += 1
+            self.entities_predicted.update(entities.keys())
+
+    def summary(self) -> Dict:
+        """Intent accuracy and per-label precision and recall"""
+        def ratio(numerator, denominator):
+            return round(numerator / denominator, 4) if denominator else None
+
+        labeled = sum(self.intents.values())
+        correct = sum(count for (expected, predicted), count in self.intents.items() if expected == predicted)
+        expected, predicted = Counter(), Counter()
+        for (label, guess), count in self.intents.items():
+            expected[label] += count
+            predicted[guess] += count
+        intents = {
+            label: {
+                "support": expected[label],
+                "precision": ratio(self.intents[(label, label)], predicted[label]),
+                "recall": ratio(self.intents[(label, label)], expected[label]),
+            }
+            for label in sorted(expected.keys() | predicted.keys())
+        }
+        entities = {
+            entity_type: {
+                "support": self.entities_expected[entity_type],
+                "precision": ratio(self.entities_matched[entity_type], self.entities_predicted[entity_type]),
+                "recall": ratio(self.entities_matched[entity_type], self.entities_expected[entity_type]),
+            }
+            for entity_type in sorted(self.entities_expected.keys() | self.entities_predicted.keys())
+        }
+        return {
+            "turns": self.turns,
+            "intent_accuracy": ratio(correct, labeled),
+            "intents": intents,
+            "entities": entities,
+        }
+
+
+class Replayer:
+    """Runs turns through the live call's extraction, intent and response steps"""
+
+    def __init__(self, classifier: Optional[IntentClassifier] = None, threshold: float = 0.5):
+        """
+        Initialize a replayer
+
+        Args:
+            classifier: Intent classifier; None replays the entity rules alone
+            threshold: Minimum classifier confidence, as INTENT_CONFIDENCE_THRESHOLD
+        """
+        self.extractor = EntityExtractor()
+        self.classifier = classifier
+        self.threshold = threshold
+
+    def replay(self, records: Sequence[Dict], keep_results: bool = False) -> Tuple[ReplayStats, List[Dict]]:
+        """
+        Replay a chunk of records
+
+        Each chunk gets a fresh conversation engine, so contexts never
+        outlive the chunk. Records without a call_sid get a context of their own.
+
+        Args:
+            records: Records from read_records
+            keep_results: Also return what each turn produced
+
+        Returns:
+            Tuple of (stats, per-turn results or an empty list)
+        """
+        from src.services.twilio_service import dtmf_intent
+
+        engine = ConversationEngine()
+        stats = ReplayStats()
+        results = []
+        for record in records:
+            utterance = record.get('utterance') or record.get('text') or ''
+            extracted = self.extractor.extract_all(utterance)
+            if (keyed := dtmf_intent(utterance)) is not None:
+                intent, confidence = keyed, 1.0
+            else:
+                intent, confidence = resolve_intent(utterance, extracted, self.classifier, self.threshold)
+            response = engine.process_intent(
+                record.get('call_sid') or f"replay-{record.get('line')}",
+                intent,
+                confidence=confidence,
+                entities=[
+                    Entity(type=entity_type, value=extracted[entity_type].value, confidence=1.0)
+                    for entity_type in CONTEXT_ENTITIES
+                    if entity_type in extracted
+                ]
+            )
+            entities = {entity_type: entity.value for entity_type, entity in extracted.items()}
+            stats.score(record, intent.value, entities)
+            if keep_results:
+                results.append({
+                    "line": record.get('line'),
+                    "call_sid": record.get('call_sid'),
+                    "utterance": utterance,
+                    "intent": intent.value,
+                    "confidence": round(confidence, 4),
+                    "entities": entities,
+                    "expected_intent": record.get('intent'),
+                    "expected_entities": record.get('entities'),
+                    "response": response,
+                })
+        return stats, results
+
+
+_replayer: Optional[Replayer] = None
+
+
+def _init_worker(classifier: Optional[IntentClassifier], threshold: float) -> None:
+    global _replayer
+    # Per-turn INFO logs would cost more than the replay itself
+    logging.getLogger('storage_agent').setLevel(logging.WARNING)
+    _replayer = Replayer(classifier, threshold)
+
+
+def _replay_chunk(records: List[Dict], keep_results: bool) -> Tuple[ReplayStats, List[Dict]]:
+    return _replayer.replay(records, keep_results)
+
+
+def replay(
+    records: Iterable[Dict],
+    classifier: Optional[IntentClassifier] = None,
+    threshold: float = 0.5,
+    workers: int = 1,
+    chunk_size: int = 2000,
+    on_results=None
+) -> ReplayStats:
+    """
+    Replay records, in worker processes when ``workers`` > 1
+
+    At most two chunks per worker are queued at a time, so the corpus is
+    never read far ahead of the workers.
+
+    Args:
+        records: Records, e.g. from read_records
+        classifier: Intent classifier, sent once to each worker
+        threshold: Minimum classifier confidence
+        workers: Worker processes; 1 replays in this process
+        chunk_size: Records per chunk
+        on_results: Called with each chunk's per-turn results; None skips collecting them
+
+    Returns:
+        Combined stats
+    """
+    keep_results = on_results is not None
+    total = ReplayStats()
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        _init_worker(classifier, threshold)
+        for chunk in chunks:
+            stats, results = _replay_chunk(chunk, keep_results)
+            total.add(stats)
+            if keep_results:
+                on_results(results)
+        return total
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(classifier, threshold)) as pool:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats, results = future.result()
+                    total.add(stats)
+                    if keep_results:
+                        on_results(results)
+            pending.add(pool.submit(_replay_chunk, chunk, keep_results))
+        for future in pending:
+            stats, results = future.result()
+            total.add(stats)
+            if keep_results:
+                on_results(results)
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="JSONL or CSV transcripts")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="defaults to the file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--model", default="data/intent_classifier.npz",
+                        help="saved classifier; the seed corpus is used when it does not exist")
+    parser.add_argument("--no-classifier", action="store_true", help="replay the entity rules alone")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--output", help="write each turn's result as JSONL")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    classifier = None
+    if not args.no_classifier:
+        if os.path.exists(args.model):
+            classifier = IntentClassifier.load(args.model)
+        else:
+            classifier = IntentClassifier.fit(*load_corpus(SEED_CORPUS_PATH))
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    on_results = (lambda results: output.writelines(json.dumps(result) + "\n" for result in results)) if output else None
+    started = time.perf_counter()
+    try:
+        stats = replay(
+            read_records(args.corpus, args.format), classifier, args.threshold,
+            args.workers, args.chunk_size, on_results
+        )
+    finally:
+        if output:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    summary = stats.summary()
+    summary["seconds"] = round(elapsed, 3)
+    summary["turns_per_second"] = round(stats.turns / elapsed, 1) if elapsed else None
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return summary
+
+    print(f"replayed {stats.turns:,} turns in {elapsed:.1f}s with {args.workers} workers "
+          f"({summary['turns_per_second']:,.0f} turns/s)")
+    if summary["intent_accuracy"] is not None:
+        print(f"intent accuracy {summary['intent_accuracy']:.3f}")
+    for title, rows in (("intent", summary["intents"]), ("entity", summary["entities"])):
+        for label, row in rows.items():
+            precision = "-" if row["precision"] is None else f"{row['precision']:.2f}"
+            recall = "-" if row["recall"] is None else f"{row['recall']:.2f}"
+            print(f"  {title} {label:<16} precision {precision:>4} recall {recall:>4} ({row['support']})")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
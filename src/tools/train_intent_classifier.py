@@ -0,0 +1,76 @@
+"""Train the intent classifier from a labeled JSONL corpus.
+
+Each corpus line is {"text": "...", "intent": "<Intent value>"}. Reports
+accuracy, per-intent recall and expected calibration error on a held-out
+split, then trains on the whole corpus and saves the model as .npz for
+INTENT_MODEL_PATH.
+
+Usage:
+    python -m src.tools.train_intent_classifier [--corpus src/core/intent_corpus.jsonl]
+        [--output data/intent_classifier.npz] [--features 16384] [--alpha 0.05]
+"""
+import argparse
+import time
+from collections import Counter
+
+from src.core.intent_classifier import SEED_CORPUS_PATH, IntentClassifier, load_corpus
+
+
+def expected_calibration_error(confidences, correct, bins: int = 10) -> float:
+    """Average gap between confidence and accuracy, weighted over confidence bins"""
+    import numpy as np
+
+    confidences = np.asarray(confidences)
+    correct = np.asarray(correct, dtype=float)
+    edges = np.linspace(0, 1, bins + 1)
+    error = 0.0
+    for low, high in zip(edges[:-1], edges[1:]):
+        members = (confidences > low) & (confidences <= high)
+        if members.any():
+            error += members.mean() * abs(confidences[members].mean() - correct[members].mean())
+    return float(error)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=SEED_CORPUS_PATH)
+    parser.add_argument("--output", default="data/intent_classifier.npz")
+    parser.add_argument("--features", type=int, default=1 << 14, help="hashed feature space, a power of two")
+    parser.add_argument("--alpha", type=float, default=0.05, help="additive smoothing")
+    parser.add_argument("--test-split", type=float, default=0.2, help="share held out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import numpy as np
+
+    texts, intents = load_corpus(args.corpus)
+    print(f"{len(texts)} utterances: " + ", ".join(
+        f"{intent.value}={count}" for intent, count in sorted(Counter(intents).items(), key=lambda item: item[0].value)
+    ))
+
+    order = np.random.default_rng(args.seed).permutation(len(texts))
+    cut = int(len(texts) * (1 - args.test_split))
+    train, test = order[:cut], order[cut:]
+    if len(test):
+        model = IntentClassifier.fit(
+            [texts[i] for i in train], [intents[i] for i in train], args.features, args.alpha, seed=args.seed
+        )
+        started = time.perf_counter()
+        predictions = model.predict_batch([texts[i] for i in test])
+        elapsed = time.perf_counter() - started
+        correct = [predicted == intents[i] for (predicted, _), i in zip(predictions, test)]
+        print(f"held-out accuracy {np.mean(correct):.3f} on {len(test)}, "
+              f"ECE {expected_calibration_error([confidence for _, confidence in predictions], correct):.3f}, "
+              f"{elapsed / len(test) * 1e6:.1f} us/utterance batched")
+        for intent in sorted(set(intents), key=lambda intent: intent.value):
+            members = [ok for ok, i in zip(correct, test) if intents[i] == intent]
+            if members:
+                print(f"  {intent.value:<16} recall {np.mean(members):.2f} ({len(members)})")
+
+    model = IntentClassifier.fit(texts, intents, args.features, args.alpha, seed=args.seed)
+    model.save(args.output)
+    print(f"saved {args.output} (temperature {model.temperature:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,10 @@ def setup_logging(
     """
     Set up application logging with both console and file handlers.
     
+    Called from the app's lifespan on startup rather than at import, so
+    importing the package never touches the filesystem. Calling it again
+    replaces the handlers from the previous call.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file. If None, only console logging is enabled
@@ -24,6 +28,9 @@ def setup_logging(
     # Create logger
     logger = logging.getLogger('storage_agent')
     logger.setLevel(getattr(logging, log_level.upper()))
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
 
     # Create formatters
     console_formatter = logging.Formatter(
@@ -53,8 +60,8 @@ def setup_logging(
 
     return logger
 
-# Create default logger instance
-logger = setup_logging()
+# Project root logger; handlers are attached by setup_logging()
+logger = logging.getLogger('storage_agent')
 
 def get_logger(name: str) -> logging.Logger:
     """